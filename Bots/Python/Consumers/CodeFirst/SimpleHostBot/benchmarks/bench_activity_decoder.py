@@ -0,0 +1,86 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Compares ActivityDecoder with Activity().deserialize() over the activities of the
+Tests/SkillFunctionalTests transcripts.
+
+Run from the bot folder: python benchmarks/bench_activity_decoder.py [--number N]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from botbuilder.schema import Activity
+
+from activity_decoder import ActivityDecoder
+
+TRANSCRIPTS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    *[os.pardir] * 6,
+    "Tests",
+    "SkillFunctionalTests",
+)
+
+
+def load_bodies(folder: str) -> list:
+    bodies = []
+    for path in sorted(glob.glob(os.path.join(folder, "**", "*.transcript"), recursive=True)):
+        with open(path, encoding="utf-8-sig") as transcript:
+            # Some transcripts have a trailing comma after their last activity.
+            content = re.sub(r",\s*\]\s*$", "]", transcript.read().strip())
+        activities = json.loads(content)
+        bodies.extend(json.dumps(activity).encode("utf-8") for activity in activities)
+    return bodies
+
+
+def measure(label: str, bodies: list, decoder: ActivityDecoder, number: int):
+    msrest = timeit.timeit(
+        lambda: [Activity().deserialize(json.loads(body)) for body in bodies], number=number
+    )
+    fast = timeit.timeit(
+        lambda: [decoder.decode(decoder.loads(body)) for body in bodies], number=number
+    )
+    count = number * len(bodies)
+    print(
+        f"{label:<12} {len(bodies):>5} activities  "
+        f"msrest {msrest / count * 1e6:8.1f} us  "
+        f"ActivityDecoder {fast / count * 1e6:8.1f} us  "
+        f"x{msrest / fast:.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transcripts", default=TRANSCRIPTS)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    bodies = load_bodies(args.transcripts)
+    if not bodies:
+        sys.exit(f"No transcripts found in {os.path.abspath(args.transcripts)}")
+
+    decoder = ActivityDecoder()
+    different = [
+        body
+        for body in bodies
+        if decoder.decode(decoder.loads(body)) != Activity().deserialize(json.loads(body))
+    ]
+    if different:
+        sys.exit(f"{len(different)} activities decode differently from msrest")
+
+    measure("all", bodies, decoder, args.number)
+    # Cards and attachments are where msrest spends most of its time.
+    measure("> 2 KB", [body for body in bodies if len(body) > 2048], decoder, args.number)
+
+
+if __name__ == "__main__":
+    main()
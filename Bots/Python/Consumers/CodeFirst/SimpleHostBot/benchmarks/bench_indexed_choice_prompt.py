@@ -0,0 +1,109 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Compares ChoiceRecognizers.recognize_choices() with ChoiceIndex.recognize_choices() over a large
+list of generated choices (with synonyms and action titles), for utterances that match a choice
+by name and for utterances that fall back to the ordinal and number models.
+
+Run from the bot folder: python benchmarks/bench_indexed_choice_prompt.py [--choices N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from botbuilder.dialogs.choices import Choice, ChoiceRecognizers, FindChoicesOptions
+from botbuilder.schema import ActionTypes, CardAction
+
+from dialogs.indexed_choice_prompt import ChoiceIndex
+
+WORDS = (
+    "skill echo waterfall bot dotnet python js v3 composer cards auth sso message attachment "
+    "proactive upload delete update teams hero adaptive thumbnail red blue green the one"
+).split()
+
+
+def create_choices(count: int, rand: random.Random) -> list:
+    def words(length: int) -> str:
+        return " ".join(rand.choice(WORDS) for _ in range(length))
+
+    choices = []
+    for index in range(count):
+        choice = Choice(value=f"{words(rand.randint(1, 3))} Skill{index}")
+        if index % 5 == 0:
+            choice.synonyms = [words(2), words(1)]
+        if index % 7 == 0:
+            choice.action = CardAction(type=ActionTypes.im_back, title=words(2), value=choice.value)
+        choices.append(choice)
+    return choices
+
+
+def results(models) -> list:
+    return [
+        (
+            model.start,
+            model.end,
+            model.text,
+            model.resolution.value,
+            model.resolution.index,
+            model.resolution.score,
+            model.resolution.synonym,
+        )
+        for model in models
+    ]
+
+
+def measure(recognize, utterances: list, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        for utterance in utterances:
+            recognize(utterance)
+    return (time.perf_counter() - started) / (number * len(utterances)) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--choices", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=3)
+    args = parser.parse_args()
+
+    rand = random.Random(7)
+    choices = create_choices(args.choices, rand)
+    options = FindChoicesOptions(locale="en-us")
+
+    started = time.perf_counter()
+    index = ChoiceIndex(choices, options)
+    print(f"ChoiceIndex build            {(time.perf_counter() - started) * 1e3:8.2f} ms")
+
+    utterances = {
+        "name match": [choice.value for choice in rand.sample(choices, 50)],
+        "number/ordinal": ["2", "the third one", "second", "nothing here"] * 10,
+    }
+    for label, texts in utterances.items():
+        for text in texts:
+            expected = ChoiceRecognizers.recognize_choices(text, choices, options)
+            if results(index.recognize_choices(text, options)) != results(expected):
+                sys.exit(f"ChoiceIndex recognizes '{text}' differently")
+
+        recognizers = measure(
+            lambda text: ChoiceRecognizers.recognize_choices(text, choices, options),
+            texts,
+            args.number,
+        )
+        indexed = measure(
+            lambda text: index.recognize_choices(text, options), texts, args.number
+        )
+        print(
+            f"{label:<16} ChoiceRecognizers {recognizers:8.2f} ms  "
+            f"ChoiceIndex {indexed:8.2f} ms  x{recognizers / indexed:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
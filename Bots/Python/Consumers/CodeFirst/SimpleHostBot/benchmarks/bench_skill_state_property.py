@@ -0,0 +1,102 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the conversation state that HostBot saves once a skill is selected, with the skill id
+that SkillStateProperty keeps and with the whole BotFrameworkSkill stored before, for the two
+things every save does with it: MemoryStorage's deep copy and the jsonpickle encoding used by
+SqliteStorage.
+
+Run from the bot folder: python benchmarks/bench_skill_state_property.py [--number N]
+"""
+
+import argparse
+import asyncio
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from botbuilder.core import ConversationState, MemoryStorage, TurnContext
+from botbuilder.core.adapters import TestAdapter
+from botbuilder.schema import Activity, ActivityTypes
+from jsonpickle import encode
+
+import app
+from bots import HostBot
+from bots.host_bot import ACTIVE_SKILL_PROPERTY_NAME
+from dialogs import SetupDialog
+
+
+async def select_skill(skill_id: str) -> dict:
+    """
+    Runs the setup turns of a conversation and returns its state as it was saved.
+    """
+
+    storage = MemoryStorage()
+    conversation_state = ConversationState(storage)
+    bot = HostBot(
+        conversation_state,
+        app.SKILL_CONFIG,
+        app.CLIENT,
+        app.CONFIG,
+        SetupDialog(conversation_state, app.SKILL_CONFIG),
+    )
+    adapter = TestAdapter()
+    for text in ["hi", "normal", skill_id]:
+        turn_context = TurnContext(
+            adapter,
+            Activity(
+                type=ActivityTypes.message,
+                text=text,
+                channel_id="test",
+                conversation=adapter.template.conversation,
+                from_property=adapter.template.from_property,
+                recipient=adapter.template.recipient,
+                service_url="https://test",
+            ),
+        )
+        await bot.on_turn(turn_context)
+        await conversation_state.save_changes(turn_context)
+
+    return next(iter(storage.memory.values()))
+
+
+def measure(action, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        action()
+    return (time.perf_counter() - started) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+
+    skill_id = sorted(app.SKILL_CONFIG.SKILLS)[0]
+    with_id = asyncio.run(select_skill(skill_id))
+    if with_id.get(ACTIVE_SKILL_PROPERTY_NAME) != skill_id:
+        sys.exit(f"The setup didn't select {skill_id}")
+
+    with_skill = dict(with_id)
+    with_skill[ACTIVE_SKILL_PROPERTY_NAME] = app.SKILL_CONFIG.SKILLS[skill_id]
+
+    for label, item in [("whole skill", with_skill), ("skill id", with_id)]:
+        report(label, item, args.number)
+
+
+def report(label: str, item: dict, number: int):
+    encoding = measure(lambda: encode(item), number)
+    copying = measure(lambda: copy.deepcopy(item), number)
+    print(
+        f"{label:<12} {len(encode(item)):5} bytes  "
+        f"encode {encoding:6.1f} us  deepcopy {copying:6.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
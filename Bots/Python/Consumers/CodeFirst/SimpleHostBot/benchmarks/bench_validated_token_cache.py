@@ -0,0 +1,116 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Compares the SDK's validation of an inbound channel token with a ValidatedTokenCache hit for the
+same token. The token is signed with a local key that is loaded in the SDK's metadata cache, the
+way OpenIdMetadataPrefetcher loads the channel's keys.
+
+Run from the bot folder: python benchmarks/bench_validated_token_cache.py [--number N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+import jwt
+from botbuilder.schema import Activity, ActivityTypes
+from botframework.connector.auth import (
+    AuthenticationConfiguration,
+    AuthenticationConstants,
+    ChannelValidation,
+    JwtTokenExtractor,
+    JwtTokenValidation,
+    SimpleCredentialProvider,
+)
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from authentication import ValidatedTokenCache
+
+APP_ID = "00000000-0000-0000-0000-000000000001"
+CHANNEL_ID = "msteams"
+SERVICE_URL = "https://smba.trafficmanager.net/amer/"
+KEY_ID = "bench-key"
+
+
+def create_auth_header() -> str:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid=KEY_ID, endorsements=[CHANNEL_ID])
+
+    # Same fields OpenIdMetadataPrefetcher sets.
+    metadata = JwtTokenExtractor.get_open_id_metadata(
+        ChannelValidation.open_id_metadata_endpoint
+        or AuthenticationConstants.TO_BOT_FROM_CHANNEL_OPENID_METADATA_URL
+    )
+    metadata.keys = [jwk]
+    metadata.last_updated = datetime.now()
+
+    now = int(time.time())
+    token = jwt.encode(
+        {
+            "iss": AuthenticationConstants.TO_BOT_FROM_CHANNEL_TOKEN_ISSUER,
+            "aud": APP_ID,
+            "serviceurl": SERVICE_URL,
+            "nbf": now - 60,
+            "exp": now + 3600,
+        },
+        private_key,
+        "RS256",
+        headers={"kid": KEY_ID},
+    )
+    return f"Bearer {token}"
+
+
+async def measure(validate, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        await validate()
+    return (time.perf_counter() - started) / number * 1e6
+
+
+async def run(number: int):
+    auth_header = create_auth_header()
+    activity = Activity(
+        type=ActivityTypes.message, channel_id=CHANNEL_ID, service_url=SERVICE_URL
+    )
+    credentials = SimpleCredentialProvider(APP_ID, "password")
+    auth_configuration = AuthenticationConfiguration()
+    cache = ValidatedTokenCache()
+
+    def validate():
+        return JwtTokenValidation.authenticate_request(
+            activity, auth_header, credentials, "", auth_configuration
+        )
+
+    identity = await validate()
+    if not identity.is_authenticated:
+        sys.exit("The token didn't pass the SDK's validation")
+
+    sdk = await measure(validate, number)
+    cached = await measure(
+        lambda: cache.authenticate(auth_header, validate, CHANNEL_ID, SERVICE_URL), number
+    )
+    print(f"SDK validation            {sdk:8.1f} us")
+    print(f"ValidatedTokenCache hit   {cached:8.1f} us  x{sdk / cached:.0f}")
+    print(f"cache {cache.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,13 +13,14 @@ from botbuilder.dialogs import Dialog
 from botbuilder.schema import (
     ActivityTypes,
     ChannelAccount,
-    ExpectedReplies,
     DeliveryModes,
 )
 from botbuilder.integration.aiohttp.skills import SkillHttpClient
 
+from activity_decoder import ActivityDecoder
 from config import DefaultConfig, SkillConfiguration
 from helpers.dialog_helper import DialogHelper
+from skill_state_property import SkillStateProperty
 
 DELIVERY_MODE_PROPERTY_NAME = "deliveryModeProperty"
 ACTIVE_SKILL_PROPERTY_NAME = "activeSkillProperty"
@@ -33,20 +34,24 @@ class HostBot(ActivityHandler):
         skill_client: SkillHttpClient,
         config: DefaultConfig,
         dialog: Dialog,
+        activity_decoder: ActivityDecoder = None,
     ):
         self._bot_id = config.APP_ID
         self._skill_client = skill_client
         self._skills_config = skills_config
         self._conversation_state = conversation_state
         self._dialog = dialog
+        self._activity_decoder = activity_decoder or ActivityDecoder()
         self._dialog_state_property = conversation_state.create_property("DialogState")
 
         # Create state property to track the delivery mode and active skill.
         self._delivery_mode_property = conversation_state.create_property(
             DELIVERY_MODE_PROPERTY_NAME
         )
-        self._active_skill_property = conversation_state.create_property(
-            ACTIVE_SKILL_PROPERTY_NAME
+        self._active_skill_property = SkillStateProperty(
+            conversation_state,
+            ACTIVE_SKILL_PROPERTY_NAME,
+            lambda skill_id: self._skills_config.SKILLS.get(skill_id),
         )
 
     async def on_turn(self, turn_context):
@@ -71,9 +76,10 @@ class HostBot(ActivityHandler):
         await self._conversation_state.save_changes(turn_context)
 
     async def on_message_activity(self, turn_context: TurnContext):
-        if turn_context.activity.text in self._skills_config.SKILLS:
+        skills = self._skills_config.SKILLS
+        if turn_context.activity.text in skills:
             delivery_mode: str = await self._delivery_mode_property.get(turn_context)
-            selected_skill = self._skills_config.SKILLS[turn_context.activity.text]
+            selected_skill = skills[turn_context.activity.text]
             v3_bots = ["EchoSkillBotDotNetV3", "EchoSkillBotJSV3"]
 
             if (
@@ -156,26 +162,37 @@ class HostBot(ActivityHandler):
             activity = copy.copy(turn_context.activity)
             activity.delivery_mode = delivery_mode
 
-            # Route the activity to the skill.
-            expect_replies_response = await self._skill_client.post_activity_to_skill(
-                self._bot_id,
-                target_skill,
-                self._skills_config.SKILL_HOST_ENDPOINT,
-                activity,
-            )
+            if self._skills_config.STREAM_EXPECT_REPLIES and hasattr(
+                self._skill_client, "stream_replies"
+            ):
+                # Route each reply back to the channel as soon as the skill streams it.
+                with self._skill_client.stream_replies(
+                    lambda raw_activity: self.__relay_streamed_reply(
+                        turn_context, raw_activity
+                    )
+                ):
+                    expect_replies_response = (
+                        await self._skill_client.post_activity_to_skill(
+                            self._bot_id,
+                            target_skill,
+                            self._skills_config.SKILL_HOST_ENDPOINT,
+                            activity,
+                        )
+                    )
+            else:
+                # Route the activity to the skill.
+                expect_replies_response = await self._skill_client.post_activity_to_skill(
+                    self._bot_id,
+                    target_skill,
+                    self._skills_config.SKILL_HOST_ENDPOINT,
+                    activity,
+                )
 
-            # Route response activities back to the channel.
-            response_activities: ExpectedReplies = (
-                ExpectedReplies().deserialize(expect_replies_response.body).activities
+            # Route response activities back to the channel (none left when they were streamed).
+            await self.__relay_expected_replies(
+                turn_context, expect_replies_response.body
             )
 
-            for response_activity in response_activities:
-                if response_activity.type == ActivityTypes.end_of_conversation:
-                    await self.end_conversation(response_activity, turn_context)
-
-                else:
-                    await turn_context.send_activity(response_activity)
-
         else:
             # Route the activity to the skill.
             await self._skill_client.post_activity_to_skill(
@@ -184,3 +201,30 @@ class HostBot(ActivityHandler):
                 self._skills_config.SKILL_HOST_ENDPOINT,
                 turn_context.activity,
             )
+
+    async def __relay_expected_replies(self, turn_context: TurnContext, body: dict):
+        # Only the type of each reply is checked: the replies between two EndOfConversation activities
+        # are decoded with the fast decoder and sent to the channel in a single send_activities call.
+        batch = []
+        for raw_activity in (body or {}).get("activities") or []:
+            if raw_activity.get("type") != ActivityTypes.end_of_conversation:
+                batch.append(self._activity_decoder.decode(raw_activity))
+                continue
+
+            if batch:
+                await turn_context.send_activities(batch)
+                batch = []
+
+            await self.end_conversation(
+                self._activity_decoder.decode(raw_activity), turn_context
+            )
+
+        if batch:
+            await turn_context.send_activities(batch)
+
+    async def __relay_streamed_reply(self, turn_context: TurnContext, raw_activity: dict):
+        activity = self._activity_decoder.decode(raw_activity)
+        if activity.type == ActivityTypes.end_of_conversation:
+            await self.end_conversation(activity, turn_context)
+        else:
+            await turn_context.send_activity(activity)
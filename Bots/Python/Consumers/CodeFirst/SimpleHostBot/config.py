@@ -3,10 +3,13 @@
 # Licensed under the MIT License.
 
 import os
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 from botbuilder.core.skills import BotFrameworkSkill
 from dotenv import load_dotenv
 
+from skill_config_watcher import SkillConfigWatcher
+
 """ Bot Configuration """
 
 
@@ -16,15 +19,65 @@ class DefaultConfig:
     load_dotenv()
 
     PORT = 37000
+    # Number of worker processes sharing the listening socket.
+    WORKERS = int(os.getenv("Workers", "1"))
     APP_ID = os.getenv("MicrosoftAppId")
     APP_PASSWORD = os.getenv("MicrosoftAppPassword")
     SKILL_HOST_ENDPOINT = os.getenv("SkillHostEndpoint")
     SKILLS = []
 
+    # Connection pool used to call the skills: max connections per skill, keep-alive and DNS cache TTL
+    # (in seconds). A single skill can have its own limit with skill_<id>_maxConnections.
+    SKILL_MAX_CONNECTIONS = int(os.getenv("SkillMaxConnections", "100"))
+    SKILL_KEEP_ALIVE = float(os.getenv("SkillKeepAlive", "30"))
+    SKILL_DNS_TTL = int(os.getenv("SkillDnsTtl", "300"))
+    SKILL_CONNECTION_LIMITS: Dict[str, int] = {}
+
+    # Circuit breaker: consecutive failures that take a skill out of rotation and seconds before it's
+    # probed again.
+    SKILL_FAILURE_THRESHOLD = int(os.getenv("SkillFailureThreshold", "5"))
+    SKILL_RESET_TIMEOUT = float(os.getenv("SkillResetTimeout", "30"))
+
+    # Timeout budget (in seconds) of a call to a skill, retries included, skill_<id>_timeout overrides it.
+    # EndOfConversation and token exchange calls are retried SkillMaxRetries times with a jittered
+    # backoff starting at SkillRetryBackoff seconds. With SkillHedgeDelay > 0 they're also sent to the
+    # next of the skill_<id>_hedgeEndpoints (comma separated) when unanswered after that many seconds.
+    SKILL_TIMEOUT = float(os.getenv("SkillTimeout", "300"))
+    SKILL_MAX_RETRIES = int(os.getenv("SkillMaxRetries", "2"))
+    SKILL_RETRY_BACKOFF = float(os.getenv("SkillRetryBackoff", "0.2"))
+    SKILL_HEDGE_DELAY = float(os.getenv("SkillHedgeDelay", "0"))
+    SKILL_TIMEOUTS: Dict[str, float] = {}
+    SKILL_HEDGE_ENDPOINTS: Dict[str, List[str]] = {}
+    # The skills are asked to stream their expectReplies answers, so each reply is relayed to the
+    # channel as soon as the skill sends it. Skills that don't stream answer as usual.
+    STREAM_EXPECT_REPLIES = os.getenv("StreamExpectReplies", "false").lower() == "true"
+    # JSON file or directory with the skills (BotFrameworkSkills, as in the DotNet appsettings.json),
+    # used instead of the skill_<id>_appId/endpoint variables and checked for changes every
+    # SkillsConfigPollInterval seconds.
+    SKILLS_CONFIG_PATH = os.getenv("SkillsConfigPath")
+    SKILLS_CONFIG_POLL_INTERVAL = float(os.getenv("SkillsConfigPollInterval", "5"))
+
     # Callers to only those specified, '*' allows any caller.
     # Example: os.environ.get("AllowedCallers", ["54d3bb6a-3b6d-4ccd-bbfd-cad5c72fb53a"])
     ALLOWED_CALLERS = os.environ.get("AllowedCallers", ["*"])
 
+    # Storage used for conversation state and skill conversation ids ("memory" or "sqlite").
+    # Several processes on the same node can share state by pointing to the same sqlite file.
+    STORAGE_TYPE = os.getenv("StorageType", "memory")
+    SQLITE_STORAGE_PATH = os.getenv("SqliteStoragePath", "bot_state.db")
+
+    # App tokens for other bots are refreshed in the background TokenRefreshBefore seconds before they
+    # expire.
+    TOKEN_REFRESH_BEFORE = float(os.getenv("TokenRefreshBefore", "300"))
+    # Inbound tokens that passed validation are cached (up to ValidatedTokenCacheSize) until they
+    # expire. The OpenID signing keys are fetched at startup and every OpenIdRefreshInterval seconds.
+    VALIDATED_TOKEN_CACHE_SIZE = int(os.getenv("ValidatedTokenCacheSize", "1000"))
+    OPEN_ID_REFRESH_INTERVAL = float(os.getenv("OpenIdRefreshInterval", str(12 * 60 * 60)))
+    # Bodies of at least CompressionThreshold bytes exchanged with other bots are compressed (gzip, or br
+    # with the brotli package) when the other side accepts it. HttpCompression=false turns it off.
+    HTTP_COMPRESSION = os.getenv("HttpCompression", "true").lower() == "true"
+    COMPRESSION_THRESHOLD = int(os.getenv("CompressionThreshold", "1024"))
+
     @staticmethod
     def configure_skills():
         skills = list()
@@ -40,6 +93,20 @@ class DefaultConfig:
                 if newSkill["id"] == bot_id:
                     index = i
 
+            if key.lower() == "maxconnections":
+                DefaultConfig.SKILL_CONNECTION_LIMITS[bot_id] = int(os.getenv(envKey))
+                continue
+
+            if key.lower() == "timeout":
+                DefaultConfig.SKILL_TIMEOUTS[bot_id] = float(os.getenv(envKey))
+                continue
+
+            if key.lower() == "hedgeendpoints":
+                DefaultConfig.SKILL_HEDGE_ENDPOINTS[bot_id] = [
+                    url.strip() for url in os.getenv(envKey).split(",") if url.strip()
+                ]
+                continue
+
             if key.lower() == "appid":
                 attr = "app_id"
             elif key.lower() == "endpoint":
@@ -66,6 +133,53 @@ DefaultConfig.configure_skills()
 
 class SkillConfiguration:
     SKILL_HOST_ENDPOINT = DefaultConfig.SKILL_HOST_ENDPOINT
-    SKILLS: Dict[str, BotFrameworkSkill] = {
+    SKILL_MAX_CONNECTIONS = DefaultConfig.SKILL_MAX_CONNECTIONS
+    SKILL_KEEP_ALIVE = DefaultConfig.SKILL_KEEP_ALIVE
+    SKILL_DNS_TTL = DefaultConfig.SKILL_DNS_TTL
+    SKILL_CONNECTION_LIMITS = DefaultConfig.SKILL_CONNECTION_LIMITS
+    SKILL_FAILURE_THRESHOLD = DefaultConfig.SKILL_FAILURE_THRESHOLD
+    SKILL_RESET_TIMEOUT = DefaultConfig.SKILL_RESET_TIMEOUT
+    SKILL_TIMEOUT = DefaultConfig.SKILL_TIMEOUT
+    SKILL_MAX_RETRIES = DefaultConfig.SKILL_MAX_RETRIES
+    SKILL_RETRY_BACKOFF = DefaultConfig.SKILL_RETRY_BACKOFF
+    SKILL_HEDGE_DELAY = DefaultConfig.SKILL_HEDGE_DELAY
+    SKILL_TIMEOUTS = DefaultConfig.SKILL_TIMEOUTS
+    SKILL_HEDGE_ENDPOINTS = DefaultConfig.SKILL_HEDGE_ENDPOINTS
+    STREAM_EXPECT_REPLIES = DefaultConfig.STREAM_EXPECT_REPLIES
+    SKILLS_CONFIG_PATH = DefaultConfig.SKILLS_CONFIG_PATH
+    SKILLS_CONFIG_POLL_INTERVAL = DefaultConfig.SKILLS_CONFIG_POLL_INTERVAL
+    SKILLS: Mapping[str, BotFrameworkSkill] = {
         skill["id"]: BotFrameworkSkill(**skill) for skill in DefaultConfig.SKILLS
     }
+
+    def __init__(self):
+        # With SkillsConfigPath, the watcher swaps the new skills in, the other consumers subscribe
+        # to it as well.
+        self.SKILLS_CONFIG_WATCHER: Optional[
+            SkillConfigWatcher[Mapping[str, BotFrameworkSkill]]
+        ] = None
+        if self.SKILLS_CONFIG_PATH:
+            self.SKILLS_CONFIG_WATCHER = SkillConfigWatcher(
+                self.SKILLS_CONFIG_PATH,
+                self.build_skills,
+                self.SKILLS_CONFIG_POLL_INTERVAL,
+            )
+            self.apply(self.SKILLS_CONFIG_WATCHER.load())
+            self.SKILLS_CONFIG_WATCHER.subscribe(self.apply)
+
+    def apply(self, skills: Mapping[str, BotFrameworkSkill]):
+        # SKILLS is replaced, not changed, so turns that already read it keep the skills they got.
+        self.SKILLS = skills
+
+    @staticmethod
+    def build_skills(skills: List[Dict[str, str]]) -> Mapping[str, BotFrameworkSkill]:
+        return MappingProxyType(
+            {
+                skill["id"]: BotFrameworkSkill(
+                    id=skill["id"],
+                    app_id=skill["app_id"],
+                    skill_endpoint=skill["skill_endpoint"],
+                )
+                for skill in skills
+            }
+        )
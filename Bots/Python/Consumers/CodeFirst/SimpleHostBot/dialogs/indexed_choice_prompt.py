@@ -0,0 +1,254 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Union
+
+from botbuilder.core import TurnContext
+from botbuilder.dialogs.choices import (
+    Choice,
+    ChoiceFactoryOptions,
+    ChoiceRecognizers,
+    Find,
+    FindChoicesOptions,
+    FoundChoice,
+    ModelResult,
+    SortedValue,
+    Tokenizer,
+)
+from botbuilder.dialogs.prompts import (
+    ChoicePrompt,
+    PromptOptions,
+    PromptRecognizerResult,
+    PromptValidatorContext,
+)
+from botbuilder.schema import ActivityTypes
+from recognizers_number import NumberRecognizer
+from recognizers_text import Culture
+
+
+class ChoiceIndex:
+    """
+    Token index over the values, action titles and synonyms of a list of choices.
+    Remarks: Find.find_choices() tokenizes every synonym and looks for it in the utterance on every
+    turn. A synonym only matches when at least one of its tokens is in the utterance, so the index
+    keeps the synonyms that contain each normalized token and only those are handed to
+    Find.find_values(), in their original order. The results are the same as
+    ChoiceRecognizers.recognize_choices() with the same choices and options.
+    """
+
+    def __init__(
+        self, choices: List[Union[str, Choice]], options: FindChoicesOptions = None
+    ):
+        opt = options if options else FindChoicesOptions()
+        tokenizer = opt.tokenizer if opt.tokenizer else Tokenizer.default_tokenizer
+
+        # Normalize list of choices
+        self.choices = [
+            Choice(value=choice) if isinstance(choice, str) else choice
+            for choice in choices
+        ]
+
+        # Same synonyms as Find.find_choices(), in the same order.
+        self._synonyms: List[SortedValue] = []
+        for index, choice in enumerate(self.choices):
+            if not opt.no_value:
+                self._synonyms.append(SortedValue(value=choice.value, index=index))
+
+            if (
+                getattr(choice, "action", False)
+                and getattr(choice.action, "title", False)
+                and not opt.no_value
+            ):
+                self._synonyms.append(SortedValue(value=choice.action.title, index=index))
+
+            if choice.synonyms is not None:
+                for synonym in choice.synonyms:
+                    self._synonyms.append(SortedValue(value=synonym, index=index))
+
+        self._postings: Dict[str, List[int]] = {}
+        for position, synonym in enumerate(self._synonyms):
+            for token in tokenizer(synonym.value.strip(), opt.locale):
+                postings = self._postings.setdefault(token.normalized, [])
+                if not postings or postings[-1] != position:
+                    postings.append(position)
+
+    @staticmethod
+    def key(choices: List[Union[str, Choice]], options: FindChoicesOptions = None) -> tuple:
+        """
+        Returns what the index of a list of choices depends on, to find it again for an equal list.
+        """
+
+        opt = options if options else FindChoicesOptions()
+        return (
+            opt.locale,
+            bool(opt.no_value),
+            opt.tokenizer,
+            tuple(
+                (choice, None, None)
+                if isinstance(choice, str)
+                else (
+                    choice.value,
+                    getattr(choice.action, "title", None) if choice.action else None,
+                    tuple(choice.synonyms) if choice.synonyms is not None else None,
+                )
+                for choice in choices
+            ),
+        )
+
+    def find_choices(
+        self, utterance: str, options: FindChoicesOptions = None
+    ) -> List[ModelResult]:
+        opt = options if options else FindChoicesOptions()
+        tokenizer = opt.tokenizer if opt.tokenizer else Tokenizer.default_tokenizer
+
+        positions = set()
+        for token in tokenizer(utterance, opt.locale):
+            positions.update(self._postings.get(token.normalized, ()))
+        if not positions:
+            return []
+
+        candidates = [self._synonyms[position] for position in sorted(positions)]
+        return [
+            self._found_choice(value_model)
+            for value_model in Find.find_values(utterance, candidates, options)
+        ]
+
+    def recognize_choices(
+        self, utterance: str, options: FindChoicesOptions = None
+    ) -> List[ModelResult]:
+        """
+        Same as ChoiceRecognizers.recognize_choices(): by name first, then by ordinal and by index.
+        """
+
+        if utterance is None:
+            utterance = ""
+
+        locale = options.locale if (options and options.locale) else Culture.English
+        matched = self.find_choices(utterance, options)
+        if not matched:
+            matches = []
+
+            if not options or options.recognize_ordinals:
+                # Next try finding by ordinal
+                matches = _parse_numbers(_get_ordinal_model(locale), utterance)
+                for match in matches:
+                    ChoiceRecognizers._match_choice_by_index(  # pylint: disable=protected-access
+                        self.choices, matched, match
+                    )
+
+            if not matches and (not options or options.recognize_numbers):
+                # Then try by numerical index
+                matches = _parse_numbers(_get_number_model(locale), utterance)
+                for match in matches:
+                    ChoiceRecognizers._match_choice_by_index(  # pylint: disable=protected-access
+                        self.choices, matched, match
+                    )
+
+            # Sort any found matches by their position within the utterance.
+            matched = sorted(matched, key=lambda model_result: model_result.start)
+
+        return matched
+
+    def _found_choice(self, value_model: ModelResult) -> ModelResult:
+        choice = self.choices[value_model.resolution.index]
+
+        return ModelResult(
+            start=value_model.start,
+            end=value_model.end,
+            type_name="choice",
+            text=value_model.text,
+            resolution=FoundChoice(
+                value=choice.value,
+                index=value_model.resolution.index,
+                score=value_model.resolution.score,
+                synonym=value_model.resolution.value,
+            ),
+        )
+
+
+# The number models are built once per culture instead of on every recognition.
+@lru_cache(maxsize=None)
+def _get_ordinal_model(culture: str):
+    return NumberRecognizer(culture).get_ordinal_model(culture)
+
+
+@lru_cache(maxsize=None)
+def _get_number_model(culture: str):
+    return NumberRecognizer(culture).get_number_model(culture)
+
+
+def _parse_numbers(model, utterance: str) -> List[ModelResult]:
+    return [
+        ChoiceRecognizers._found_choice_constructor(  # pylint: disable=protected-access
+            value_model
+        )
+        for value_model in model.parse(utterance)
+    ]
+
+
+class IndexedChoicePrompt(ChoicePrompt):
+    """
+    ChoicePrompt that recognizes the user's choice through a ChoiceIndex of the prompted choices.
+    Remarks: The choices come back from the dialog state on every turn, so the indexes are kept by
+    the content of the choice list; the `index_cache_size` most recently used ones are kept.
+    Recognition gives the same results as ChoicePrompt.
+    """
+
+    def __init__(
+        self,
+        dialog_id: str,
+        validator: Callable[[PromptValidatorContext], bool] = None,
+        default_locale: str = None,
+        choice_defaults: Dict[str, ChoiceFactoryOptions] = None,
+        index_cache_size: int = 16,
+    ):
+        super().__init__(dialog_id, validator, default_locale, choice_defaults)
+        self.index_cache_size = index_cache_size
+        self._indexes: "OrderedDict[tuple, ChoiceIndex]" = OrderedDict()
+
+    async def on_recognize(
+        self,
+        turn_context: TurnContext,
+        state: Dict[str, object],
+        options: PromptOptions,
+    ) -> PromptRecognizerResult:
+        if not turn_context:
+            raise TypeError(
+                "IndexedChoicePrompt.on_recognize(): turn_context cannot be None."
+            )
+
+        choices: List[Choice] = options.choices if (options and options.choices) else []
+        result: PromptRecognizerResult = PromptRecognizerResult()
+
+        if turn_context.activity.type == ActivityTypes.message:
+            utterance: str = turn_context.activity.text
+            if not utterance:
+                return result
+            opt: FindChoicesOptions = (
+                self.recognizer_options
+                if self.recognizer_options
+                else FindChoicesOptions()
+            )
+            opt.locale = self._determine_culture(turn_context.activity, opt)
+            results = self._get_index(choices, opt).recognize_choices(utterance, opt)
+
+            if results is not None and results:
+                result.succeeded = True
+                result.value = results[0].resolution
+
+        return result
+
+    def _get_index(self, choices: List[Choice], options: FindChoicesOptions) -> ChoiceIndex:
+        key = ChoiceIndex.key(choices, options)
+        index = self._indexes.get(key)
+        if index is not None:
+            self._indexes.move_to_end(key)
+            return index
+
+        index = ChoiceIndex(choices, options)
+        self._indexes[key] = index
+        while len(self._indexes) > self.index_cache_size:
+            self._indexes.popitem(last=False)
+        return index
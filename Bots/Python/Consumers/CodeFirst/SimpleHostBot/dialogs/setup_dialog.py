@@ -19,6 +19,8 @@ from botbuilder.schema import InputHints, DeliveryModes
 
 from bots.host_bot import ACTIVE_SKILL_PROPERTY_NAME, DELIVERY_MODE_PROPERTY_NAME
 from config import SkillConfiguration
+from skill_state_property import SkillStateProperty
+from dialogs.indexed_choice_prompt import IndexedChoicePrompt
 
 
 class SetupDialog(ComponentDialog):
@@ -30,17 +32,19 @@ class SetupDialog(ComponentDialog):
         self._delivery_mode_property = conversation_state.create_property(
             DELIVERY_MODE_PROPERTY_NAME
         )
-        self._active_skill_property = conversation_state.create_property(
-            ACTIVE_SKILL_PROPERTY_NAME
-        )
         self._delivery_mode = ""
 
         self._skills_config = skills_config
+        self._active_skill_property = SkillStateProperty(
+            conversation_state,
+            ACTIVE_SKILL_PROPERTY_NAME,
+            lambda skill_id: self._skills_config.SKILLS.get(skill_id),
+        )
 
         # Define the setup dialog and its related components.
         # Add ChoicePrompt to render available skills.
         self.add_dialog(ChoicePrompt(self.select_delivery_mode_step.__name__))
-        self.add_dialog(ChoicePrompt(self.select_skill_step.__name__))
+        self.add_dialog(IndexedChoicePrompt(self.select_skill_step.__name__))
         self.add_dialog(TextPrompt(self.final_step.__name__))
         # Add main waterfall dialog for this bot.
         self.add_dialog(
@@ -103,11 +107,23 @@ class SetupDialog(ComponentDialog):
     # The SetupDialog has ended, we go back to the HostBot to connect with the selected skill.
     async def final_step(self, step_context: WaterfallStepContext) -> DialogTurnResult:
         # Set active skill.
-        for i in self._skills_config.SKILLS.keys():
+        skills = self._skills_config.SKILLS
+        selected_skill = None
+        for i in skills.keys():
             if i.lower() == step_context.result.value.lower():
-                selected_skill = self._skills_config.SKILLS.get(i)
+                selected_skill = skills.get(i)
+
+        if not selected_skill:
+            # The skill was removed from the configuration after the prompt was sent.
+            message = MessageFactory.text(
+                f"The skill {step_context.result.value} is no longer available."
+            )
+            await step_context.context.send_activity(message)
+
+            # Restart setup dialog
+            return await step_context.replace_dialog(self.initial_dialog_id)
 
-        await self._active_skill_property.set(step_context.context, selected_skill)
+        await self._active_skill_property.set(step_context.context, selected_skill.id)
 
         v3_bots = ['EchoSkillBotDotNetV3', 'EchoSkillBotJSV3']
 
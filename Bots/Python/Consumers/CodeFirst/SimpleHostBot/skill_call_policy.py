@@ -0,0 +1,81 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import random
+from typing import Dict, List
+
+from aiohttp import ClientConnectionError, ClientResponseError
+from botbuilder.schema import Activity, ActivityTypes
+
+TOKEN_EXCHANGE_INVOKE_NAME = "signin/tokenExchange"
+
+
+class SkillCallStats:
+    def __init__(self):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class SkillCallPolicy:
+    """
+    Timeout budget, retries and hedging used to call the skills.
+    Remarks: Every call to a skill must complete within `timeout` seconds (or the skill's own value in
+    `skill_timeouts`), retries included. Only idempotent activities (EndOfConversation and the token
+    exchange invoke) are retried, up to `max_retries` times with a full-jitter exponential backoff
+    starting at `backoff` seconds, and only on connection errors, timeouts, 429 and 5xx answers.
+    When a skill has `hedge_endpoints` and `hedge_delay` is set, an idempotent call that hasn't been
+    answered after `hedge_delay` seconds is also sent to the next endpoint and the first answer wins.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 300,
+        max_retries: int = 2,
+        backoff: float = 0.2,
+        max_backoff: float = 2,
+        hedge_delay: float = 0,
+        skill_timeouts: Dict[str, float] = None,
+        hedge_endpoints: Dict[str, List[str]] = None,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_delay = hedge_delay
+        self.skill_timeouts = skill_timeouts or {}
+        self.hedge_endpoints = hedge_endpoints or {}
+
+    def timeout_for(self, skill_id: str) -> float:
+        return self.skill_timeouts.get(skill_id, self.timeout)
+
+    def endpoints_for(self, skill_id: str, to_url: str) -> List[str]:
+        if not self.hedge_delay:
+            return [to_url]
+        return [to_url] + [
+            url for url in self.hedge_endpoints.get(skill_id, []) if url != to_url
+        ]
+
+    def backoff_for(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    @staticmethod
+    def is_idempotent(activity: Activity) -> bool:
+        return activity.type == ActivityTypes.end_of_conversation or (
+            activity.type == ActivityTypes.invoke
+            and activity.name == TOKEN_EXCHANGE_INVOKE_NAME
+        )
+
+    @staticmethod
+    def is_transient(error: Exception) -> bool:
+        if isinstance(error, ClientResponseError):
+            return error.status == 429 or error.status >= 500
+        return isinstance(error, (ClientConnectionError, asyncio.TimeoutError))
@@ -0,0 +1,181 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import json
+import os
+import sys
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def read_skills(path: str) -> List[Dict[str, str]]:
+    """
+    Reads the skills from a JSON file, or from the JSON files of a directory (in name order).
+    Remarks: Files follow the BotFrameworkSkills section of the DotNet and JS hosts' appsettings.json:
+    an object with a "BotFrameworkSkills" list, a list of skills, or a single skill. Each skill has an
+    Id, AppId, SkillEndpoint, Group and optionally a Manifest. Returns the skills with snake_case
+    keys, in file order.
+    """
+
+    skills = []
+    ids = set()
+    for file in _list_files(path):
+        with open(file, encoding="utf-8-sig") as skills_file:
+            data = json.load(skills_file)
+        if isinstance(data, dict):
+            data = data.get("BotFrameworkSkills", [data])
+
+        for entry in data:
+            values = {key.lower(): value for key, value in entry.items()}
+            skill_id = values.get("id")
+            if not skill_id or not values.get("skillendpoint"):
+                raise ValueError(
+                    f"[SkillConfigWatcher]: {file} declares a skill without Id or SkillEndpoint."
+                )
+            if skill_id in ids:
+                raise ValueError(
+                    f"[SkillConfigWatcher]: Skill {skill_id} is declared more than once."
+                )
+
+            ids.add(skill_id)
+            skills.append(
+                {
+                    "id": skill_id,
+                    "app_id": values.get("appid") or "",
+                    "skill_endpoint": values["skillendpoint"],
+                    "group": values.get("group") or "",
+                    "manifest": values.get("manifest"),
+                }
+            )
+
+    return skills
+
+
+class SkillConfigWatcher(Generic[T]):
+    """
+    Watches a skills configuration file (or directory) and swaps the new skills in when it changes.
+    Remarks: The files are checked every `poll_interval` seconds. When they changed, they're read
+    and `build` turns the skills into an immutable snapshot (e.g. a SkillRegistry) in a worker thread.
+    The subscribers then get the snapshot one after the other on the event loop, with no await in
+    between, so no turn sees some of them with the old skills and others with the new ones. Turns
+    already running keep the skills they looked up. A configuration that can't be read or built is
+    reported and the current one stays until the files change again.
+    Call load() at startup, then start() to watch the files.
+    """
+
+    def __init__(
+        self, path: str, build: Callable[[List[Dict[str, str]]], T], poll_interval: float = 5
+    ):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._build = build
+        self._listeners: List[Callable[[T], None]] = []
+        self._signature: Tuple = None
+        self._watcher: asyncio.Task = None
+
+    def subscribe(self, listener: Callable[[T], None]):
+        self._listeners.append(listener)
+
+    def load(self) -> T:
+        signature = self._get_signature()
+        snapshot = self._build(read_skills(self.path))
+        self._signature = signature
+        return snapshot
+
+    async def reload(self) -> bool:
+        """
+        Swaps the skills in when the files changed since the last load. Returns True when they did.
+        """
+
+        try:
+            loaded = await asyncio.get_event_loop().run_in_executor(
+                None, self._load_changes, self._signature
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            self.failures += 1
+            self.last_error = str(error)
+            print(
+                f"\n Unable to load the skills from {self.path}, keeping the current ones: {error}",
+                file=sys.stderr,
+            )
+            return False
+
+        if not loaded:
+            return False
+
+        # No await from here on, the swap is atomic for the turns running on the event loop.
+        self._signature, snapshot = loaded
+        for listener in self._listeners:
+            listener(snapshot)
+        self.reloads += 1
+        self.last_error = None
+        return True
+
+    def start(self):
+        if not self._watcher or self._watcher.done():
+            self._watcher = asyncio.ensure_future(self._watch_loop())
+
+    async def stop(self):
+        if self._watcher:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "path": self.path,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+    async def _watch_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self.reload()
+
+    def _load_changes(self, current: Tuple) -> Optional[Tuple[Tuple, T]]:
+        try:
+            signature = self._get_signature()
+        except OSError:
+            # Missing files are reported once, until they're back.
+            signature = None
+            if current is None:
+                return None
+            self._signature = signature
+            raise
+
+        if signature == current:
+            return None
+
+        try:
+            return signature, self._build(read_skills(self.path))
+        except Exception:
+            # Reported once per change, a file saved halfway is read again when it's complete.
+            self._signature = signature
+            raise
+
+    def _get_signature(self) -> Tuple:
+        signature = []
+        for file in _list_files(self.path):
+            status = os.stat(file)
+            signature.append((file, status.st_mtime_ns, status.st_size))
+        return tuple(signature)
+
+
+def _list_files(path: str) -> List[str]:
+    if not os.path.isdir(path):
+        return [path]
+    return [
+        os.path.join(path, name)
+        for name in sorted(os.listdir(path))
+        if name.lower().endswith(".json")
+    ]
@@ -0,0 +1,46 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from botbuilder.core import Bot, BotAdapter
+from botbuilder.core.skills import ConversationIdFactoryBase, SkillHandler
+from botframework.connector.auth import (
+    AuthenticationConfiguration,
+    ClaimsIdentity,
+    CredentialProvider,
+)
+
+from authentication import ValidatedTokenCache
+
+
+class SkillHandlerWithTokenCache(SkillHandler):
+    """
+    SkillHandler that skips the validation of the tokens it already validated.
+    """
+
+    def __init__(
+        self,
+        adapter: BotAdapter,
+        bot: Bot,
+        conversation_id_factory: ConversationIdFactoryBase,
+        credential_provider: CredentialProvider,
+        auth_configuration: AuthenticationConfiguration,
+        token_validation_cache: ValidatedTokenCache = None,
+    ):
+        super().__init__(
+            adapter,
+            bot,
+            conversation_id_factory,
+            credential_provider,
+            auth_configuration,
+        )
+        self._token_validation_cache = token_validation_cache
+
+    async def _authenticate(self, auth_header: str) -> ClaimsIdentity:
+        if not self._token_validation_cache:
+            return await super()._authenticate(auth_header)
+
+        # Skill callbacks are validated without a channel, keep them apart from /api/messages.
+        validate = super()._authenticate
+        return await self._token_validation_cache.authenticate(
+            auth_header, lambda: validate(auth_header), "skills"
+        )
@@ -0,0 +1,7 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from .dirty_tracking_conversation_state import DirtyTrackingConversationState
+from .sqlite_storage import SqliteStorage
+
+__all__ = ["DirtyTrackingConversationState", "SqliteStorage"]
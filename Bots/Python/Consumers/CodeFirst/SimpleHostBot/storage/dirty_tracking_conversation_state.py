@@ -0,0 +1,39 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from typing import Dict
+
+from botbuilder.core import BotAssert, ConversationState, TurnContext
+
+
+class DirtyTrackingConversationState(ConversationState):
+    """
+    ConversationState that only writes to storage when the state changed.
+    Remarks: BotState keeps the hash of the state as it was last read or written, but
+    save_changes(force=True) writes whether or not the state changed, which costs a storage write
+    on every turn forwarded to a skill. Here a forced save is skipped when the cached state still
+    matches that hash, since storage already holds the same state. `written` and `skipped` count
+    the saves.
+    """
+
+    def __init__(self, storage):
+        super().__init__(storage)
+        self.written = 0
+        self.skipped = 0
+
+    async def save_changes(
+        self, turn_context: TurnContext, force: bool = False
+    ) -> None:
+        BotAssert.context_not_none(turn_context)
+
+        cached_state = self.get_cached_state(turn_context)
+        if cached_state is None or not cached_state.is_changed:
+            if force:
+                self.skipped += 1
+            return
+
+        await super().save_changes(turn_context)
+        self.written += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"written": self.written, "skipped": self.skipped}
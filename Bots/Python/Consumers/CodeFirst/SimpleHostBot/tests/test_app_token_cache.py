@@ -0,0 +1,121 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import aiounittest
+import jwt
+from botframework.connector.auth import MicrosoftAppCredentials
+
+from authentication import AppTokenCache, CachedAppCredentials
+
+SCOPE = "https://api.botframework.com"
+
+
+def _token(expires_in: float) -> str:
+    return jwt.encode(
+        {"exp": int(time.time() + expires_in)}, "a-test-key-that-is-32-bytes-long", "HS256"
+    )
+
+
+class TestAppTokenCache(aiounittest.AsyncTestCase):
+    def setUp(self):
+        self._acquired = []
+        self._expires_in = 3600
+
+        def acquire(credentials, force_refresh=False):
+            # Stands in for the MSAL acquisition of MicrosoftAppCredentials.
+            self._acquired.append((credentials.microsoft_app_id, threading.get_ident()))
+            time.sleep(0.05)
+            return _token(self._expires_in)
+
+        patcher = patch.object(MicrosoftAppCredentials, "get_access_token", acquire)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _credentials(self, cache: AppTokenCache) -> CachedAppCredentials:
+        return cache.wrap(MicrosoftAppCredentials("app-id", "password", oauth_scope=SCOPE))
+
+    def test_wrap_returns_the_same_credentials(self):
+        cache = AppTokenCache()
+        original = MicrosoftAppCredentials("app-id", "password", oauth_scope=SCOPE)
+        original.oauth_endpoint = "https://login.microsoftonline.us/tenant"
+
+        wrapped = cache.wrap(original)
+
+        self.assertIsInstance(wrapped, CachedAppCredentials)
+        self.assertIs(cache.wrap(original), wrapped)
+        self.assertEqual(wrapped.oauth_endpoint, original.oauth_endpoint)
+
+    def test_wrap_skips_anonymous_credentials(self):
+        cache = AppTokenCache()
+        anonymous = MicrosoftAppCredentials.empty()
+
+        self.assertIs(cache.wrap(anonymous), anonymous)
+
+    async def test_concurrent_requests_share_one_acquisition(self):
+        cache = AppTokenCache()
+        credentials = self._credentials(cache)
+
+        tokens = await asyncio.gather(
+            *[cache.get_token_async(credentials) for _ in range(10)]
+        )
+
+        self.assertEqual(len(set(tokens)), 1)
+        self.assertEqual(len(self._acquired), 1)
+        self.assertEqual(cache.stats()["acquisitions"], 1)
+
+    async def test_acquisition_runs_off_the_event_loop(self):
+        cache = AppTokenCache()
+
+        await cache.get_token_async(self._credentials(cache))
+
+        self.assertNotEqual(self._acquired[0][1], threading.get_ident())
+
+    async def test_sync_get_token_is_served_from_the_cache(self):
+        cache = AppTokenCache()
+        credentials = self._credentials(cache)
+        token = await cache.get_token_async(credentials)
+
+        self.assertEqual(credentials.get_access_token(), token)
+        self.assertEqual(len(self._acquired), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    async def test_expiry_is_read_from_the_token(self):
+        cache = AppTokenCache()
+        credentials = self._credentials(cache)
+
+        await cache.get_token_async(credentials)
+        cached = cache._tokens[AppTokenCache._key(credentials)]  # pylint: disable=protected-access
+
+        self.assertAlmostEqual(cached.expires_at, time.time() + 3600, delta=5)
+
+    async def test_token_close_to_expiry_is_refreshed_in_the_background(self):
+        cache = AppTokenCache(refresh_before=300)
+        credentials = self._credentials(cache)
+        self._expires_in = 200
+        first = await cache.get_token_async(credentials)
+
+        self._expires_in = 3600
+        # Still valid: it's returned right away and a new one is acquired in the background.
+        self.assertEqual(await cache.get_token_async(credentials), first)
+        await asyncio.sleep(0.2)
+
+        self.assertEqual(len(self._acquired), 2)
+        self.assertNotEqual(await cache.get_token_async(credentials), first)
+
+    async def test_failed_acquisition_is_raised_and_counted(self):
+        cache = AppTokenCache()
+        credentials = self._credentials(cache)
+
+        def fail(credentials, force_refresh=False):
+            raise PermissionError("Failed to get access token")
+
+        with patch.object(MicrosoftAppCredentials, "get_access_token", fail):
+            with self.assertRaises(PermissionError):
+                await cache.get_token_async(credentials)
+
+        self.assertEqual(cache.stats()["failures"], 1)
@@ -0,0 +1,171 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import gzip
+import unittest
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from unittest.mock import patch
+
+import aiounittest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from botbuilder.schema import Activity, ActivityTypes
+from botframework.connector.aio import ConnectorClient
+from botframework.connector.auth import MicrosoftAppCredentials
+from botframework.connector.models import ErrorResponseException
+
+import http_compression
+from http_compression import (
+    ACCEPT_ENCODING,
+    HttpCompression,
+    RequestCompressionPolicy,
+    negotiate,
+)
+
+TEXT = "x" * 4096
+
+
+class TestNegotiate(unittest.TestCase):
+    def test_picks_the_preferred_supported_coding(self):
+        with patch.object(http_compression, "SUPPORTED_CODINGS", ("br", "gzip")):
+            self.assertEqual(negotiate("gzip, br"), "br")
+            self.assertEqual(negotiate("gzip, deflate"), "gzip")
+
+        with patch.object(http_compression, "SUPPORTED_CODINGS", ("gzip",)):
+            self.assertEqual(negotiate("br, gzip"), "gzip")
+            self.assertIsNone(negotiate("br"))
+
+    def test_ignores_case_and_whitespace(self):
+        self.assertEqual(negotiate(" GZip ;Q=0.5"), "gzip")
+
+    def test_q_0_means_not_acceptable(self):
+        self.assertIsNone(negotiate("gzip;q=0"))
+        self.assertIsNone(negotiate("gzip; q=0.000"))
+        self.assertEqual(negotiate("gzip;q=0.1"), "gzip")
+
+    def test_wildcard_accepts_any_coding(self):
+        self.assertEqual(negotiate("*"), http_compression.SUPPORTED_CODINGS[0])
+
+    def test_missing_header_accepts_no_coding(self):
+        self.assertIsNone(negotiate(None))
+        self.assertIsNone(negotiate(""))
+        self.assertIsNone(negotiate("identity"))
+
+
+class TestHttpCompressionMiddleware(aiounittest.AsyncTestCase):
+    @asynccontextmanager
+    async def _client(self, compression: HttpCompression):
+        async def messages(request: web.Request) -> web.Response:
+            return web.Response(text=await request.text())
+
+        app = web.Application(middlewares=[compression.middleware])
+        app.router.add_post("/api/messages", messages)
+        client = TestClient(TestServer(app))
+        await client.start_server()
+        try:
+            yield client
+        finally:
+            await client.close()
+
+    async def test_compresses_large_responses_and_advertises_codings(self):
+        compression = HttpCompression(threshold=1024)
+        async with self._client(compression) as client:
+            response = await client.post(
+                "/api/messages",
+                data=gzip.compress(TEXT.encode()),
+                headers={"Content-Encoding": "gzip", "Accept-Encoding": "gzip"},
+            )
+
+            self.assertEqual(await response.text(), TEXT)
+            self.assertEqual(response.headers["Content-Encoding"], "gzip")
+            self.assertEqual(response.headers["Accept-Encoding"], ACCEPT_ENCODING)
+
+        stats = compression.stats()["/api/messages"]
+        self.assertEqual(stats["compressed_requests"], 1)
+        self.assertEqual(stats["compressed_responses"], 1)
+        self.assertGreater(stats["request_savings"], 0)
+        self.assertGreater(stats["response_savings"], 0)
+
+    async def test_small_responses_are_sent_as_is(self):
+        async with self._client(HttpCompression(threshold=1024)) as client:
+            response = await client.post(
+                "/api/messages", data="hi", headers={"Accept-Encoding": "gzip"}
+            )
+
+            self.assertNotIn("Content-Encoding", response.headers)
+
+    async def test_disabled_compression_doesnt_advertise_codings(self):
+        compression = HttpCompression(threshold=1024, enabled=False)
+        async with self._client(compression) as client:
+            response = await client.post(
+                "/api/messages", data=TEXT, headers={"Accept-Encoding": "gzip"}
+            )
+
+            self.assertNotIn("Content-Encoding", response.headers)
+            self.assertNotIn("Accept-Encoding", response.headers)
+
+        self.assertEqual(compression.stats()["/api/messages"]["requests"], 1)
+
+
+class TestRequestCompressionPolicy(aiounittest.AsyncTestCase):
+    @asynccontextmanager
+    async def _connector(self, accepts_compressed_bodies=True):
+        """
+        Runs a channel that advertises gzip and yields a ConnectorClient for it.
+        """
+
+        self._received = []
+
+        async def activities(request: web.Request) -> web.Response:
+            encoding = request.headers.get("Content-Encoding")
+            self._received.append(encoding)
+            if encoding and not accepts_compressed_bodies:
+                return web.Response(status=HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+            return web.json_response({"id": "1"}, headers={"Accept-Encoding": "gzip"})
+
+        app = web.Application()
+        app.router.add_post("/v3/conversations/{conversation_id}/activities", activities)
+        server = TestServer(app)
+        await server.start_server()
+        client = ConnectorClient(MicrosoftAppCredentials("", ""), str(server.make_url("")))
+        try:
+            yield client
+        finally:
+            await server.close()
+
+    @staticmethod
+    async def _send(client: ConnectorClient):
+        await client.conversations.send_to_conversation(
+            "c", Activity(type=ActivityTypes.message, text=TEXT)
+        )
+
+    async def test_install_is_done_once(self):
+        client = ConnectorClient(MicrosoftAppCredentials("", ""), "https://channel")
+
+        policy = RequestCompressionPolicy.install(client, HttpCompression())
+        pipeline = client.config.pipeline
+
+        self.assertIs(RequestCompressionPolicy.install(client, HttpCompression()), policy)
+        self.assertIs(client.config.pipeline, pipeline)
+
+    async def test_bodies_are_compressed_once_the_receiver_advertises_a_coding(self):
+        async with self._connector() as client:
+            RequestCompressionPolicy.install(client, HttpCompression(threshold=1024))
+            await self._send(client)
+            await self._send(client)
+
+        self.assertEqual(self._received, [None, "gzip"])
+
+    async def test_compression_stays_off_after_a_415(self):
+        async with self._connector(accepts_compressed_bodies=False) as client:
+            RequestCompressionPolicy.install(client, HttpCompression(threshold=1024))
+            await self._send(client)
+            with self.assertRaises(ErrorResponseException):
+                await self._send(client)
+
+            # The channel keeps advertising gzip, the bodies aren't compressed again.
+            await self._send(client)
+            await self._send(client)
+
+        self.assertEqual(self._received, [None, "gzip", None, None])
@@ -0,0 +1,97 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import unittest
+
+from botbuilder.dialogs.choices import Choice, ChoiceRecognizers, FindChoicesOptions
+from botbuilder.schema import ActionTypes, CardAction
+
+from dialogs.indexed_choice_prompt import ChoiceIndex, IndexedChoicePrompt
+
+CHOICES = [
+    Choice(value="EchoSkillBot"),
+    Choice(value="WaterfallSkillBot", synonyms=["waterfall", "the python skill"]),
+    Choice(
+        value="TeamsSkillBot",
+        action=CardAction(type=ActionTypes.im_back, title="Teams skill", value="TeamsSkillBot"),
+    ),
+    "Composer skill bot",
+]
+
+UTTERANCES = [
+    "EchoSkillBot",
+    "I want the waterfall one",
+    "teams skill please",
+    "the python skill",
+    "composer bot",
+    "skill",
+    "2",
+    "the third one",
+    "second",
+    "nothing here",
+    "",
+]
+
+
+def _results(models) -> list:
+    return [
+        (
+            model.start,
+            model.end,
+            model.text,
+            model.resolution.value,
+            model.resolution.index,
+            model.resolution.score,
+            model.resolution.synonym,
+        )
+        for model in models
+    ]
+
+
+class TestChoiceIndex(unittest.TestCase):
+    def _assert_same_as_choice_recognizers(self, options: FindChoicesOptions):
+        index = ChoiceIndex(CHOICES, options)
+
+        for utterance in UTTERANCES:
+            with self.subTest(utterance=utterance):
+                self.assertEqual(
+                    _results(index.recognize_choices(utterance, options)),
+                    _results(ChoiceRecognizers.recognize_choices(utterance, CHOICES, options)),
+                )
+
+    def test_recognizes_like_choice_recognizers(self):
+        self._assert_same_as_choice_recognizers(FindChoicesOptions(locale="en-us"))
+
+    def test_recognizes_like_choice_recognizers_without_values(self):
+        self._assert_same_as_choice_recognizers(FindChoicesOptions(locale="en-us", no_value=True))
+
+    def test_recognizes_like_choice_recognizers_without_numbers(self):
+        self._assert_same_as_choice_recognizers(
+            FindChoicesOptions(locale="en-us", recognize_ordinals=False, recognize_numbers=False)
+        )
+
+    def test_key_is_the_same_for_equal_choices(self):
+        options = FindChoicesOptions(locale="en-us")
+
+        self.assertEqual(
+            ChoiceIndex.key(CHOICES, options),
+            ChoiceIndex.key([Choice(value="EchoSkillBot")] + CHOICES[1:], options),
+        )
+        self.assertNotEqual(
+            ChoiceIndex.key(CHOICES, options), ChoiceIndex.key(CHOICES[1:], options)
+        )
+
+
+class TestIndexedChoicePrompt(unittest.TestCase):
+    def test_keeps_the_most_recently_used_indexes(self):
+        # pylint: disable=protected-access
+        prompt = IndexedChoicePrompt("prompt", index_cache_size=2)
+        options = FindChoicesOptions(locale="en-us")
+
+        first = prompt._get_index(CHOICES, options)
+        prompt._get_index(CHOICES[1:], options)
+        self.assertIs(prompt._get_index(CHOICES, options), first)
+        prompt._get_index(CHOICES[2:], options)
+
+        self.assertIs(prompt._get_index(CHOICES, options), first)
+        self.assertEqual(len(prompt._indexes), 2)
@@ -0,0 +1,155 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import time
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+
+import aiounittest
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+from botbuilder.core import MemoryStorage
+from botbuilder.core.skills import BotFrameworkSkill, SkillConversationIdFactory
+from botbuilder.schema import Activity, ActivityTypes, ConversationAccount
+from botframework.connector.auth import SimpleCredentialProvider
+
+from http_compression import HttpCompression
+from pooled_skill_http_client import PooledSkillHttpClient
+from skill_call_policy import SkillCallStats
+from skill_circuit_breaker import (
+    CircuitState,
+    SkillCircuitBreaker,
+    SkillUnavailableError,
+)
+
+BODY = b'{"type": "message", "text": "' + b"x" * 4096 + b'"}'
+SKILL_ID = "EchoSkillBot"
+
+
+class TestPooledSkillHttpClient(aiounittest.AsyncTestCase):
+    @asynccontextmanager
+    async def _skill(self, statuses=None, accepts_compressed_bodies=True, **client_options):
+        """
+        Runs a skill and yields a client for it and the skill's url. The skill answers with the
+        `statuses` in order, then with 200.
+        """
+
+        self._received = []
+        statuses = list(statuses or [])
+
+        async def messages(request: web.Request) -> web.Response:
+            encoding = request.headers.get("Content-Encoding")
+            self._received.append(encoding)
+            if encoding and not accepts_compressed_bodies:
+                return web.Response(status=HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+            if statuses:
+                return web.Response(status=statuses.pop(0))
+            # Advertises gzip either way, like a skill behind a proxy that doesn't take them.
+            return web.json_response({}, headers={"Accept-Encoding": "gzip"})
+
+        app = web.Application()
+        app.router.add_post("/api/messages", messages)
+        server = TestServer(app)
+        await server.start_server()
+        url = str(server.make_url("/api/messages"))
+        client = PooledSkillHttpClient(
+            SimpleCredentialProvider("", ""),
+            SkillConversationIdFactory(MemoryStorage()),
+            {SKILL_ID: BotFrameworkSkill(id=SKILL_ID, app_id="", skill_endpoint=url)},
+            **client_options,
+        )
+        try:
+            yield client, url
+        finally:
+            await client.close()
+            await server.close()
+
+    async def _post(self, client: PooledSkillHttpClient, url: str) -> int:
+        status, _ = await client._post_once(  # pylint: disable=protected-access
+            url, BODY, {"Content-Type": "application/json"}, time.monotonic() + 10, SkillCallStats()
+        )
+        return status
+
+    @staticmethod
+    async def _post_activity(client: PooledSkillHttpClient, url: str):
+        activity = Activity(
+            type=ActivityTypes.message, text="hi", conversation=ConversationAccount(id="c")
+        )
+        return await client.post_activity("", "", url, "https://host", "c", activity)
+
+    async def test_bodies_are_compressed_once_the_skill_advertises_a_coding(self):
+        async with self._skill(compression=HttpCompression(threshold=1024)) as (client, url):
+            await self._post(client, url)
+            await self._post(client, url)
+
+        self.assertEqual(self._received, [None, "gzip"])
+        stats = client.pool_stats()[SKILL_ID]
+        self.assertLess(stats["request_wire_bytes"], stats["request_bytes"])
+
+    async def test_415_resends_the_body_as_is_once(self):
+        async with self._skill(
+            accepts_compressed_bodies=False, compression=HttpCompression(threshold=1024)
+        ) as (client, url):
+            await self._post(client, url)
+
+            self.assertEqual(await self._post(client, url), HTTPStatus.OK)
+
+        self.assertEqual(self._received, [None, "gzip", None])
+        stats = client.pool_stats()[SKILL_ID]
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["peak_in_flight"], 1)
+
+    async def test_compression_stays_off_after_a_415(self):
+        async with self._skill(
+            accepts_compressed_bodies=False, compression=HttpCompression(threshold=1024)
+        ) as (client, url):
+            await self._post(client, url)
+            await self._post(client, url)
+
+            # The skill keeps advertising gzip, the bodies aren't compressed again.
+            await self._post(client, url)
+            await self._post(client, url)
+
+        self.assertEqual(self._received, [None, "gzip", None, None, None])
+
+    async def test_server_errors_open_the_circuit(self):
+        breaker = SkillCircuitBreaker(failure_threshold=2)
+        async with self._skill([503, 503], circuit_breaker=breaker) as (client, url):
+            for _ in range(2):
+                with self.assertRaises(ClientResponseError):
+                    await self._post_activity(client, url)
+
+            with self.assertRaises(SkillUnavailableError):
+                await self._post_activity(client, url)
+
+        self.assertEqual(len(self._received), 2)
+        self.assertEqual(breaker.health(SKILL_ID).state, CircuitState.open)
+
+    async def test_client_errors_dont_count_against_the_skill(self):
+        breaker = SkillCircuitBreaker(failure_threshold=1)
+        async with self._skill([404], circuit_breaker=breaker) as (client, url):
+            with self.assertRaises(ClientResponseError):
+                await self._post_activity(client, url)
+
+        health = breaker.health(SKILL_ID)
+        self.assertEqual(health.state, CircuitState.closed)
+        self.assertEqual(health.successes, 1)
+
+    async def test_errors_before_reaching_the_skill_release_the_probe(self):
+        breaker = SkillCircuitBreaker(failure_threshold=1, reset_timeout=0)
+        async with self._skill([503], circuit_breaker=breaker) as (client, url):
+            with self.assertRaises(ClientResponseError):
+                await self._post_activity(client, url)
+
+            async def fail(*_):
+                raise PermissionError("Failed to get access token")
+
+            # The circuit is half-open: the probe fails before reaching the skill.
+            client._get_app_credentials = fail  # pylint: disable=protected-access
+            with self.assertRaises(PermissionError):
+                await self._post_activity(client, url)
+
+        health = breaker.health(SKILL_ID)
+        self.assertEqual(health.failures, 1)
+        self.assertFalse(health.probe_in_flight)
@@ -0,0 +1,170 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from unittest.mock import Mock
+
+import aiounittest
+from aiohttp import ClientConnectionError, ClientResponseError, web
+from aiohttp.test_utils import TestServer
+from botbuilder.core import MemoryStorage
+from botbuilder.core.skills import BotFrameworkSkill, SkillConversationIdFactory
+from botbuilder.schema import Activity, ActivityTypes, ConversationAccount
+from botframework.connector.auth import SimpleCredentialProvider
+
+from pooled_skill_http_client import PooledSkillHttpClient
+from skill_call_policy import SkillCallPolicy
+
+SKILL_ID = "EchoSkillBot"
+
+
+def _response_error(status: int) -> ClientResponseError:
+    return ClientResponseError(Mock(), (), status=status)
+
+
+def _activity(activity_type: str, name: str = None) -> Activity:
+    return Activity(type=activity_type, name=name, conversation=ConversationAccount(id="c"))
+
+
+class TestSkillCallPolicy(aiounittest.AsyncTestCase):
+    def test_transient_errors(self):
+        self.assertTrue(SkillCallPolicy.is_transient(_response_error(429)))
+        self.assertTrue(SkillCallPolicy.is_transient(_response_error(503)))
+        self.assertTrue(SkillCallPolicy.is_transient(ClientConnectionError()))
+        self.assertTrue(SkillCallPolicy.is_transient(asyncio.TimeoutError()))
+        self.assertFalse(SkillCallPolicy.is_transient(_response_error(404)))
+        self.assertFalse(SkillCallPolicy.is_transient(PermissionError()))
+
+    def test_idempotent_activities(self):
+        self.assertTrue(SkillCallPolicy.is_idempotent(_activity(ActivityTypes.end_of_conversation)))
+        self.assertTrue(
+            SkillCallPolicy.is_idempotent(_activity(ActivityTypes.invoke, "signin/tokenExchange"))
+        )
+        self.assertFalse(SkillCallPolicy.is_idempotent(_activity(ActivityTypes.message)))
+        self.assertFalse(SkillCallPolicy.is_idempotent(_activity(ActivityTypes.invoke, "other")))
+
+    def test_backoff_is_bounded(self):
+        policy = SkillCallPolicy(backoff=0.2, max_backoff=1)
+
+        for attempt in range(10):
+            self.assertLessEqual(policy.backoff_for(attempt), min(1, 0.2 * 2 ** attempt))
+
+    def test_skill_timeouts_and_hedge_endpoints(self):
+        policy = SkillCallPolicy(
+            timeout=10,
+            hedge_delay=0.5,
+            skill_timeouts={SKILL_ID: 2},
+            hedge_endpoints={SKILL_ID: ["http://a", "http://b"]},
+        )
+
+        self.assertEqual(policy.timeout_for(SKILL_ID), 2)
+        self.assertEqual(policy.timeout_for("other"), 10)
+        self.assertEqual(policy.endpoints_for(SKILL_ID, "http://a"), ["http://a", "http://b"])
+        self.assertEqual(SkillCallPolicy().endpoints_for(SKILL_ID, "http://a"), ["http://a"])
+
+
+class TestPooledSkillHttpClientCallPolicy(aiounittest.AsyncTestCase):
+    @asynccontextmanager
+    async def _skills(self, *endpoints, **policy_options):
+        """
+        Runs one skill endpoint per (statuses, delay) and yields a client and their urls. Each
+        endpoint answers with its `statuses` in order, then with 200, after `delay` seconds.
+        """
+
+        self._received = []
+        servers = []
+        for index, (statuses, delay) in enumerate(endpoints):
+            servers.append(await self._start_endpoint(index, list(statuses), delay))
+        urls = [str(server.make_url("/api/messages")) for server in servers]
+
+        client = PooledSkillHttpClient(
+            SimpleCredentialProvider("", ""),
+            SkillConversationIdFactory(MemoryStorage()),
+            {SKILL_ID: BotFrameworkSkill(id=SKILL_ID, app_id="", skill_endpoint=urls[0])},
+            call_policy=SkillCallPolicy(
+                backoff=0.01, hedge_endpoints={SKILL_ID: urls}, **policy_options
+            ),
+        )
+        try:
+            yield client, urls
+        finally:
+            await client.close()
+            for server in servers:
+                await server.close()
+
+    async def _start_endpoint(self, index: int, statuses: list, delay: float) -> TestServer:
+        async def messages(request: web.Request) -> web.Response:
+            self._received.append(index)
+            await asyncio.sleep(delay)
+            return web.json_response({}, status=statuses.pop(0) if statuses else HTTPStatus.OK)
+
+        app = web.Application()
+        app.router.add_post("/api/messages", messages)
+        server = TestServer(app)
+        await server.start_server()
+        return server
+
+    @staticmethod
+    async def _post(client: PooledSkillHttpClient, url: str, activity_type: str):
+        return await client.post_activity(
+            "", "", url, "https://host", "c", _activity(activity_type)
+        )
+
+    async def test_idempotent_call_is_retried_on_server_errors(self):
+        async with self._skills(([503, 502], 0)) as (client, urls):
+            response = await self._post(client, urls[0], ActivityTypes.end_of_conversation)
+
+        self.assertEqual(response.status, HTTPStatus.OK)
+        self.assertEqual(len(self._received), 3)
+        self.assertEqual(client.call_stats()[SKILL_ID]["retries"], 2)
+
+    async def test_retries_stop_at_max_retries(self):
+        async with self._skills(([503] * 5, 0), max_retries=1) as (client, urls):
+            with self.assertRaises(ClientResponseError):
+                await self._post(client, urls[0], ActivityTypes.end_of_conversation)
+
+        self.assertEqual(len(self._received), 2)
+        self.assertEqual(client.call_stats()[SKILL_ID]["failures"], 1)
+
+    async def test_message_isnt_retried(self):
+        async with self._skills(([503], 0)) as (client, urls):
+            with self.assertRaises(ClientResponseError):
+                await self._post(client, urls[0], ActivityTypes.message)
+
+        self.assertEqual(len(self._received), 1)
+
+    async def test_client_error_isnt_retried(self):
+        async with self._skills(([400], 0)) as (client, urls):
+            with self.assertRaises(ClientResponseError):
+                await self._post(client, urls[0], ActivityTypes.end_of_conversation)
+
+        self.assertEqual(len(self._received), 1)
+
+    async def test_call_fails_once_its_timeout_is_spent(self):
+        async with self._skills(([], 1), timeout=0.2) as (client, urls):
+            started = time.monotonic()
+            with self.assertRaises(asyncio.TimeoutError):
+                await self._post(client, urls[0], ActivityTypes.end_of_conversation)
+
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertGreaterEqual(client.call_stats()[SKILL_ID]["timeouts"], 1)
+
+    async def test_slow_endpoint_is_hedged(self):
+        async with self._skills(([], 1), ([], 0), hedge_delay=0.05) as (client, urls):
+            started = time.monotonic()
+            response = await self._post(client, urls[0], ActivityTypes.end_of_conversation)
+
+        self.assertEqual(response.status, HTTPStatus.OK)
+        self.assertLess(time.monotonic() - started, 0.9)
+        stats = client.call_stats()[SKILL_ID]
+        self.assertEqual(stats["hedges"], 1)
+        self.assertEqual(stats["hedge_wins"], 1)
+
+    async def test_message_isnt_hedged(self):
+        async with self._skills(([], 0.2), ([], 0), hedge_delay=0.05) as (client, urls):
+            await self._post(client, urls[0], ActivityTypes.message)
+
+        self.assertEqual(self._received, [0])
@@ -0,0 +1,100 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import unittest
+from unittest.mock import patch
+
+from skill_circuit_breaker import CircuitState, SkillCircuitBreaker
+
+SKILL_ID = "EchoSkillBot"
+
+
+class TestSkillCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = patch("skill_circuit_breaker.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.breaker = SkillCircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    def _fail(self, times: int = 1):
+        for _ in range(times):
+            self.breaker.record_failure(SKILL_ID, ConnectionError("refused"))
+
+    def test_new_skill_is_healthy(self):
+        self.assertTrue(self.breaker.is_healthy(SKILL_ID))
+        self.assertTrue(self.breaker.allow(SKILL_ID))
+
+    def test_opens_after_consecutive_failures(self):
+        self._fail(2)
+        self.assertTrue(self.breaker.allow(SKILL_ID))
+
+        self._fail()
+
+        self.assertEqual(self.breaker.health(SKILL_ID).state, CircuitState.open)
+        self.assertFalse(self.breaker.allow(SKILL_ID))
+        self.assertIn(SKILL_ID, self.breaker.unhealthy_skills)
+        self.assertEqual(self.breaker.health(SKILL_ID).rejected, 1)
+
+    def test_success_resets_the_consecutive_failures(self):
+        self._fail(2)
+        self.breaker.record_success(SKILL_ID, 0.1)
+        self._fail(2)
+
+        self.assertEqual(self.breaker.health(SKILL_ID).state, CircuitState.closed)
+
+    def test_lets_a_single_probe_through_after_the_reset_timeout(self):
+        self._fail(3)
+        self.now += 30
+
+        self.assertEqual(self.breaker.health(SKILL_ID).state, CircuitState.half_open)
+        self.assertTrue(self.breaker.allow(SKILL_ID))
+        self.assertFalse(self.breaker.allow(SKILL_ID))
+
+    def test_successful_probe_closes_the_circuit(self):
+        self._fail(3)
+        self.now += 30
+        self.breaker.allow(SKILL_ID)
+
+        self.breaker.record_success(SKILL_ID, 0.1)
+
+        self.assertTrue(self.breaker.is_healthy(SKILL_ID))
+        self.assertNotIn(SKILL_ID, self.breaker.unhealthy_skills)
+
+    def test_failed_probe_opens_the_circuit_again(self):
+        self._fail(3)
+        self.now += 30
+        self.breaker.allow(SKILL_ID)
+
+        self._fail()
+
+        self.assertEqual(self.breaker.health(SKILL_ID).state, CircuitState.open)
+        self.now += 29
+        self.assertFalse(self.breaker.allow(SKILL_ID))
+
+    def test_released_probe_lets_the_next_call_probe(self):
+        self._fail(3)
+        self.now += 30
+        self.breaker.allow(SKILL_ID)
+
+        self.breaker.release(SKILL_ID)
+
+        self.assertTrue(self.breaker.allow(SKILL_ID))
+
+    def test_latency_is_a_moving_average(self):
+        breaker = SkillCircuitBreaker(latency_weight=0.5)
+        breaker.record_success(SKILL_ID, 0.1)
+        breaker.record_success(SKILL_ID, 0.3)
+
+        self.assertAlmostEqual(breaker.health(SKILL_ID).latency, 0.2)
+        self.assertEqual(breaker.stats()[SKILL_ID]["latency_ms"], 200.0)
+
+    def test_stats_report_the_last_error(self):
+        self._fail()
+
+        stats = self.breaker.stats()[SKILL_ID]
+
+        self.assertEqual(stats["state"], "closed")
+        self.assertEqual(stats["failures"], 1)
+        self.assertEqual(stats["last_error"], "refused")
@@ -0,0 +1,115 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import os
+import shutil
+import tempfile
+
+import aiounittest
+
+from storage import SqliteStorage
+
+
+class TestSqliteStorage(aiounittest.AsyncTestCase):
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+        self._path = os.path.join(self._folder, "state.db")
+
+    def tearDown(self):
+        shutil.rmtree(self._folder, ignore_errors=True)
+
+    async def test_read_missing_key(self):
+        storage = SqliteStorage(self._path)
+
+        self.assertEqual(await storage.read(["missing"]), {})
+
+    async def test_write_then_read(self):
+        storage = SqliteStorage(self._path)
+
+        await storage.write({"key": {"count": 1}})
+        items = await storage.read(["key"])
+
+        self.assertEqual(items["key"]["count"], 1)
+        self.assertTrue(items["key"]["e_tag"])
+
+    async def test_write_with_stale_e_tag_raises(self):
+        storage = SqliteStorage(self._path)
+        await storage.write({"key": {"count": 1}})
+        first = (await storage.read(["key"]))["key"]
+        await storage.write({"key": dict(first, count=2)})
+
+        with self.assertRaises(KeyError):
+            await storage.write({"key": dict(first, count=3)})
+
+    async def test_write_with_wildcard_e_tag_overwrites(self):
+        storage = SqliteStorage(self._path)
+        await storage.write({"key": {"count": 1}})
+
+        await storage.write({"key": {"count": 2, "e_tag": "*"}})
+
+        self.assertEqual((await storage.read(["key"]))["key"]["count"], 2)
+
+    async def test_write_returns_new_e_tag(self):
+        storage = SqliteStorage(self._path)
+        item = {"count": 1}
+
+        await storage.write({"key": item})
+        item["count"] = 2
+        await storage.write({"key": item})
+
+        self.assertEqual((await storage.read(["key"]))["key"]["count"], 2)
+
+    async def test_delete(self):
+        storage = SqliteStorage(self._path)
+        await storage.write({"key": {"count": 1}})
+
+        await storage.delete(["key"])
+
+        self.assertEqual(await storage.read(["key"]), {})
+
+    async def test_e_tag_not_reused_after_delete(self):
+        storage = SqliteStorage(self._path)
+        await storage.write({"key": {"count": 1}})
+        first = (await storage.read(["key"]))["key"]["e_tag"]
+
+        await storage.delete(["key"])
+        await storage.write({"key": {"count": 2}})
+
+        self.assertNotEqual((await storage.read(["key"]))["key"]["e_tag"], first)
+
+    async def test_other_instance_delete_and_write_is_visible(self):
+        # Two processes sharing the same file: the cache of the first one must not hide the
+        # item the second one re-created.
+        first = SqliteStorage(self._path)
+        second = SqliteStorage(self._path)
+        await first.write({"key": {"v": 1}})
+        self.assertEqual((await first.read(["key"]))["key"]["v"], 1)
+
+        await second.delete(["key"])
+        await second.write({"key": {"v": 2}})
+
+        self.assertEqual((await first.read(["key"]))["key"]["v"], 2)
+
+    async def test_other_instance_write_is_visible(self):
+        first = SqliteStorage(self._path)
+        second = SqliteStorage(self._path)
+        await first.write({"key": {"v": 1}})
+        await first.read(["key"])
+
+        item = (await second.read(["key"]))["key"]
+        item["v"] = 2
+        await second.write({"key": item})
+
+        self.assertEqual((await first.read(["key"]))["key"]["v"], 2)
+
+    async def test_existing_database_continues_from_highest_e_tag(self):
+        storage = SqliteStorage(self._path)
+        await storage.write({"key": {"v": 1}})
+        connection = storage._connect()  # pylint: disable=protected-access
+        connection.execute("DROP TABLE meta")
+        connection.execute("UPDATE items SET e_tag = 41")
+
+        reopened = SqliteStorage(self._path)
+        await reopened.write({"other": {"v": 1}})
+
+        self.assertEqual((await reopened.read(["other"]))["other"]["e_tag"], "42")
@@ -0,0 +1,98 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import time
+
+import aiounittest
+from botframework.connector.auth import ClaimsIdentity
+
+from authentication import ValidatedTokenCache
+
+AUTH_HEADER = "Bearer token"
+
+
+class TestValidatedTokenCache(aiounittest.AsyncTestCase):
+    def setUp(self):
+        self._validations = 0
+
+    def _validate(self, **claims):
+        async def validate() -> ClaimsIdentity:
+            self._validations += 1
+            return ClaimsIdentity(claims=dict(claims), is_authenticated=True)
+
+        return validate
+
+    async def test_valid_token_is_validated_once(self):
+        cache = ValidatedTokenCache()
+        validate = self._validate(exp=time.time() + 3600)
+
+        first = await cache.authenticate(AUTH_HEADER, validate, "channel")
+        second = await cache.authenticate(AUTH_HEADER, validate, "channel")
+
+        self.assertIs(second, first)
+        self.assertEqual(self._validations, 1)
+        self.assertEqual(cache.stats(), {"tokens": 1, "hits": 1, "misses": 1})
+
+    async def test_scope_is_part_of_the_key(self):
+        cache = ValidatedTokenCache()
+        validate = self._validate(exp=time.time() + 3600)
+
+        await cache.authenticate(AUTH_HEADER, validate, "channel", "https://a")
+        await cache.authenticate(AUTH_HEADER, validate, "channel", "https://b")
+
+        self.assertEqual(self._validations, 2)
+
+    async def test_expired_token_is_validated_again(self):
+        cache = ValidatedTokenCache()
+        validate = self._validate(exp=time.time() - 1)
+
+        await cache.authenticate(AUTH_HEADER, validate)
+        await cache.authenticate(AUTH_HEADER, validate)
+
+        self.assertEqual(self._validations, 2)
+
+    async def test_token_before_nbf_is_validated_again(self):
+        cache = ValidatedTokenCache()
+        # Accepted by the validation thanks to the clock tolerance, but not valid yet.
+        validate = self._validate(nbf=time.time() + 60, exp=time.time() + 3600)
+
+        await cache.authenticate(AUTH_HEADER, validate)
+        await cache.authenticate(AUTH_HEADER, validate)
+
+        self.assertEqual(self._validations, 2)
+        self.assertEqual(cache.stats()["hits"], 0)
+
+    async def test_token_after_nbf_is_served_from_the_cache(self):
+        cache = ValidatedTokenCache()
+        validate = self._validate(nbf=time.time() - 60, exp=time.time() + 3600)
+
+        await cache.authenticate(AUTH_HEADER, validate)
+        await cache.authenticate(AUTH_HEADER, validate)
+
+        self.assertEqual(self._validations, 1)
+
+    async def test_anonymous_identity_isnt_cached(self):
+        cache = ValidatedTokenCache()
+
+        async def validate() -> ClaimsIdentity:
+            self._validations += 1
+            return ClaimsIdentity({}, True)
+
+        await cache.authenticate(AUTH_HEADER, validate)
+        await cache.authenticate(AUTH_HEADER, validate)
+
+        self.assertEqual(self._validations, 2)
+
+    async def test_least_recently_used_token_is_evicted(self):
+        cache = ValidatedTokenCache(max_size=2)
+        validate = self._validate(exp=time.time() + 3600)
+
+        await cache.authenticate("Bearer a", validate)
+        await cache.authenticate("Bearer b", validate)
+        await cache.authenticate("Bearer a", validate)
+        await cache.authenticate("Bearer c", validate)
+        await cache.authenticate("Bearer a", validate)
+        await cache.authenticate("Bearer b", validate)
+
+        self.assertEqual(self._validations, 4)
+        self.assertEqual(cache.stats()["tokens"], 2)
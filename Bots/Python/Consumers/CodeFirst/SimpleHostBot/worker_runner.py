@@ -0,0 +1,111 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import os
+import signal
+import socket
+import sys
+
+from aiohttp import web
+from aiohttp.web import Application, Request
+
+
+def run_app(
+    app: Application,
+    port: int,
+    workers: int = 1,
+    stats_interval: int = 60,
+    shared_state: bool = True,
+):
+    """
+    Runs the aiohttp application on one or more worker processes.
+    Remarks: With more than one worker, the master binds the listening socket and forks the workers,
+    which accept connections on the shared socket. The module level ADAPTER/BOT/DIALOG graph is
+    copied into each worker on fork, so no state is shared between workers. Each worker reports the
+    number of requests it has handled every `stats_interval` seconds and when it stops.
+    Pass `shared_state=False` when the conversation state lives in the process (e.g. MemoryStorage):
+    a request for a conversation could reach a worker that doesn't have it, so a single worker is
+    run instead.
+    """
+
+    if workers > 1 and not shared_state:
+        print(
+            f"\n Workers={workers} needs a storage shared between processes (StorageType=sqlite), "
+            "the conversation state and the skill conversation ids are in memory. "
+            "Running a single worker instead.",
+            file=sys.stderr,
+        )
+        workers = 1
+
+    if workers <= 1 or not hasattr(os, "fork"):
+        web.run_app(app, port=int(port))
+        return
+
+    sock = socket.create_server(("0.0.0.0", int(port)), backlog=128)
+    sock.set_inheritable(True)
+
+    pids = []
+    for worker_id in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # Leave the terminal's process group so Ctrl+C only reaches the master, which stops the workers.
+            os.setpgid(0, 0)
+            _run_worker(app, sock, worker_id, stats_interval)
+            os._exit(0)  # pylint: disable=protected-access
+        pids.append(pid)
+
+    print(f"Started {workers} workers on port {port}: {pids}", file=sys.stderr)
+
+    def stop_workers(signum, frame):  # pylint: disable=unused-argument
+        for child in pids:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop_workers)
+    signal.signal(signal.SIGTERM, stop_workers)
+
+    for child in pids:
+        os.waitpid(child, 0)
+
+    sock.close()
+
+
+def _run_worker(app: Application, sock: socket.socket, worker_id: int, stats_interval: int):
+    stats = {"requests": 0}
+
+    @web.middleware
+    async def count_requests(request: Request, handler):
+        stats["requests"] += 1
+        return await handler(request)
+
+    def report():
+        print(
+            f"[worker {worker_id}] pid {os.getpid()} handled {stats['requests']} requests",
+            file=sys.stderr,
+        )
+
+    async def report_periodically():
+        reported = 0
+        while True:
+            await asyncio.sleep(stats_interval)
+            if stats["requests"] != reported:
+                reported = stats["requests"]
+                report()
+
+    async def start_reporting(running_app: Application):
+        running_app["worker_stats_task"] = asyncio.ensure_future(report_periodically())
+
+    async def stop_reporting(running_app: Application):
+        running_app["worker_stats_task"].cancel()
+        report()
+
+    app["worker_id"] = worker_id
+    app["worker_stats"] = stats
+    app.middlewares.insert(0, count_requests)
+    app.on_startup.append(start_reporting)
+    app.on_cleanup.append(stop_reporting)
+
+    web.run_app(app, sock=sock, print=None)
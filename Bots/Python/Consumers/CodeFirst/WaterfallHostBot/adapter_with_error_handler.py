@@ -13,9 +13,15 @@ from botbuilder.core import (
 )
 from botbuilder.integration.aiohttp.skills import SkillHttpClient
 from botbuilder.schema import ActivityTypes, Activity, InputHints
+from botframework.connector import ConnectorClient
+from botframework.connector.auth import AppCredentials, ClaimsIdentity
+
+from authentication import AppTokenCache, CachedAppCredentials, ValidatedTokenCache
+from skill_circuit_breaker import SkillUnavailableError
 
 from skills_configuration import DefaultConfig, SkillsConfiguration
 from bots.root_bot import ACTIVE_SKILL_PROPERTY_NAME
+from skill_state_property import SkillStateProperty
 
 
 class AdapterWithErrorHandler(BotFrameworkAdapter):
@@ -26,6 +32,8 @@ class AdapterWithErrorHandler(BotFrameworkAdapter):
         conversation_state: ConversationState,
         skill_client: SkillHttpClient = None,
         skill_config: SkillsConfiguration = None,
+        token_cache: AppTokenCache = None,
+        token_validation_cache: ValidatedTokenCache = None,
     ):
         super().__init__(settings)
         self._config = config
@@ -37,19 +45,78 @@ class AdapterWithErrorHandler(BotFrameworkAdapter):
         self._conversation_state = conversation_state
         self._skill_client = skill_client
         self._skill_config = skill_config
+        self._token_cache = token_cache
+        self._token_validation_cache = token_validation_cache
 
         self.on_turn_error = self._handle_turn_error
 
+    async def _authenticate_request(
+        self, request: Activity, auth_header: str
+    ) -> ClaimsIdentity:
+        if not self._token_validation_cache:
+            return await super()._authenticate_request(request, auth_header)
+
+        # Channel validation checks the endorsements and the service url, they're part of the key.
+        validate = super()._authenticate_request
+        return await self._token_validation_cache.authenticate(
+            auth_header,
+            lambda: validate(request, auth_header),
+            request.channel_id,
+            request.service_url,
+        )
+
+    async def create_connector_client(
+        self, service_url: str, identity: ClaimsIdentity = None, audience: str = None
+    ) -> ConnectorClient:
+        client = await super().create_connector_client(service_url, identity, audience)
+
+        # The client gets its token synchronously, make sure it's served from the cache.
+        credentials = client.config.credentials
+        if isinstance(credentials, CachedAppCredentials):
+            await self._token_cache.get_token_async(credentials)
+        return client
+
+    def _get_or_create_connector_client(
+        self, service_url: str, credentials: AppCredentials
+    ) -> ConnectorClient:
+        # Replies and proactive messages get their app tokens from the shared token cache.
+        if self._token_cache and credentials:
+            credentials = self._token_cache.wrap(credentials)
+        return super()._get_or_create_connector_client(service_url, credentials)
+
     async def _handle_turn_error(self, turn_context: TurnContext, error: Exception):
         # This check writes out errors to console log
         # NOTE: In production environment, you should consider logging this to Azure
         #       application insights.
         print(f"\n [on_turn_error] unhandled error: {error}", file=sys.stderr)
-        traceback.print_exc()
-        await self._send_error_message(turn_context, error)
-        await self._end_skill_conversation(turn_context, error)
+
+        if isinstance(error, SkillUnavailableError):
+            # The skill is known to be down: tell the user once and don't post an EoC to it.
+            await self._send_skill_unavailable_message(turn_context, error)
+        else:
+            traceback.print_exc()
+            await self._send_error_message(turn_context, error)
+            await self._end_skill_conversation(turn_context, error)
+
         await self._clear_conversation_state(turn_context)
 
+    async def _send_skill_unavailable_message(
+        self, turn_context: TurnContext, error: SkillUnavailableError
+    ):
+        try:
+            message_text = (
+                f"The skill {error.skill_id} is not available right now, please try again later."
+            )
+            await turn_context.send_activity(
+                MessageFactory.text(message_text, message_text, InputHints.ignoring_input)
+            )
+        except Exception as exception:
+            print(
+                f"\n Exception caught on _send_skill_unavailable_message : {exception}",
+                file=sys.stderr,
+            )
+            traceback.print_exc()
+
     async def _send_error_message(self, turn_context: TurnContext, error: Exception):
         if not self._skill_client or not self._skill_config:
             return
@@ -90,7 +157,9 @@ class AdapterWithErrorHandler(BotFrameworkAdapter):
             )
             traceback.print_exc()
 
-    async def _end_skill_conversation(self, turn_context: TurnContext):
+    async def _end_skill_conversation(
+        self, turn_context: TurnContext, error: Exception
+    ):  # pylint: disable=unused-argument
         if not self._skill_client or not self._skill_config:
             return
 
@@ -98,8 +167,10 @@ class AdapterWithErrorHandler(BotFrameworkAdapter):
             # Inform the active skill that the conversation is ended so that it has a chance to clean up.
             # Note: the root bot manages the ActiveSkillPropertyName, which has a value while the root bot
             # has an active conversation with a skill.
-            active_skill = await self._conversation_state.create_property(
-                ACTIVE_SKILL_PROPERTY_NAME
+            active_skill = await SkillStateProperty(
+                self._conversation_state,
+                ACTIVE_SKILL_PROPERTY_NAME,
+                self._skill_config.SKILLS.get,
             ).get(turn_context)
 
             if active_skill:
@@ -1,6 +1,7 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
+import os
 from http import HTTPStatus
 
 from aiohttp import web
@@ -8,7 +9,6 @@ from aiohttp.web import Request, Response
 from aiohttp.web_response import json_response
 from botbuilder.core import (
     BotFrameworkAdapterSettings,
-    ConversationState,
     MemoryStorage,
     UserState,
 )
@@ -16,32 +16,87 @@ from botbuilder.core.integration import (
     aiohttp_channel_service_routes,
     aiohttp_error_middleware,
 )
-from botbuilder.schema import Activity
 from botbuilder.core.skills import SkillConversationIdFactory
-from botbuilder.integration.aiohttp.skills import SkillHttpClient
 from botframework.connector.auth import (
     AuthenticationConfiguration,
     SimpleCredentialProvider,
 )
 
-from authentication import AllowedSkillsClaimsValidator
+from authentication import (
+    AllowedSkillsClaimsValidator,
+    AppTokenCache,
+    OpenIdMetadataPrefetcher,
+    ValidatedTokenCache,
+)
 from bots import RootBot
 from dialogs import MainDialog
 from skills_configuration import DefaultConfig, SkillsConfiguration
 from adapter_with_error_handler import AdapterWithErrorHandler
 from token_exchange_skill_handler import TokenExchangeSkillHandler
+from storage import DirtyTrackingConversationState, SqliteStorage
+from worker_runner import run_app
+from activity_decoder import ActivityDecoder
+from pooled_skill_http_client import ConnectionPoolSettings, PooledSkillHttpClient
+from skill_circuit_breaker import SkillCircuitBreaker
+from skill_call_policy import SkillCallPolicy
+from http_compression import HttpCompression
+from asset_cache import AssetCache
 
 CONFIG = DefaultConfig()
 SKILL_CONFIG = SkillsConfiguration()
 
-# Create MemoryStorage, UserState and ConversationState
-MEMORY = MemoryStorage()
-USER_STATE = UserState(MEMORY)
-CONVERSATION_STATE = ConversationState(MEMORY)
-ID_FACTORY = SkillConversationIdFactory(MEMORY)
+# Create the Storage (MemoryStorage or SqliteStorage), UserState and ConversationState
+STORAGE = (
+    SqliteStorage(CONFIG.SQLITE_STORAGE_PATH)
+    if CONFIG.STORAGE_TYPE.lower() == "sqlite"
+    else MemoryStorage()
+)
+USER_STATE = UserState(STORAGE)
+CONVERSATION_STATE = DirtyTrackingConversationState(STORAGE)
+ID_FACTORY = SkillConversationIdFactory(STORAGE)
 
 CREDENTIAL_PROVIDER = SimpleCredentialProvider(CONFIG.APP_ID, CONFIG.APP_PASSWORD)
-CLIENT = SkillHttpClient(CREDENTIAL_PROVIDER, ID_FACTORY)
+# Create the cache for the inbound tokens that passed validation and the signing keys prefetcher.
+TOKEN_VALIDATION_CACHE = ValidatedTokenCache(CONFIG.VALIDATED_TOKEN_CACHE_SIZE)
+OPEN_ID_METADATA_PREFETCHER = OpenIdMetadataPrefetcher(
+    refresh_interval=CONFIG.OPEN_ID_REFRESH_INTERVAL
+)
+
+# Create the cache for the app tokens used to call other bots.
+TOKEN_CACHE = AppTokenCache(refresh_before=CONFIG.TOKEN_REFRESH_BEFORE)
+
+# Create the compression of the bodies exchanged with the skills.
+HTTP_COMPRESSION = HttpCompression(CONFIG.COMPRESSION_THRESHOLD, CONFIG.HTTP_COMPRESSION)
+
+# Create the circuit breaker that tracks the health of the skills.
+CIRCUIT_BREAKER = SkillCircuitBreaker(
+    failure_threshold=SKILL_CONFIG.SKILL_FAILURE_THRESHOLD,
+    reset_timeout=SKILL_CONFIG.SKILL_RESET_TIMEOUT,
+)
+
+# Create the skill client, which keeps a pool of connections per skill.
+CLIENT = PooledSkillHttpClient(
+    CREDENTIAL_PROVIDER,
+    ID_FACTORY,
+    SKILL_CONFIG.SKILLS,
+    ConnectionPoolSettings(
+        max_connections=SKILL_CONFIG.SKILL_MAX_CONNECTIONS,
+        keep_alive=SKILL_CONFIG.SKILL_KEEP_ALIVE,
+        dns_ttl=SKILL_CONFIG.SKILL_DNS_TTL,
+    ),
+    SKILL_CONFIG.SKILL_CONNECTION_LIMITS,
+    CIRCUIT_BREAKER,
+    SkillCallPolicy(
+        timeout=SKILL_CONFIG.SKILL_TIMEOUT,
+        max_retries=SKILL_CONFIG.SKILL_MAX_RETRIES,
+        backoff=SKILL_CONFIG.SKILL_RETRY_BACKOFF,
+        hedge_delay=SKILL_CONFIG.SKILL_HEDGE_DELAY,
+        skill_timeouts=SKILL_CONFIG.SKILL_TIMEOUTS,
+        hedge_endpoints=SKILL_CONFIG.SKILL_HEDGE_ENDPOINTS,
+    ),
+    TOKEN_CACHE,
+    HTTP_COMPRESSION,
+)
 
 # Whitelist skills from SKILLS_CONFIG
 AUTH_CONFIG = AuthenticationConfiguration(
@@ -52,13 +107,28 @@ AUTH_CONFIG = AuthenticationConfiguration(
 # See https://aka.ms/about-bot-adapter to learn more about how bots work.
 SETTINGS = BotFrameworkAdapterSettings(CONFIG.APP_ID, CONFIG.APP_PASSWORD)
 ADAPTER = AdapterWithErrorHandler(
-    SETTINGS, CONFIG, CONVERSATION_STATE, CLIENT, SKILL_CONFIG
+    SETTINGS,
+    CONFIG,
+    CONVERSATION_STATE,
+    CLIENT,
+    SKILL_CONFIG,
+    TOKEN_CACHE,
+    TOKEN_VALIDATION_CACHE,
 )
 
 DIALOG = MainDialog(CONVERSATION_STATE, ID_FACTORY, CLIENT, SKILL_CONFIG, CONFIG)
 
+# Create the cache for the cards sent by the bot and load them up front.
+ASSET_CACHE = AssetCache()
+ASSET_CACHE.register(
+    "welcomeCard",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cards", "welcomeCard.json"),
+    AssetCache.parse_json,
+)
+ASSET_CACHE.preload()
+
 # Create the Bot
-BOT = RootBot(CONVERSATION_STATE, DIALOG)
+BOT = RootBot(CONVERSATION_STATE, DIALOG, ASSET_CACHE)
 
 SKILL_HANDLER = TokenExchangeSkillHandler(
     ADAPTER,
@@ -69,18 +139,30 @@ SKILL_HANDLER = TokenExchangeSkillHandler(
     CLIENT,
     CREDENTIAL_PROVIDER,
     AUTH_CONFIG,
+    TOKEN_VALIDATION_CACHE,
 )
 
+ACTIVITY_DECODER = ActivityDecoder()
+
+# Swap the skills in when SkillsConfigPath changes. SKILL_CONFIG (which the claims validator and the
+# skill handler read on every request) is updated first by the watcher itself. Identities cached for
+# the previous skills are dropped, so removed skills are refused from the next request on.
+SKILLS_CONFIG_WATCHER = SKILL_CONFIG.SKILLS_CONFIG_WATCHER
+if SKILLS_CONFIG_WATCHER:
+    SKILLS_CONFIG_WATCHER.subscribe(lambda registry: CLIENT.update_skills(registry.by_id))
+    SKILLS_CONFIG_WATCHER.subscribe(DIALOG.update_skills)
+    SKILLS_CONFIG_WATCHER.subscribe(lambda registry: TOKEN_VALIDATION_CACHE.clear())
+
 
 # Listen for incoming requests on /api/messages
 async def messages(req: Request) -> Response:
     # Main bot message handler.
     if "application/json" in req.headers["Content-Type"]:
-        body = await req.json()
+        body = ACTIVITY_DECODER.loads(await req.read())
     else:
         return Response(status=HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
 
-    activity = Activity().deserialize(body)
+    activity = ACTIVITY_DECODER.decode(body)
     auth_header = req.headers["Authorization"] if "Authorization" in req.headers else ""
 
     invoke_response = await ADAPTER.process_activity(activity, auth_header, BOT.on_turn)
@@ -89,13 +171,78 @@ async def messages(req: Request) -> Response:
     return Response(status=HTTPStatus.OK)
 
 
-APP = web.Application(middlewares=[aiohttp_error_middleware])
+# Listen for requests on /api/metrics to report the skill connection pools, health, calls, the
+# bytes saved by compression per route, the skill configuration reloads and the skill dialogs built.
+async def metrics(req: Request) -> Response:  # pylint: disable=unused-argument
+    return json_response(
+        data={
+            "skill_connection_pools": CLIENT.pool_stats(),
+            "skill_health": CIRCUIT_BREAKER.stats(),
+            "skill_calls": CLIENT.call_stats(),
+            "app_tokens": TOKEN_CACHE.stats(),
+            "validated_tokens": TOKEN_VALIDATION_CACHE.stats(),
+            "http_compression": HTTP_COMPRESSION.stats(),
+            "skills_config": SKILLS_CONFIG_WATCHER.stats() if SKILLS_CONFIG_WATCHER else None,
+            "skill_dialogs": DIALOG.dialog_cache_stats(),
+            "assets": ASSET_CACHE.stats(),
+            "conversation_state": CONVERSATION_STATE.stats(),
+        }
+    )
+
+
+async def close_skill_client(app: web.Application):  # pylint: disable=unused-argument
+    await CLIENT.close()
+
+
+async def start_token_cache(app: web.Application):  # pylint: disable=unused-argument
+    TOKEN_CACHE.start()
+
+
+async def stop_token_cache(app: web.Application):  # pylint: disable=unused-argument
+    await TOKEN_CACHE.stop()
+
+
+async def start_open_id_metadata_prefetcher(app: web.Application):  # pylint: disable=unused-argument
+    # The keys are fetched in the background, the bot doesn't wait for them to start.
+    OPEN_ID_METADATA_PREFETCHER.start()
+
+
+async def stop_open_id_metadata_prefetcher(app: web.Application):  # pylint: disable=unused-argument
+    await OPEN_ID_METADATA_PREFETCHER.stop()
+
+
+async def start_skills_config_watcher(app: web.Application):  # pylint: disable=unused-argument
+    if SKILLS_CONFIG_WATCHER:
+        SKILLS_CONFIG_WATCHER.start()
+
+
+async def stop_skills_config_watcher(app: web.Application):  # pylint: disable=unused-argument
+    if SKILLS_CONFIG_WATCHER:
+        await SKILLS_CONFIG_WATCHER.stop()
+
+
+APP = web.Application(
+    middlewares=[aiohttp_error_middleware, HTTP_COMPRESSION.middleware]
+)
 APP.router.add_post("/api/messages", messages)
 APP.router.add_get("/api/messages", messages)
 APP.router.add_routes(aiohttp_channel_service_routes(SKILL_HANDLER, "/api/skills"))
+APP.router.add_get("/api/metrics", metrics)
+APP.on_startup.append(start_token_cache)
+APP.on_cleanup.append(close_skill_client)
+APP.on_cleanup.append(stop_token_cache)
+APP.on_startup.append(start_open_id_metadata_prefetcher)
+APP.on_cleanup.append(stop_open_id_metadata_prefetcher)
+APP.on_startup.append(start_skills_config_watcher)
+APP.on_cleanup.append(stop_skills_config_watcher)
 
 if __name__ == "__main__":
     try:
-        web.run_app(APP, port=CONFIG.PORT)
+        run_app(
+            APP,
+            port=CONFIG.PORT,
+            workers=CONFIG.WORKERS,
+            shared_state=CONFIG.STORAGE_TYPE.lower() == "sqlite",
+        )
     except Exception as error:
         raise error
@@ -2,5 +2,14 @@
 # Licensed under the MIT License.
 
 from .allowed_skills_claims_validator import AllowedSkillsClaimsValidator
+from .app_token_cache import AppTokenCache, CachedAppCredentials
+from .open_id_metadata_prefetcher import OpenIdMetadataPrefetcher
+from .validated_token_cache import ValidatedTokenCache
 
-__all__ = ["AllowedSkillsClaimsValidator"]
+__all__ = [
+    "AllowedSkillsClaimsValidator",
+    "AppTokenCache",
+    "CachedAppCredentials",
+    "OpenIdMetadataPrefetcher",
+    "ValidatedTokenCache",
+]
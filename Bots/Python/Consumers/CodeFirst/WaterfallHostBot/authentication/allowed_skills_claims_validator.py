@@ -13,8 +13,9 @@ class AllowedSkillsClaimsValidator:
                 "AllowedSkillsClaimsValidator: config object cannot be None."
             )
 
-        skills_list = [skill.app_id for skill in skills_config.SKILLS.values()]
-        self._allowed_skills = frozenset(skills_list)
+        # The allowed app ids are read from the current registry, so skills added or removed
+        # while running are allowed or refused from the next request on.
+        self._skills_config = skills_config
 
     @property
     def claims_validator(self) -> Callable[[List[Dict]], Awaitable]:
@@ -22,7 +23,7 @@ class AllowedSkillsClaimsValidator:
             if SkillValidation.is_skill_claim(claims):
                 # Check that the appId claim in the skill request is in the list of skills configured for this bot.
                 app_id = JwtTokenValidation.get_app_id_from_claims(claims)
-                if app_id not in self._allowed_skills:
+                if app_id not in self._skills_config.SKILL_REGISTRY.app_ids:
                     raise PermissionError(
                         f'Received a request from a bot with an app ID of "{app_id}".'
                         f" To enable requests from this caller, add the app ID to your configuration file."
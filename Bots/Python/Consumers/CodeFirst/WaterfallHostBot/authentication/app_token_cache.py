@@ -0,0 +1,236 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import threading
+import time
+from typing import Dict, Tuple
+
+import jwt
+from botframework.connector.auth import AppCredentials, MicrosoftAppCredentials
+
+
+class _CachedToken:
+    def __init__(self, token: str, expires_at: float):
+        self.token = token
+        self.expires_at = expires_at
+
+
+class CachedAppCredentials(MicrosoftAppCredentials):
+    """
+    MicrosoftAppCredentials that get their tokens from an AppTokenCache.
+    """
+
+    def __init__(
+        self,
+        token_cache: "AppTokenCache",
+        app_id: str,
+        password: str,
+        oauth_scope: str = None,
+    ):
+        super().__init__(app_id, password, oauth_scope=oauth_scope)
+        self._token_cache = token_cache
+
+    def get_access_token(self, force_refresh: bool = False) -> str:
+        return self._token_cache.get_token(self, force_refresh)
+
+    def acquire_access_token(self) -> str:
+        """
+        Gets a token the way MicrosoftAppCredentials does, through MSAL (authority, token cache).
+        """
+
+        return super().get_access_token()
+
+
+class AppTokenCache:
+    """
+    Caches the AAD app tokens used to call other bots, per app id and audience (oauth scope).
+    Remarks: get_access_token() is synchronous, so a token that expires makes the next request
+    block the event loop while a new one is acquired. This cache refreshes tokens in the background
+    `refresh_before` seconds before they expire, and concurrent acquisitions of the same token share
+    a single acquisition. Tokens are acquired by the credentials themselves (MSAL), in an executor;
+    callers on the event loop use get_token_async() first so that get_access_token() is served
+    from the cache.
+    """
+
+    def __init__(
+        self,
+        refresh_before: float = 300,
+        check_interval: float = 30,
+    ):
+        self.refresh_before = refresh_before
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self.acquisitions = 0
+        self.refreshes = 0
+        self.failures = 0
+
+        self._credentials: Dict[Tuple[str, str], CachedAppCredentials] = {}
+        self._tokens: Dict[Tuple[str, str], _CachedToken] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._refresher: asyncio.Task = None
+
+    def wrap(self, credentials: AppCredentials) -> AppCredentials:
+        """
+        Returns credentials for the same app id and audience that use this cache.
+        """
+
+        if (
+            not isinstance(credentials, MicrosoftAppCredentials)
+            or isinstance(credentials, CachedAppCredentials)
+            or not credentials.microsoft_app_id
+        ):
+            return credentials
+
+        key = self._key(credentials)
+        cached_credentials = self._credentials.get(key)
+        if not cached_credentials:
+            cached_credentials = CachedAppCredentials(
+                self,
+                credentials.microsoft_app_id,
+                credentials.microsoft_app_password,
+                credentials.oauth_scope,
+            )
+            # Keeps the login endpoint of the original credentials (e.g. government cloud).
+            cached_credentials.oauth_endpoint = credentials.oauth_endpoint
+            self._credentials[key] = cached_credentials
+
+        return cached_credentials
+
+    def get_token(
+        self, credentials: CachedAppCredentials, force_refresh: bool = False
+    ) -> str:
+        cached = self._tokens.get(self._key(credentials))
+        if cached and not force_refresh and self._is_valid(cached):
+            self.hits += 1
+            if self._needs_refresh(cached):
+                self._schedule_refresh(credentials)
+            return cached.token
+
+        # Called from synchronous code, a token that wasn't acquired with get_token_async() first
+        # has to be acquired right here.
+        self.misses += 1
+        return self._acquire(credentials, force_refresh)
+
+    async def get_token_async(
+        self, credentials: CachedAppCredentials, force_refresh: bool = False
+    ) -> str:
+        cached = self._tokens.get(self._key(credentials))
+        if cached and not force_refresh and self._is_valid(cached):
+            self.hits += 1
+            if self._needs_refresh(cached):
+                self._schedule_refresh(credentials)
+            return cached.token
+
+        self.misses += 1
+        return await self._refresh(credentials, force_refresh)
+
+    def start(self):
+        if not self._refresher or self._refresher.done():
+            self._refresher = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresher:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tokens": len(self._tokens),
+            "hits": self.hits,
+            "misses": self.misses,
+            "acquisitions": self.acquisitions,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            for key, cached in list(self._tokens.items()):
+                credentials = self._credentials.get(key)
+                if (
+                    credentials
+                    and self._needs_refresh(cached)
+                    and key not in self._inflight
+                ):
+                    self.refreshes += 1
+                    try:
+                        await self._refresh(credentials)
+                    except Exception:  # pylint: disable=broad-except
+                        # The current token is used until it expires, try again on the next check.
+                        pass
+
+    def _schedule_refresh(self, credentials: CachedAppCredentials):
+        if self._key(credentials) in self._inflight:
+            return
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Not on the event loop, the refresh loop will take care of it.
+            return
+
+        self.refreshes += 1
+        self._refresh(credentials).add_done_callback(
+            lambda future: future.cancelled() or future.exception()
+        )
+
+    def _refresh(
+        self, credentials: CachedAppCredentials, force_refresh: bool = False
+    ) -> asyncio.Future:
+        # Concurrent acquisitions of the same token wait for the same request.
+        key = self._key(credentials)
+        inflight = self._inflight.get(key)
+        if not inflight:
+            inflight = asyncio.get_event_loop().run_in_executor(
+                None, self._acquire, credentials, force_refresh
+            )
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return asyncio.shield(inflight)
+
+    def _acquire(self, credentials: CachedAppCredentials, force_refresh: bool) -> str:
+        key = self._key(credentials)
+        with self._locks.setdefault(key, threading.Lock()):
+            # Another thread may have acquired the token while this one waited for the lock.
+            cached = self._tokens.get(key)
+            if cached and not force_refresh and not self._needs_refresh(cached):
+                return cached.token
+
+            try:
+                token = credentials.acquire_access_token()
+            except Exception:
+                self.failures += 1
+                raise
+
+            self.acquisitions += 1
+            self._tokens[key] = _CachedToken(token, self._expires_at(token))
+            return token
+
+    @staticmethod
+    def _expires_at(token: str) -> float:
+        # MSAL only hands back the token, its expiry is read from the token itself.
+        try:
+            return float(jwt.decode(token, options={"verify_signature": False})["exp"])
+        except (jwt.InvalidTokenError, KeyError, TypeError, ValueError):
+            # Not a JWT, AAD app tokens are valid for an hour.
+            return time.time() + 3600
+
+    def _is_valid(self, cached: _CachedToken) -> bool:
+        # Leaves some room for the clock skew and the time the request takes to get there.
+        return cached.expires_at - time.time() > 30
+
+    def _needs_refresh(self, cached: _CachedToken) -> bool:
+        return cached.expires_at - time.time() <= self.refresh_before
+
+    @staticmethod
+    def _key(credentials: AppCredentials) -> Tuple[str, str]:
+        return credentials.microsoft_app_id, credentials.oauth_scope
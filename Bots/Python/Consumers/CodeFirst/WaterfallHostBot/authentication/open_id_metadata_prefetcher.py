@@ -0,0 +1,84 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import sys
+from datetime import datetime
+from typing import List
+
+import requests
+from botframework.connector.auth import (
+    AuthenticationConstants,
+    ChannelValidation,
+    JwtTokenExtractor,
+)
+
+
+class OpenIdMetadataPrefetcher:
+    """
+    Loads the OpenID metadata and signing keys used to validate inbound tokens ahead of time.
+    Remarks: The SDK fetches the signing keys on the first request and again once they're a day old,
+    with blocking HTTP calls made while validating a request. This class fetches them at startup and
+    every `refresh_interval` seconds in a worker thread, and stores them in the SDK's metadata
+    cache, so requests always find fresh keys. start() fetches them in the background right away
+    without holding the startup, requests that come in before they're loaded fetch them as the SDK
+    does.
+    """
+
+    def __init__(self, urls: List[str] = None, refresh_interval: float = 12 * 60 * 60):
+        self.urls = urls or [
+            ChannelValidation.open_id_metadata_endpoint
+            or AuthenticationConstants.TO_BOT_FROM_CHANNEL_OPENID_METADATA_URL,
+            AuthenticationConstants.TO_BOT_FROM_EMULATOR_OPENID_METADATA_URL,
+        ]
+        self.refresh_interval = refresh_interval
+        self.refreshes = 0
+        self.failures = 0
+        self._refresher: asyncio.Task = None
+
+    async def prefetch(self):
+        await asyncio.gather(*[self._refresh(url) for url in self.urls])
+
+    def start(self):
+        if not self._refresher or self._refresher.done():
+            self._refresher = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresher:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    async def _refresh_loop(self):
+        while True:
+            await self.prefetch()
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _refresh(self, url: str):
+        try:
+            keys = await asyncio.get_event_loop().run_in_executor(
+                None, self._fetch_keys, url
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            # The SDK fetches the keys itself when they're missing or stale.
+            self.failures += 1
+            print(f"\n Unable to fetch the signing keys from {url}: {error}", file=sys.stderr)
+            return
+
+        # Same fields _OpenIdMetadata._refresh() sets, so get() serves these keys.
+        metadata = JwtTokenExtractor.get_open_id_metadata(url)
+        metadata.keys = keys
+        metadata.last_updated = datetime.now()
+        self.refreshes += 1
+
+    @staticmethod
+    def _fetch_keys(url: str) -> list:
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        keys_url = response.json()["jwks_uri"]
+        response_keys = requests.get(keys_url, timeout=30)
+        response_keys.raise_for_status()
+        return response_keys.json()["keys"]
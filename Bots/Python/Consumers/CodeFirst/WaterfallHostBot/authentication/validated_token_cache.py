@@ -0,0 +1,80 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Tuple
+
+from botframework.connector.auth import ClaimsIdentity
+
+
+class ValidatedTokenCache:
+    """
+    Bounded cache of the identities of the bearer tokens that passed validation.
+    Remarks: The same token is sent with every request from a channel or a bot until it expires, and
+    validating it means checking its signature, issuer, endorsements and running the claims
+    validator. Entries are keyed by the SHA-256 of the auth header plus the values the validation
+    depends on (e.g. channel id and service url), and are only served between the token's `nbf` and
+    `exp` claims; outside of them the token is validated again.
+    Only successful validations are cached, tokens without `exp` (anonymous) aren't cached at all.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._identities: "OrderedDict[str, Tuple[float, float, ClaimsIdentity]]" = (
+            OrderedDict()
+        )
+
+    async def authenticate(
+        self,
+        auth_header: str,
+        validate: Callable[[], Awaitable[ClaimsIdentity]],
+        *scope: str,
+    ) -> ClaimsIdentity:
+        if not auth_header:
+            return await validate()
+
+        key = self._key(auth_header, scope)
+        entry = self._identities.get(key)
+        if entry:
+            not_before, expires_at, identity = entry
+            now = time.time()
+            if not_before <= now < expires_at:
+                self.hits += 1
+                self._identities.move_to_end(key)
+                return identity
+            del self._identities[key]
+
+        self.misses += 1
+        identity = await validate()
+
+        expires_at = (
+            identity.claims.get("exp")
+            if identity and identity.is_authenticated and identity.claims
+            else None
+        )
+        if expires_at:
+            not_before = float(identity.claims.get("nbf") or 0)
+            self._identities[key] = (not_before, float(expires_at), identity)
+            while len(self._identities) > self.max_size:
+                self._identities.popitem(last=False)
+
+        return identity
+
+    def clear(self):
+        self._identities.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tokens": len(self._identities),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    @staticmethod
+    def _key(auth_header: str, scope: Tuple[str, ...]) -> str:
+        digest = hashlib.sha256(auth_header.encode("utf-8")).hexdigest()
+        return "|".join((digest,) + tuple(value or "" for value in scope))
@@ -0,0 +1,106 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures MainDialog's construction time and memory for growing skill catalogs, with the skill and
+SSO dialogs registered for first use (as MainDialog does) and with all of them built up front.
+Half of the generated skills are Waterfall skills, which also get an SSO dialog.
+
+Run from the bot folder: python benchmarks/bench_main_dialog.py [--skills 10 100 1000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from botbuilder.core import MemoryStorage
+from botbuilder.core.skills import SkillConversationIdFactory
+from botframework.connector.auth import SimpleCredentialProvider
+
+from dialogs import MainDialog
+from pooled_skill_http_client import PooledSkillHttpClient
+from skills_configuration import DefaultConfig, SkillsConfiguration
+from storage import DirtyTrackingConversationState
+
+
+def create_skills(count: int) -> list:
+    return [
+        {
+            "id": f"WATERFALLSKILL{index}" if index % 2 else f"EchoSkill{index}",
+            "group": "Waterfall" if index % 2 else "Echo",
+            "app_id": f"app{index}",
+            "skill_endpoint": f"http://localhost:{40000 + index}/api/messages",
+        }
+        for index in range(count)
+    ]
+
+
+def build_all(dialog: MainDialog):
+    # What MainDialog did before the dialogs were built on first use.
+    dialogs = dialog._dialogs  # pylint: disable=protected-access
+    dialogs.max_size = None
+    for dialog_id in list(dialogs._factories):  # pylint: disable=protected-access
+        dialogs.find_dialog(dialog_id)
+
+
+def measure(create, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        create()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    dialog = create()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    built = len(dialog._dialogs._dialogs)  # pylint: disable=protected-access
+    return f"{min(timings) * 1e3:7.1f} ms {size / 1024:7.0f} KiB {built:5} dialogs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skills", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    config = DefaultConfig()
+    storage = MemoryStorage()
+    conversation_state = DirtyTrackingConversationState(storage)
+    conversation_id_factory = SkillConversationIdFactory(storage)
+    skills_config = SkillsConfiguration()
+
+    print(f"{'skills':>6}  {'on first use':<36}  all built up front")
+    for count in args.skills:
+        skills_config.apply(skills_config.build_registry(create_skills(count)))
+        skill_client = PooledSkillHttpClient(
+            SimpleCredentialProvider("", ""), conversation_id_factory, skills_config.SKILLS
+        )
+
+        def create():
+            return MainDialog(
+                conversation_state,
+                conversation_id_factory,
+                skill_client,  # pylint: disable=cell-var-from-loop
+                skills_config,
+                config,
+            )
+
+        def create_all():
+            dialog = create()
+            build_all(dialog)
+            return dialog
+
+        print(f"{count:>6}  {measure(create, args.repeat)}  {measure(create_all, args.repeat)}")
+
+
+if __name__ == "__main__":
+    main()
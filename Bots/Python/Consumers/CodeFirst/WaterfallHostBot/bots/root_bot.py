@@ -1,8 +1,6 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-import json
-import os.path
 from typing import List
 from botbuilder.core import (
     ActivityHandler,
@@ -12,6 +10,7 @@ from botbuilder.core import (
 )
 from botbuilder.dialogs import Dialog, DialogExtensions
 from botbuilder.schema import ActivityTypes, ChannelAccount, Attachment
+from asset_cache import AssetCache
 
 DELIVERY_MODE_PROPERTY_NAME = "deliveryModeProperty"
 ACTIVE_SKILL_PROPERTY_NAME = "activeSkillProperty"
@@ -22,9 +21,11 @@ class RootBot(ActivityHandler):
         self,
         conversation_state: ConversationState,
         main_dialog: Dialog,
+        asset_cache: AssetCache,
     ):
         self._conversation_state = conversation_state
         self._main_dialog = main_dialog
+        self._asset_cache = asset_cache
 
         self._dialog_state_property = conversation_state.create_property("DialogState")
 
@@ -68,17 +69,12 @@ class RootBot(ActivityHandler):
                     self._dialog_state_property,
                 )
 
-    @staticmethod
-    def _create_adaptive_card_attachment() -> Attachment:
+    def _create_adaptive_card_attachment(self) -> Attachment:
         """
-        Load attachment from embedded resource.
+        Load attachment from the asset cache.
         """
 
-        relative_path = os.path.abspath(os.path.dirname(__file__))
-        path = os.path.join(relative_path, "../cards/welcomeCard.json")
-        with open(path) as in_file:
-            card = json.load(in_file)
-
         return Attachment(
-            content_type="application/vnd.microsoft.card.adaptive", content=card
+            content_type="application/vnd.microsoft.card.adaptive",
+            content=self._asset_cache.get("welcomeCard"),
         )
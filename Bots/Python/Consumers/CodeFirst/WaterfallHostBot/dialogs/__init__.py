@@ -1,8 +1,20 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
+from .indexed_choice_prompt import ChoiceIndex, IndexedChoicePrompt
+from .lazy_dialog_set import LazyDialogSet
 from .main_dialog import MainDialog
+from .streaming_skill_dialog import StreamingSkillDialog
 from .tangent_dialog import TangentDialog
 from .sso import SsoDialog, SsoSignInDialog
 
-__all__ = ["MainDialog", "TangentDialog", "SsoDialog", "SsoSignInDialog"]
+__all__ = [
+    "ChoiceIndex",
+    "IndexedChoicePrompt",
+    "LazyDialogSet",
+    "MainDialog",
+    "StreamingSkillDialog",
+    "TangentDialog",
+    "SsoDialog",
+    "SsoSignInDialog",
+]
@@ -0,0 +1,97 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from collections import OrderedDict
+from typing import Callable, Dict
+
+from botbuilder.dialogs import Dialog, DialogSet
+
+
+class LazyDialogSet(DialogSet):
+    """
+    DialogSet that builds its dialogs the first time they are looked up.
+    Remarks: Dialogs are registered with a factory instead of an instance. DialogContext resolves the
+    dialogs on the stack through find(), so a dialog is built either when it's first started or when
+    a turn continues a dialog that was started by another process sharing the same state.
+    With `max_size`, only that many of the built dialogs are kept (the least recently used go first).
+    Dialogs keep their state in the dialog stack, not in the instance, so an evicted dialog is built
+    again the next time it's looked up.
+    """
+
+    # DialogSet.__init__ only accepts being created by a ComponentDialog, so the factories are
+    # created on first registration instead of in an __init__ override.
+    _factories: Dict[str, Callable[[], Dialog]] = None
+    _built: "OrderedDict[str, None]" = None
+    max_size: int = None
+    builds = 0
+    evictions = 0
+
+    def register(
+        self, dialog_id: str, factory: Callable[[], Dialog], replace: bool = False
+    ):
+        """
+        Registers the factory of a dialog. With `replace`, a dialog built by the previous factory is
+        dropped, so the new one is used from the next lookup on.
+        """
+
+        if self._factories is None:
+            self._factories = {}
+            self._built = OrderedDict()
+
+        if not replace and (dialog_id in self._dialogs or dialog_id in self._factories):
+            raise TypeError(
+                "LazyDialogSet.register(): A dialog with an id of '%s' already added."
+                % dialog_id
+            )
+
+        self._factories[dialog_id] = factory
+        if dialog_id in self._built:
+            del self._built[dialog_id]
+            del self._dialogs[dialog_id]
+
+    @property
+    def pending_count(self) -> int:
+        if not self._factories:
+            return 0
+        return len(self._factories) - len(self._built)
+
+    async def find(self, dialog_id: str) -> Dialog:
+        return self.find_dialog(dialog_id)
+
+    def find_dialog(self, dialog_id: str) -> Dialog:
+        dialog = super().find_dialog(dialog_id)
+        if dialog is not None:
+            if self._built and dialog_id in self._built:
+                self._built.move_to_end(dialog_id)
+            return dialog
+
+        if not self._factories or dialog_id not in self._factories:
+            return None
+
+        dialog = self._factories[dialog_id]()
+        if dialog.id != dialog_id:
+            raise TypeError(
+                "LazyDialogSet.find(): The factory for '%s' built a dialog with an id of '%s'."
+                % (dialog_id, dialog.id)
+            )
+
+        dialog.telemetry_client = self.telemetry_client
+        self._dialogs[dialog_id] = dialog
+        self._built[dialog_id] = None
+        self.builds += 1
+
+        while self.max_size is not None and len(self._built) > self.max_size:
+            evicted_id, _ = self._built.popitem(last=False)
+            del self._dialogs[evicted_id]
+            self.evictions += 1
+
+        return dialog
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "registered": len(self._factories) if self._factories else 0,
+            "built": len(self._built) if self._built else 0,
+            "max_size": self.max_size,
+            "builds": self.builds,
+            "evictions": self.evictions,
+        }
@@ -2,7 +2,9 @@
 # Licensed under the MIT License.
 
 import copy
+import functools
 import json
+from typing import Dict, List
 
 from botbuilder.dialogs import (
     ComponentDialog,
@@ -19,16 +21,28 @@ from botbuilder.dialogs.prompts import (
 )
 from botbuilder.dialogs.skills import (
     SkillDialogOptions,
-    SkillDialog,
     BeginSkillDialogOptions,
 )
 from botbuilder.core import ConversationState, MessageFactory, TurnContext
 from botbuilder.core.skills import ConversationIdFactoryBase
-from botbuilder.schema import Activity, ActivityTypes, InputHints, DeliveryModes
+from botbuilder.schema import (
+    Activity,
+    ActivityTypes,
+    ActionTypes,
+    CardAction,
+    InputHints,
+    DeliveryModes,
+)
 from botbuilder.integration.aiohttp.skills import SkillHttpClient
 
 from skills_configuration import SkillsConfiguration, DefaultConfig
+from skill_state_property import SkillStateProperty
+from skills.skill_definition import SkillDefinition
+from skills.skill_registry import SkillRegistry
 
+from dialogs.indexed_choice_prompt import IndexedChoicePrompt
+from dialogs.lazy_dialog_set import LazyDialogSet
+from dialogs.streaming_skill_dialog import StreamingSkillDialog
 from dialogs.tangent_dialog import TangentDialog
 from dialogs.sso.sso_dialog import SsoDialog
 
@@ -55,6 +69,12 @@ class MainDialog(ComponentDialog):
     ):
         super().__init__(MainDialog.__name__)
 
+        # The skill and SSO dialogs are built the first time they're used, and only the most recently
+        # used ones are kept, so startup doesn't grow with the number of skills.
+        self._dialogs = LazyDialogSet()
+        if skills_config:
+            self._dialogs.max_size = skills_config.SKILL_DIALOG_CACHE_SIZE
+
         self._configuration = configuration
         if not self._configuration:
             raise TypeError(
@@ -69,9 +89,19 @@ class MainDialog(ComponentDialog):
                 "[MainDialog]: Missing parameter. skills_config is required"
             )
 
+        # The prompt choices only depend on the configuration, so they're built once per registry.
+        self._delivery_mode_choices = [
+            Choice(DeliveryModes.normal.value),
+            Choice(DeliveryModes.expect_replies.value),
+        ]
+        self._set_skill_choices(skills_config.SKILL_REGISTRY)
+
         if not skill_client:
             raise TypeError("[MainDialog]: Missing parameter. skill_client is required")
 
+        # The circuit breaker is optional, it's only available on clients that track skill health.
+        self._circuit_breaker = getattr(skill_client, "circuit_breaker", None)
+
         if not conversation_state:
             raise TypeError(
                 "[MainDialog]: Missing parameter. conversation_state is required"
@@ -82,18 +112,19 @@ class MainDialog(ComponentDialog):
                 "[MainDialog]: Missing parameter. conversation_id_factory is required"
             )
 
-        # Use helper method to add SkillDialog instances for the configured skills.
-        self._add_skill_dialogs(
-            conversation_state,
-            conversation_id_factory,
-            skill_client,
-            skills_config,
-            bot_id,
-        )
+        # Use helper method to register the SkillDialog instances for the configured skills.
+        self._bot_id = bot_id
+        self._conversation_state = conversation_state
+        self._conversation_id_factory = conversation_id_factory
+        self._skill_client = skill_client
+        for skill_info in self._skill_registry.skills:
+            self._add_skill_dialog(skill_info)
 
-        # Create state property to track the active skill.
-        self.active_skill_property = conversation_state.create_property(
-            ACTIVE_SKILL_PROPERTY_NAME
+        # Create state property to track the active skill, only its id is kept in the state.
+        self.active_skill_property = SkillStateProperty(
+            conversation_state,
+            ACTIVE_SKILL_PROPERTY_NAME,
+            lambda skill_id: self._skill_registry.get(skill_id),
         )
 
         # Register the tangent dialog for testing tangents and resume.
@@ -102,17 +133,14 @@ class MainDialog(ComponentDialog):
         # Add ChoicePrompt to render available delivery modes.
         self.add_dialog(ChoicePrompt(DELIVERY_MODE_PROMPT))
 
-        # Add ChoicePrompt to render available types of skill.
-        self.add_dialog(ChoicePrompt(SKILL_GROUP_PROMPT))
-
-        # Add ChoicePrompt to render available skills.
-        self.add_dialog(ChoicePrompt(SKILL_PROMPT))
+        # Add IndexedChoicePrompt to render available types of skill.
+        self.add_dialog(IndexedChoicePrompt(SKILL_GROUP_PROMPT))
 
-        # Add ChoicePrompt to render skill actions.
-        self.add_dialog(ChoicePrompt(SKILL_ACTION_PROMPT))
+        # Add IndexedChoicePrompt to render available skills.
+        self.add_dialog(IndexedChoicePrompt(SKILL_PROMPT))
 
-        # Special case: register SSO dialogs for skills that support SSO actions.
-        self._add_sso_dialogs(self._configuration)
+        # Add IndexedChoicePrompt to render skill actions.
+        self.add_dialog(IndexedChoicePrompt(SKILL_ACTION_PROMPT))
 
         # Add main waterfall dialog for this bot.
         self.add_dialog(
@@ -131,6 +159,30 @@ class MainDialog(ComponentDialog):
 
         self.initial_dialog_id = WaterfallDialog.__name__
 
+    def update_skills(self, registry: SkillRegistry):
+        """
+        Swaps in the skills of a new configuration.
+        Remarks: Only the skills whose app id or endpoint changed (and the new ones) get their
+        SkillDialog (and SsoDialog) registered again, they're built with the new values the next
+        time they're used; the dialogs already built for the other skills are kept. Dialogs of
+        removed skills are kept so the conversations that are using them can finish, they're just no
+        longer offered.
+        """
+
+        for skill_info in registry.skills:
+            current = self._skill_registry.get(skill_info.id)
+            if (
+                current is None
+                or current.app_id != skill_info.app_id
+                or current.skill_endpoint != skill_info.skill_endpoint
+            ):
+                self._add_skill_dialog(skill_info)
+
+        self._set_skill_choices(registry)
+
+    def dialog_cache_stats(self) -> Dict[str, int]:
+        return self._dialogs.stats()
+
     async def on_continue_dialog(self, inner_dc: DialogContext):
         """
         This override is used to test the "abort" command to interrupt skills from the parent and
@@ -138,11 +190,11 @@ class MainDialog(ComponentDialog):
         """
 
         # This is an example on how to cancel a SkillDialog that is currently in progress from the parent bot.
-        active_skill = await self.active_skill_property.get(inner_dc.context)
+        active_skill_id = await self.active_skill_property.get_id(inner_dc.context)
         activity = inner_dc.context.activity
 
         if (
-            active_skill
+            active_skill_id
             and activity.type == ActivityTypes.message
             and activity.text
             and "abort" in activity.text.lower()
@@ -158,7 +210,7 @@ class MainDialog(ComponentDialog):
 
         # Sample to test a tangent when in the middle of a skill conversation.
         if (
-            active_skill
+            active_skill_id
             and activity.type == ActivityTypes.message
             and activity.text
             and activity.text.lower() == "tangent"
@@ -192,10 +244,7 @@ class MainDialog(ComponentDialog):
             retry_prompt=MessageFactory.text(
                 retry_message_text, retry_message_text, InputHints.expecting_input
             ),
-            choices=[
-                Choice(DeliveryModes.normal.value),
-                Choice(DeliveryModes.expect_replies.value),
-            ],
+            choices=self._delivery_mode_choices,
         )
 
         # Prompt the user to select a delivery mode.
@@ -215,13 +264,6 @@ class MainDialog(ComponentDialog):
             "That was not a valid choice, please select a valid skill group."
         )
 
-        choices = []
-        groups = []
-        for skill in self._skills_config.SKILLS.values():
-            if skill.group not in groups:
-                groups.append(skill.group)
-                choices.append(Choice(skill.group))
-
         options = PromptOptions(
             prompt=MessageFactory.text(
                 message_text, message_text, InputHints.expecting_input
@@ -229,7 +271,7 @@ class MainDialog(ComponentDialog):
             retry_prompt=MessageFactory.text(
                 retry_message_text, retry_message_text, InputHints.expecting_input
             ),
-            choices=choices,
+            choices=self._skill_group_choices,
         )
 
         # Prompt the user to select a type of skill.
@@ -256,16 +298,35 @@ class MainDialog(ComponentDialog):
                 retry_message_text, retry_message_text, InputHints.expecting_input
             ),
             style=ListStyle.list_style,
-            choices=[
-                Choice(skill.id)
-                for skill in self._skills_config.SKILLS.values()
-                if skill.group.lower().startswith(skill_group.lower())
-            ],
+            choices=self._get_skill_choices(skill_group),
         )
 
         # Prompt the user to select a skill.
         return await step_context.prompt(SKILL_PROMPT, options)
 
+    def _get_skill_choices(self, skill_group: str) -> List[Choice]:
+        """
+        Create the skill choices for a group, hiding or flagging the skills whose circuit is open.
+        """
+
+        skills = self._skill_registry.in_group(skill_group)
+        if not self._circuit_breaker or not self._circuit_breaker.unhealthy_skills:
+            choices = self._skill_group_skill_choices.get(skill_group.lower())
+            if choices is None:
+                choices = [self._skill_choices[skill.id] for skill in skills]
+                self._skill_group_skill_choices[skill_group.lower()] = choices
+            return choices
+
+        choices = []
+        for skill in skills:
+            if self._circuit_breaker.is_healthy(skill.id):
+                choices.append(self._skill_choices[skill.id])
+            elif not self._skills_config.HIDE_UNHEALTHY_SKILLS:
+                # Keep the skill id as the value so it can still be selected to probe it.
+                choices.append(self._unavailable_skill_choices[skill.id])
+
+        return choices
+
     async def _select_skill_action_step(self, step_context: WaterfallStepContext):
         """
         Render a prompt to select the begin action for the skill.
@@ -290,18 +351,20 @@ class MainDialog(ComponentDialog):
             # Restart setup dialog
             return await step_context.replace_dialog(self.initial_dialog_id)
 
-        selected_skill = next(
-            val
-            for key, val in self._skills_config.SKILLS.items()
-            if val.id == selected_skill_id
-        )
+        selected_skill = self._skill_registry.get(selected_skill_id)
+        if not selected_skill:
+            # The skill was removed from the configuration after the prompt was sent.
+            await step_context.context.send_activity(
+                MessageFactory.text(f"The skill {selected_skill_id} is no longer available.")
+            )
+
+            # Restart setup dialog
+            return await step_context.replace_dialog(self.initial_dialog_id)
 
         # Remember the skill selected by the user.
-        step_context.values[SELECTED_SKILL_KEY_NAME] = selected_skill
+        step_context.values[SELECTED_SKILL_KEY_NAME] = selected_skill.id
 
-        skill_action_choices = [
-            Choice(action) for action in selected_skill.get_actions()
-        ]
+        skill_action_choices = self._skill_action_choices[selected_skill.id]
         if len(skill_action_choices) == 1:
             # The skill only supports one action (e.g. Echo), skip the prompt.
             return await step_context.next(
@@ -326,14 +389,23 @@ class MainDialog(ComponentDialog):
         Starts the SkillDialog based on the user's selections.
         """
 
-        selected_skill = step_context.values[SELECTED_SKILL_KEY_NAME]
+        selected_skill_id = step_context.values[SELECTED_SKILL_KEY_NAME]
+        selected_skill = self._skill_registry.get(selected_skill_id)
+        if not selected_skill:
+            # The skill was removed from the configuration after its action was prompted.
+            await step_context.context.send_activity(
+                MessageFactory.text(f"The skill {selected_skill_id} is no longer available.")
+            )
+
+            # Restart setup dialog
+            return await step_context.replace_dialog(self.initial_dialog_id)
 
         # Save active skill in state.
-        await self.active_skill_property.set(step_context.context, selected_skill)
+        await self.active_skill_property.set(step_context.context, selected_skill.id)
 
         # Create the initial activity to call the skill.
         skill_activity = self._create_begin_activity(
-            step_context.context, selected_skill.id, step_context.result.value
+            step_context.context, selected_skill, step_context.result.value
         )
 
         if skill_activity.name == "Sso":
@@ -363,11 +435,11 @@ class MainDialog(ComponentDialog):
         The SkillDialog has ended, render the results (if any) and restart MainDialog.
         """
 
-        active_skill = await self.active_skill_property.get(step_context.context)
+        active_skill_id = await self.active_skill_property.get_id(step_context.context)
 
         # Check if the skill returned any results and display them.
         if step_context.result:
-            message = f'Skill "{active_skill.id}" invocation complete.'
+            message = f'Skill "{active_skill_id}" invocation complete.'
             message += f" Result: {json.dumps(step_context.result)}"
             await step_context.context.send_activity(
                 MessageFactory.text(message, message, InputHints.ignoring_input)
@@ -385,38 +457,72 @@ class MainDialog(ComponentDialog):
         # Restart the main dialog with a different message the second time around.
         return await step_context.replace_dialog(
             self.initial_dialog_id,
-            f'Done with "{active_skill.id}". \n\n What delivery mode would you '
+            f'Done with "{active_skill_id}". \n\n What delivery mode would you '
             f"like to use?",
         )
 
-    def _add_skill_dialogs(
-        self,
-        conversation_state: ConversationState,
-        conversation_id_factory: ConversationIdFactoryBase,
-        skill_client: SkillHttpClient,
-        skills_config: SkillsConfiguration,
-        bot_id: str,
-    ):
+    def _set_skill_choices(self, registry: SkillRegistry):
+        # Assigned together, with no await in between, so a prompt never mixes two configurations.
+        self._skill_registry = registry
+        self._skill_group_choices = [Choice(group) for group in registry.groups]
+        self._skill_group_skill_choices: Dict[str, List[Choice]] = {}
+        self._skill_choices = {skill.id: Choice(skill.id) for skill in registry.skills}
+        self._unavailable_skill_choices = {
+            skill.id: Choice(
+                skill.id,
+                action=CardAction(
+                    type=ActionTypes.im_back,
+                    title=f"{skill.id} (unavailable)",
+                    value=skill.id,
+                ),
+            )
+            for skill in registry.skills
+        }
+        self._skill_action_choices = {
+            skill.id: [Choice(action) for action in skill.get_actions()]
+            for skill in registry.skills
+        }
+
+    def _add_skill_dialog(self, skill_info: SkillDefinition):
         """
-        Helper method that creates and adds SkillDialog instances for the configured skills.
+        Helper method that registers the SkillDialog instance for a configured skill, and its SsoDialog
+        when the skill supports SSO actions. They're created when they're first looked up.
         """
 
-        for skill_info in self._skills_config.SKILLS.values():
-            # Create the dialog options.
-            skill_dialog_options = SkillDialogOptions(
-                bot_id=bot_id,
-                conversation_id_factory=conversation_id_factory,
-                skill_client=skill_client,
-                skill_host_endpoint=skills_config.SKILL_HOST_ENDPOINT,
-                conversation_state=conversation_state,
-                skill=skill_info,
+        self._dialogs.register(
+            skill_info.id,
+            functools.partial(self._create_skill_dialog, skill_info),
+            replace=True,
+        )
+
+        # Special case: register SSO dialogs for skills that support SSO actions.
+        if skill_info.id.startswith("WATERFALLSKILL"):
+            self._dialogs.register(
+                f"{SSO_DIALOG_PREFIX}{skill_info.id}",
+                functools.partial(self._create_sso_dialog, skill_info),
+                replace=True,
             )
 
-            # Add a SkillDialog for the selected skill.
-            self.add_dialog(SkillDialog(skill_dialog_options, skill_info.id))
+    def _create_skill_dialog(self, skill_info: SkillDefinition) -> StreamingSkillDialog:
+        # Create the dialog options.
+        skill_dialog_options = SkillDialogOptions(
+            bot_id=self._bot_id,
+            conversation_id_factory=self._conversation_id_factory,
+            skill_client=self._skill_client,
+            skill_host_endpoint=self._skills_config.SKILL_HOST_ENDPOINT,
+            conversation_state=self._conversation_state,
+            skill=skill_info,
+        )
+
+        # Create a SkillDialog for the selected skill.
+        return StreamingSkillDialog(
+            skill_dialog_options,
+            skill_info.id,
+            self._skills_config.STREAM_EXPECT_REPLIES,
+        )
 
     def _create_begin_activity(
-        self, context: TurnContext, skill_id: str, selected_option: str
+        self, context: TurnContext, skill: SkillDefinition, selected_option: str
     ):
         if selected_option.lower() == JUST_FORWARD_THE_ACTIVITY.lower():
             # Note message activities also support input parameters but we are not using them in this example.
@@ -424,9 +530,7 @@ class MainDialog(ComponentDialog):
             return copy.deepcopy(context.activity)
 
         # Get the begin activity from the skill instance.
-        activity: Activity = self._skills_config.SKILLS[skill_id].create_begin_activity(
-            selected_option
-        )
+        activity: Activity = skill.create_begin_activity(selected_option)
 
         # We are manually creating the activity to send to the skill; ensure we add the ChannelData and Properties
         # from the original activity so the skill gets them.
@@ -439,18 +543,9 @@ class MainDialog(ComponentDialog):
     # Special case.
     # SSO needs a dialog in the host to allow the user to sign in.
     # We create and several SsoDialog instances for each skill that supports SSO.
-    def _add_sso_dialogs(self, configuration: DefaultConfig):
-        connection_name = configuration.SSO_CONNECTION_NAME
-
-        for sso_skill_dialog in [
-            skill_dialog
-            for skill_dialog in self._dialogs._dialogs.values()  # pylint: disable=W0212
-            if skill_dialog.id.startswith("WATERFALLSKILL")
-        ]:
-            self.add_dialog(
-                SsoDialog(
-                    f"{SSO_DIALOG_PREFIX}{sso_skill_dialog.id}",
-                    sso_skill_dialog,
-                    connection_name,
-                )
-            )
+    def _create_sso_dialog(self, skill_info: SkillDefinition) -> SsoDialog:
+        return SsoDialog(
+            f"{SSO_DIALOG_PREFIX}{skill_info.id}",
+            self._create_skill_dialog(skill_info),
+            self._configuration.SSO_CONNECTION_NAME,
+        )
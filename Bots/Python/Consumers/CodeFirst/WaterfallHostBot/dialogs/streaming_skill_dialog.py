@@ -0,0 +1,114 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from botbuilder.core import TurnContext
+from botbuilder.dialogs.skills import SkillDialog, SkillDialogOptions
+from botbuilder.schema import Activity, ActivityTypes, DeliveryModes, ExpectedReplies
+
+
+class _SkillReplies:
+    def __init__(self):
+        self.eoc_activity: Activity = None
+        self.sent_invoke_response = False
+
+
+class StreamingSkillDialog(SkillDialog):
+    """
+    A SkillDialog that relays the replies of expectReplies turns while the skill streams them.
+    Remarks: With `stream_replies` and a skill client that supports it, each reply is processed
+    (EndOfConversation, OAuthCard interception, invoke responses) as soon as it arrives instead of
+    after the skill's turn ends. Skills that don't stream answer with the regular ExpectedReplies
+    body, which is processed the same way. Invoke activities always take the SkillDialog path.
+    """
+
+    def __init__(
+        self,
+        dialog_options: SkillDialogOptions,
+        dialog_id: str,
+        stream_replies: bool = False,
+    ):
+        super().__init__(dialog_options, dialog_id)
+        self._stream_replies = stream_replies
+
+    async def _send_to_skill(
+        self, context: TurnContext, activity: Activity, skill_conversation_id: str
+    ) -> Activity:
+        skill_client = self.dialog_options.skill_client
+        if (
+            not self._stream_replies
+            or activity.type == ActivityTypes.invoke
+            or activity.delivery_mode != DeliveryModes.expect_replies
+            or not hasattr(skill_client, "stream_replies")
+        ):
+            return await super()._send_to_skill(context, activity, skill_conversation_id)
+
+        # Always save state before forwarding
+        # (the dialog stack won't get updated with the skillDialog and things won't work if you don't)
+        await self.dialog_options.conversation_state.save_changes(context, True)
+
+        replies = _SkillReplies()
+
+        async def on_reply(raw_activity: dict):
+            await self._process_reply(
+                context,
+                Activity().deserialize(raw_activity),
+                skill_conversation_id,
+                replies,
+            )
+
+        skill_info = self.dialog_options.skill
+        with skill_client.stream_replies(on_reply):
+            response = await skill_client.post_activity(
+                self.dialog_options.bot_id,
+                skill_info.app_id,
+                skill_info.skill_endpoint,
+                self.dialog_options.skill_host_endpoint,
+                skill_conversation_id,
+                activity,
+            )
+
+        # Inspect the skill response status
+        if not 200 <= response.status <= 299:
+            raise Exception(
+                f'Error invoking the skill id: "{skill_info.id}" at "{skill_info.skill_endpoint}"'
+                f" (status is {response.status}). \r\n {response.body}"
+            )
+
+        # The body is only set when the skill didn't stream its replies.
+        if response.body:
+            for from_skill_activity in ExpectedReplies().deserialize(response.body).activities:
+                await self._process_reply(
+                    context, from_skill_activity, skill_conversation_id, replies
+                )
+
+        return replies.eoc_activity
+
+    async def _process_reply(
+        self,
+        context: TurnContext,
+        from_skill_activity: Activity,
+        skill_conversation_id: str,
+        replies: _SkillReplies,
+    ):
+        if from_skill_activity.type == ActivityTypes.end_of_conversation:
+            # Capture the EndOfConversation activity if it was sent from skill
+            replies.eoc_activity = from_skill_activity
+
+            # The conversation has ended, so cleanup the conversation id
+            await self.dialog_options.conversation_id_factory.delete_conversation_reference(
+                skill_conversation_id
+            )
+        elif not replies.sent_invoke_response and await self._intercept_oauth_cards(
+            context, from_skill_activity, self.dialog_options.connection_name
+        ):
+            # Token exchange succeeded, so no oauthcard needs to be shown to the user
+            replies.sent_invoke_response = True
+        else:
+            # If an invoke response has already been sent we should ignore future invoke responses
+            # as this represents a bug in the skill.
+            if from_skill_activity.type == ActivityTypes.invoke_response:
+                if replies.sent_invoke_response:
+                    return
+                replies.sent_invoke_response = True
+            # Send the response back to the channel.
+            await context.send_activity(from_skill_activity)
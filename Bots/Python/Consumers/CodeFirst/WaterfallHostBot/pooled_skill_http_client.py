@@ -0,0 +1,436 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http import HTTPStatus
+from logging import Logger
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from aiohttp import (
+    ClientResponse,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+)
+from botbuilder.core import InvokeResponse
+from botbuilder.core.skills import BotFrameworkSkill, ConversationIdFactoryBase
+from botbuilder.integration.aiohttp.skills import SkillHttpClient
+from botbuilder.schema import Activity, DeliveryModes
+from botframework.connector.auth import (
+    AppCredentials,
+    ChannelProvider,
+    SimpleCredentialProvider,
+)
+
+from authentication import AppTokenCache
+from http_compression import HttpCompression, negotiate
+from skill_call_policy import SkillCallPolicy, SkillCallStats
+from skill_circuit_breaker import SkillCircuitBreaker, SkillUnavailableError
+
+DEFAULT_POOL = "default"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+# Handler for the replies streamed by the skill, set by stream_replies() for the current task.
+_REPLY_HANDLER: ContextVar = ContextVar("skill_reply_handler", default=None)
+
+
+class ConnectionPoolSettings:
+    def __init__(
+        self,
+        max_connections: int = 100,
+        keep_alive: float = 30,
+        dns_ttl: int = 300,
+    ):
+        self.max_connections = max_connections
+        self.keep_alive = keep_alive
+        self.dns_ttl = dns_ttl
+
+
+class _ConnectionPool:
+    def __init__(self, limit: int, settings: ConnectionPoolSettings):
+        self.limit = limit
+        self.settings = settings
+        self.session: ClientSession = None
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Coding the skill takes for request bodies, from the Accept-Encoding of its answers.
+        self.coding: str = None
+        # Set once the skill answered a compressed body with a 415, its bodies aren't compressed
+        # again.
+        self.compression_refused = False
+        self.request_bytes = 0
+        self.request_wire_bytes = 0
+
+    def get_session(self) -> ClientSession:
+        # Sessions are bound to the running event loop, so they're created on first use.
+        if not self.session or self.session.closed:
+            self.session = ClientSession(
+                connector=TCPConnector(
+                    limit=self.limit,
+                    keepalive_timeout=self.settings.keep_alive,
+                    ttl_dns_cache=self.settings.dns_ttl,
+                )
+            )
+
+        return self.session
+
+
+class PooledSkillHttpClient(SkillHttpClient):
+    """
+    SkillHttpClient that keeps a pool of connections per skill.
+    Remarks: BotFrameworkHttpClient opens a new ClientSession (and a new connection) for every
+    activity sent to a skill. This client keeps one session per skill, so connections are reused
+    across turns within `keep_alive` seconds and DNS lookups are cached for `dns_ttl` seconds.
+    Each pool allows `max_connections` concurrent connections unless the skill has its own limit
+    in `skill_limits`. Urls that don't belong to a configured skill share a default pool.
+    With a `circuit_breaker`, calls to a skill whose circuit is open raise SkillUnavailableError
+    without touching the network. Timeouts, retries and hedging follow the `call_policy`; the
+    activity is serialized once per call, so retries and hedged requests resend the same payload.
+    With a `token_cache`, the app tokens for the skills are acquired off the event loop and reused
+    until they're refreshed in the background.
+    Within stream_replies(), expectReplies calls ask the skill to stream its replies as NDJSON and
+    each reply is handed to the handler as soon as it arrives; the response body is then None.
+    Skills that don't stream answer with the regular ExpectedReplies body.
+    With `compression`, request bodies are compressed once the skill advertised a supported coding.
+    """
+
+    def __init__(
+        self,
+        credential_provider: SimpleCredentialProvider,
+        skill_conversation_id_factory: ConversationIdFactoryBase,
+        skills: Dict[str, BotFrameworkSkill],
+        settings: ConnectionPoolSettings = None,
+        skill_limits: Dict[str, int] = None,
+        circuit_breaker: SkillCircuitBreaker = None,
+        call_policy: SkillCallPolicy = None,
+        token_cache: AppTokenCache = None,
+        compression: HttpCompression = None,
+        channel_provider: ChannelProvider = None,
+        logger: Logger = None,
+    ):
+        super().__init__(
+            credential_provider, skill_conversation_id_factory, channel_provider, logger
+        )
+
+        self._settings = settings or ConnectionPoolSettings()
+        self._skill_limits = skill_limits or {}
+        self.circuit_breaker = circuit_breaker
+        self._call_policy = call_policy or SkillCallPolicy()
+        self._token_cache = token_cache
+        self._compression = compression
+        self._pool_names = self._get_pool_names(skills)
+        self._pools: Dict[str, _ConnectionPool] = {}
+        self._call_stats: Dict[str, SkillCallStats] = {}
+
+    async def post_activity(
+        self,
+        from_bot_id: str,
+        to_bot_id: str,
+        to_url: str,
+        service_url: str,
+        conversation_id: str,
+        activity: Activity,
+    ) -> InvokeResponse:
+        # SkillDialog calls post_activity() directly, so the circuit breaker is applied here.
+        skill_id = self._pool_names.get(to_url)
+        if not self.circuit_breaker or not skill_id:
+            return await super().post_activity(
+                from_bot_id, to_bot_id, to_url, service_url, conversation_id, activity
+            )
+
+        if not self.circuit_breaker.allow(skill_id):
+            raise SkillUnavailableError(skill_id)
+
+        started = time.monotonic()
+        try:
+            response = await super().post_activity(
+                from_bot_id, to_bot_id, to_url, service_url, conversation_id, activity
+            )
+        except Exception as error:
+            # Only connection errors, timeouts, 429 and 5xx count against the skill's health.
+            if SkillCallPolicy.is_transient(error):
+                self.circuit_breaker.record_failure(skill_id, error)
+            elif isinstance(error, ClientResponseError):
+                # A 4xx means the skill is up and answered.
+                self.circuit_breaker.record_success(skill_id, time.monotonic() - started)
+            else:
+                # The skill wasn't reached (e.g. the host's app token couldn't be acquired).
+                self.circuit_breaker.release(skill_id)
+            raise
+        except BaseException:
+            self.circuit_breaker.release(skill_id)
+            raise
+
+        self.circuit_breaker.record_success(skill_id, time.monotonic() - started)
+        return response
+
+    @contextmanager
+    def stream_replies(self, on_reply: Callable[[dict], Awaitable]):
+        token = _REPLY_HANDLER.set(on_reply)
+        try:
+            yield
+        finally:
+            _REPLY_HANDLER.reset(token)
+
+    def update_skills(self, skills: Dict[str, BotFrameworkSkill]):
+        """
+        Routes the calls by the endpoints of a new set of skills.
+        Remarks: The endpoints are swapped as a whole. Calls already running keep their connection,
+        pools of skills that were removed stay open for them and are closed with the client.
+        """
+
+        self._pool_names = self._get_pool_names(skills)
+
+    def pool_stats(self) -> Dict[str, Dict[str, object]]:
+        return {
+            name: {
+                "limit": pool.limit,
+                "requests": pool.requests,
+                "in_flight": pool.in_flight,
+                "peak_in_flight": pool.peak_in_flight,
+                "utilization": pool.in_flight / pool.limit if pool.limit else 0,
+                "request_bytes": pool.request_bytes,
+                "request_wire_bytes": pool.request_wire_bytes,
+            }
+            for name, pool in self._pools.items()
+        }
+
+    def call_stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: stats.to_dict() for name, stats in self._call_stats.items()}
+
+    async def close(self):
+        for pool in self._pools.values():
+            if pool.session and not pool.session.closed:
+                await pool.session.close()
+
+    async def _get_app_credentials(
+        self, app_id: str, oauth_scope: str
+    ) -> AppCredentials:
+        app_credentials = await super()._get_app_credentials(app_id, oauth_scope)
+        if not self._token_cache or not app_credentials.microsoft_app_id:
+            return app_credentials
+
+        # post_activity() gets the token synchronously, make sure it's served from the cache.
+        app_credentials = self._token_cache.wrap(app_credentials)
+        await self._token_cache.get_token_async(app_credentials)
+        return app_credentials
+
+    def _get_pool_names(self, skills: Dict[str, BotFrameworkSkill]) -> Dict[str, str]:
+        pool_names = {
+            skill.skill_endpoint: skill_id for skill_id, skill in skills.items()
+        }
+        # Hedged requests to the other endpoints of a skill share the skill's pool.
+        for skill_id, endpoints in self._call_policy.hedge_endpoints.items():
+            for endpoint in endpoints:
+                pool_names.setdefault(endpoint, skill_id)
+        return pool_names
+
+    def _get_pool(self, to_url: str) -> _ConnectionPool:
+        name = self._pool_names.get(to_url, DEFAULT_POOL)
+        pool = self._pools.get(name)
+        if not pool:
+            pool = _ConnectionPool(
+                self._skill_limits.get(name, self._settings.max_connections),
+                self._settings,
+            )
+            self._pools[name] = pool
+
+        return pool
+
+    async def _post_content(
+        self, to_url: str, token: str, activity: Activity
+    ) -> Tuple[int, object]:
+        headers_dict = {
+            "Content-type": "application/json; charset=utf-8",
+            "x-ms-conversation-id": activity.conversation.id,
+        }
+        if token:
+            headers_dict.update(
+                {
+                    "Authorization": f"Bearer {token}",
+                }
+            )
+
+        data = json.dumps(activity.serialize()).encode("utf-8")
+
+        name = self._pool_names.get(to_url, DEFAULT_POOL)
+        stats = self._call_stats.get(name)
+        if not stats:
+            stats = SkillCallStats()
+            self._call_stats[name] = stats
+        stats.calls += 1
+        deadline = time.monotonic() + self._call_policy.timeout_for(name)
+
+        on_reply = (
+            _REPLY_HANDLER.get()
+            if activity.delivery_mode == DeliveryModes.expect_replies
+            else None
+        )
+        if on_reply:
+            # Streamed replies are relayed as they arrive, so the call is neither retried nor hedged.
+            headers_dict["Accept"] = NDJSON_CONTENT_TYPE
+            try:
+                return await self._post_once(
+                    to_url, data, headers_dict, deadline, stats, on_reply
+                )
+            except Exception:
+                stats.failures += 1
+                raise
+
+        policy = self._call_policy
+        idempotent = policy.is_idempotent(activity)
+        urls = policy.endpoints_for(name, to_url) if idempotent else [to_url]
+
+        attempt = 0
+        while True:
+            try:
+                return await self._post_hedged(urls, data, headers_dict, deadline, stats)
+            except Exception as error:
+                delay = policy.backoff_for(attempt)
+                if (
+                    not idempotent
+                    or attempt >= policy.max_retries
+                    or not policy.is_transient(error)
+                    or time.monotonic() + delay >= deadline
+                ):
+                    stats.failures += 1
+                    raise
+
+            attempt += 1
+            stats.retries += 1
+            await asyncio.sleep(delay)
+
+    async def _post_hedged(
+        self,
+        urls: List[str],
+        data: bytes,
+        headers: Dict[str, str],
+        deadline: float,
+        stats: SkillCallStats,
+    ) -> Tuple[int, object]:
+        hedge_delay = self._call_policy.hedge_delay
+        if len(urls) == 1:
+            return await self._post_once(urls[0], data, headers, deadline, stats)
+
+        # Start with the first endpoint and move on to the next one when the pending requests
+        # haven't answered after hedge_delay seconds (or right away when they failed).
+        primary = None
+        pending = set()
+        error = None
+        launched = 0
+        try:
+            while True:
+                if launched < len(urls):
+                    task = asyncio.ensure_future(
+                        self._post_once(urls[launched], data, headers, deadline, stats)
+                    )
+                    if launched:
+                        stats.hedges += 1
+                    else:
+                        primary = task
+                    pending.add(task)
+                    launched += 1
+
+                if not pending:
+                    raise error
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=hedge_delay if launched < len(urls) else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    error = task.exception()
+                    if not error:
+                        if task is not primary:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    if not self._call_policy.is_transient(error):
+                        raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _post_once(
+        self,
+        to_url: str,
+        data: bytes,
+        headers: Dict[str, str],
+        deadline: float,
+        stats: SkillCallStats,
+        on_reply: Callable[[dict], Awaitable] = None,
+    ) -> Tuple[int, object]:
+        stats.attempts += 1
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            stats.timeouts += 1
+            raise asyncio.TimeoutError()
+
+        pool = self._get_pool(to_url)
+        pool.requests += 1
+        pool.request_bytes += len(data)
+        pool.in_flight += 1
+        pool.peak_in_flight = max(pool.peak_in_flight, pool.in_flight)
+        try:
+            while True:
+                body, coding = (
+                    await self._compression.compress_request_async(data, pool.coding)
+                    if self._compression
+                    else (data, None)
+                )
+                pool.request_wire_bytes += len(body)
+                async with pool.get_session().post(
+                    to_url,
+                    data=body,
+                    headers={**headers, "Content-Encoding": coding} if coding else headers,
+                    timeout=ClientTimeout(total=remaining),
+                ) as resp:
+                    if coding and resp.status == HTTPStatus.UNSUPPORTED_MEDIA_TYPE:
+                        # The skill doesn't take compressed bodies, it's sent again as is once this
+                        # response is released.
+                        pool.coding = None
+                        pool.compression_refused = True
+                    else:
+                        if (
+                            self._compression
+                            and not pool.compression_refused
+                            and "Accept-Encoding" in resp.headers
+                        ):
+                            pool.coding = negotiate(resp.headers["Accept-Encoding"])
+                        resp.raise_for_status()
+                        if on_reply and resp.content_type == NDJSON_CONTENT_TYPE:
+                            await self._read_replies(resp, on_reply)
+                            content = None
+                        else:
+                            content = (await resp.read()).decode()
+                        break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise
+        finally:
+            pool.in_flight -= 1
+
+        return resp.status, json.loads(content) if content else None
+
+    @staticmethod
+    async def _read_replies(resp: ClientResponse, on_reply: Callable[[dict], Awaitable]):
+        pending = b""
+        async for chunk in resp.content.iter_any():
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                if line.strip():
+                    await on_reply(json.loads(line))
+
+        if pending.strip():
+            await on_reply(json.loads(pending))
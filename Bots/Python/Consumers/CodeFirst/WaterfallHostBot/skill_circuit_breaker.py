@@ -0,0 +1,137 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import time
+from enum import Enum
+from typing import Dict, Set
+
+
+class CircuitState(str, Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "halfOpen"
+
+
+class SkillUnavailableError(Exception):
+    def __init__(self, skill_id: str):
+        super().__init__(f"The skill {skill_id} is unavailable, its circuit is open.")
+        self.skill_id = skill_id
+
+
+class SkillHealth:
+    def __init__(self):
+        self.state = CircuitState.closed
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.latency = None
+        self.last_error = None
+
+    @property
+    def is_healthy(self) -> bool:
+        return self.state == CircuitState.closed
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "latency_ms": (
+                None if self.latency is None else round(self.latency * 1000, 1)
+            ),
+            "last_error": self.last_error,
+        }
+
+
+class SkillCircuitBreaker:
+    """
+    Tracks the health of each skill and stops calling the skills that keep failing.
+    Remarks: After `failure_threshold` consecutive failures the circuit of a skill opens and calls
+    to it fail fast with SkillUnavailableError. Once `reset_timeout` seconds have passed, a single
+    call is let through as a probe (half-open): if it succeeds the circuit closes, otherwise it
+    opens again. Latency is tracked as an exponential moving average of successful calls.
+    The ids of the skills whose circuit isn't closed are kept in `unhealthy_skills`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        latency_weight: float = 0.2,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_weight = latency_weight
+        self._skills: Dict[str, SkillHealth] = {}
+        self.unhealthy_skills: Set[str] = set()
+
+    def health(self, skill_id: str) -> SkillHealth:
+        health = self._skills.get(skill_id)
+        if not health:
+            health = SkillHealth()
+            self._skills[skill_id] = health
+
+        if (
+            health.state == CircuitState.open
+            and time.monotonic() - health.opened_at >= self.reset_timeout
+        ):
+            health.state = CircuitState.half_open
+            health.probe_in_flight = False
+
+        return health
+
+    def is_healthy(self, skill_id: str) -> bool:
+        return self.health(skill_id).is_healthy
+
+    def allow(self, skill_id: str) -> bool:
+        health = self.health(skill_id)
+
+        if health.state == CircuitState.closed:
+            return True
+
+        if health.state == CircuitState.half_open and not health.probe_in_flight:
+            health.probe_in_flight = True
+            return True
+
+        health.rejected += 1
+        return False
+
+    def release(self, skill_id: str):
+        # No answer from the skill (e.g. the call was cancelled), let the next call probe again.
+        self.health(skill_id).probe_in_flight = False
+
+    def record_success(self, skill_id: str, latency: float):
+        health = self.health(skill_id)
+        health.successes += 1
+        health.consecutive_failures = 0
+        health.probe_in_flight = False
+        health.state = CircuitState.closed
+        self.unhealthy_skills.discard(skill_id)
+        health.latency = (
+            latency
+            if health.latency is None
+            else health.latency + self.latency_weight * (latency - health.latency)
+        )
+
+    def record_failure(self, skill_id: str, error: Exception):
+        health = self.health(skill_id)
+        health.failures += 1
+        health.consecutive_failures += 1
+        health.last_error = str(error) or error.__class__.__name__
+
+        if (
+            health.state == CircuitState.half_open
+            or health.consecutive_failures >= self.failure_threshold
+        ):
+            health.state = CircuitState.open
+            health.opened_at = time.monotonic()
+            health.probe_in_flight = False
+            self.unhealthy_skills.add(skill_id)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        return {skill_id: self.health(skill_id).to_dict() for skill_id in list(self._skills)}
@@ -0,0 +1,51 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from typing import Callable, Generic, Optional, TypeVar
+
+from botbuilder.core import ConversationState, TurnContext
+
+T = TypeVar("T")
+
+
+class SkillStateProperty(Generic[T]):
+    """
+    Conversation state property that keeps the id of a skill and gives back the skill itself.
+    Remarks: Only the id is written to the state, `resolve` finds the skill in the configured skills
+    when it's read. A skill that was removed from the configuration since it was stored reads as
+    None, and its id is deleted. Conversations that stored the whole skill before keep working, the
+    id is taken from what was stored.
+    """
+
+    def __init__(
+        self,
+        conversation_state: ConversationState,
+        name: str,
+        resolve: Callable[[str], Optional[T]],
+    ):
+        self._property = conversation_state.create_property(name)
+        self._resolve = resolve
+
+    async def get(self, turn_context: TurnContext) -> Optional[T]:
+        skill_id = await self.get_id(turn_context)
+        if not skill_id:
+            return None
+
+        skill = self._resolve(skill_id)
+        if skill is None:
+            await self._property.delete(turn_context)
+        return skill
+
+    async def get_id(self, turn_context: TurnContext) -> Optional[str]:
+        value = await self._property.get(turn_context)
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, dict):
+            return value.get("id")
+        return getattr(value, "id", None)
+
+    async def set(self, turn_context: TurnContext, skill_id: str):
+        await self._property.set(turn_context, skill_id)
+
+    async def delete(self, turn_context: TurnContext):
+        await self._property.delete(turn_context)
@@ -0,0 +1,45 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from typing import List, Tuple
+
+from botbuilder.schema import Activity, ActivityTypes
+from skills.skill_definition import SkillDefinition
+
+
+class ManifestSkill(SkillDefinition):
+    """
+    A SkillDefinition whose actions come from the skill's manifest.
+    Remarks: Each action is an (action id, activity type) pair, the action id is also the name of
+    the begin activity. Skills whose manifest doesn't declare activities take messages, like Echo.
+    """
+
+    def __init__(
+        self,
+        id: str = None,
+        group: str = None,
+        actions: List[Tuple[str, str]] = None,
+    ):
+        super().__init__(id=id, group=group)
+        self.actions = dict(actions or [])
+
+    def get_actions(self):
+        return list(self.actions)
+
+    def create_begin_activity(self, action_id: str):
+        activity_type = self.actions.get(action_id)
+        if not activity_type:
+            raise Exception(f'Unable to create begin activity for "${action_id}".')
+
+        if activity_type == ActivityTypes.message:
+            activity = Activity.create_message_activity()
+            activity.text = f"Begin the {self.group} Skill"
+        elif activity_type == ActivityTypes.invoke:
+            activity = Activity(type=ActivityTypes.invoke)
+        else:
+            # We don't support special parameters in these skills so a generic event with the
+            # right name will do in this case.
+            activity = Activity.create_event_activity()
+        activity.name = action_id
+
+        return activity
@@ -0,0 +1,208 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from botbuilder.schema import ActivityTypes
+
+# (action id, activity type) pairs, in manifest order.
+SkillActions = List[Tuple[str, str]]
+
+
+def resolve_manifest_source(manifest: str, skill_endpoint: str) -> str:
+    """
+    Returns where to load a skill's manifest from: a url, a local file, or else the file name served
+    from the /manifests route of the skill (e.g. waterfallskillbot-manifest-1.0.json).
+    """
+
+    if manifest.lower().startswith(("http://", "https://")) or os.path.isfile(manifest):
+        return manifest
+    return urljoin(skill_endpoint, f"/manifests/{manifest}")
+
+
+def parse_manifest(data: bytes) -> SkillActions:
+    """
+    Returns the actions of a skill manifest: the name of each activity it declares (its key when it
+    has none) with the activity type. Manifests without activities get a single Message action.
+    """
+
+    manifest = json.loads(data)
+    actions = [
+        (activity.get("name") or key, activity.get("type") or ActivityTypes.event)
+        for key, activity in (manifest.get("activities") or {}).items()
+    ]
+    return actions or [("Message", ActivityTypes.message)]
+
+
+class SkillManifestLoader:
+    """
+    Loads the actions of the skills from their manifests, with a compiled cache on disk.
+    Remarks: Manifests are fetched in parallel (up to `max_workers` at a time). Urls are requested
+    with the ETag and Last-Modified of the previous fetch, so unchanged manifests are answered with
+    a 304 and not sent again. Local files are only read when their size or modification time
+    changed. Each manifest is parsed once per content: the cache at `cache_path` keeps the actions
+    of every manifest by the SHA-256 of its content, and what's needed to revalidate each source,
+    in compact JSON. A manifest that can't be loaded is reported and its last cached version is
+    used, if any.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_path: str = None, max_workers: int = 8, timeout: float = 10):
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.fetches = 0
+        self.not_modified = 0
+        self.parses = 0
+        self.failures = 0
+
+    def load(self, sources: Iterable[str]) -> Dict[str, SkillActions]:
+        """
+        Returns the actions of each manifest source that could be loaded.
+        """
+
+        sources = sorted(set(sources))
+        if not sources:
+            return {}
+
+        cached_sources, manifests = self._read_cache()
+        workers = min(self.max_workers, len(sources))
+        # One session for the whole load, so the workers keep their connections to the skills.
+        with requests.Session() as session, ThreadPoolExecutor(workers) as executor:
+            session.mount("http://", HTTPAdapter(pool_maxsize=workers))
+            session.mount("https://", HTTPAdapter(pool_maxsize=workers))
+            futures = {
+                source: executor.submit(
+                    self._load_source, session, source, cached_sources.get(source), manifests
+                )
+                for source in sources
+            }
+
+        loaded_sources = {}
+        for source, future in futures.items():
+            try:
+                entry, actions = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                self.failures += 1
+                entry = cached_sources.get(source)
+                print(
+                    f"\n Unable to load the skill manifest {source}"
+                    f"{', using the cached one' if entry else ''}: {error}",
+                    file=sys.stderr,
+                )
+                if not entry:
+                    continue
+            else:
+                if actions is not None:
+                    manifests[entry[0]] = actions
+
+            loaded_sources[source] = entry
+
+        # Sources that are no longer configured are dropped, with the manifests nobody uses.
+        in_use = {entry[0] for entry in loaded_sources.values()}
+        self._write_cache(
+            loaded_sources,
+            {digest: actions for digest, actions in manifests.items() if digest in in_use},
+        )
+
+        return {source: manifests[entry[0]] for source, entry in loaded_sources.items()}
+
+    def _load_source(
+        self,
+        session: requests.Session,
+        source: str,
+        cached: Optional[list],
+        manifests: Dict[str, SkillActions],
+    ) -> Tuple[list, Optional[SkillActions]]:
+        """
+        Returns the cache entry of a source ([sha256, validators...]) and its actions, None when the
+        manifest is already in the cache.
+        """
+
+        if source.lower().startswith(("http://", "https://")):
+            headers = {}
+            if cached:
+                if cached[1]:
+                    headers["If-None-Match"] = cached[1]
+                if cached[2]:
+                    headers["If-Modified-Since"] = cached[2]
+
+            response = session.get(source, headers=headers, timeout=self.timeout)
+            if cached and response.status_code == 304:
+                self.not_modified += 1
+                return cached, None
+
+            response.raise_for_status()
+            self.fetches += 1
+            data = response.content
+            validators = [response.headers.get("ETag"), response.headers.get("Last-Modified")]
+        else:
+            status = os.stat(source)
+            validators = [status.st_mtime_ns, status.st_size]
+            if cached and cached[1:] == validators:
+                return cached, None
+
+            with open(source, "rb") as manifest_file:
+                data = manifest_file.read()
+
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in manifests:
+            return [digest] + validators, None
+
+        self.parses += 1
+        return [digest] + validators, parse_manifest(data)
+
+    def _read_cache(self) -> Tuple[Dict[str, list], Dict[str, SkillActions]]:
+        if not self.cache_path or not os.path.isfile(self.cache_path):
+            return {}, {}
+
+        try:
+            with open(self.cache_path, encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+        except ValueError:
+            # A cache that can't be read is rebuilt.
+            return {}, {}
+        if cache.get("version") != self.CACHE_VERSION:
+            return {}, {}
+
+        manifests = {
+            digest: [tuple(action) for action in actions]
+            for digest, actions in cache["manifests"].items()
+        }
+        # Sources are only revalidated against manifests the cache still has.
+        sources = {
+            source: entry
+            for source, entry in cache["sources"].items()
+            if entry[0] in manifests
+        }
+        return sources, manifests
+
+    def _write_cache(self, sources: Dict[str, list], manifests: Dict[str, SkillActions]):
+        if not self.cache_path:
+            return
+
+        data = json.dumps(
+            {"version": self.CACHE_VERSION, "sources": sources, "manifests": manifests},
+            separators=(",", ":"),
+        )
+        try:
+            with open(self.cache_path, encoding="utf-8") as cache_file:
+                if cache_file.read() == data:
+                    return
+        except OSError:
+            pass
+
+        # Written to a temporary file first, so a cache is never read half written.
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            cache_file.write(data)
+        os.replace(temp_path, self.cache_path)
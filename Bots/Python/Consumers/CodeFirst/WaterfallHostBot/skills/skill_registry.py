@@ -0,0 +1,68 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional
+
+from skills.skill_definition import SkillDefinition
+
+
+class SkillRegistry:
+    """
+    Indexes of the configured skills by id, group and app id, built once from the configuration.
+    Remarks: Skills keep the order they have in the configuration. Groups are looked up by prefix,
+    ignoring case, the same way the skill prompt used to filter them; the matches are kept per
+    group name so the scan only runs the first time a group is asked for.
+    A registry isn't changed once built, a new configuration gets a new registry.
+    """
+
+    def __init__(self, skills: Iterable[SkillDefinition]):
+        self._by_id: Dict[str, SkillDefinition] = {}
+        self._by_app_id: Dict[str, SkillDefinition] = {}
+        self._groups: Dict[str, None] = {}
+        self._group_matches: Dict[str, List[SkillDefinition]] = {}
+
+        for skill in skills:
+            self._by_id[skill.id] = skill
+            # Several skills can share an app id, the first one wins.
+            self._by_app_id.setdefault(skill.app_id, skill)
+            self._groups.setdefault(skill.group)
+
+        self._app_ids = frozenset(self._by_app_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def skills(self) -> List[SkillDefinition]:
+        return list(self._by_id.values())
+
+    @property
+    def by_id(self) -> Mapping[str, SkillDefinition]:
+        return MappingProxyType(self._by_id)
+
+    @property
+    def app_ids(self) -> FrozenSet[str]:
+        return self._app_ids
+
+    @property
+    def groups(self) -> List[str]:
+        return list(self._groups)
+
+    def get(self, skill_id: str) -> Optional[SkillDefinition]:
+        return self._by_id.get(skill_id)
+
+    def find_by_app_id(self, app_id: str) -> Optional[SkillDefinition]:
+        return self._by_app_id.get(app_id)
+
+    def in_group(self, group: str) -> List[SkillDefinition]:
+        key = group.lower()
+        skills = self._group_matches.get(key)
+        if skills is None:
+            skills = [
+                skill
+                for skill in self._by_id.values()
+                if skill.group.lower().startswith(key)
+            ]
+            self._group_matches[key] = skills
+        return skills
@@ -2,12 +2,16 @@
 # Licensed under the MIT License.
 
 import os
-from typing import Dict
+from typing import Dict, List, Optional
 
 from botbuilder.dialogs import ObjectPath
 from dotenv import load_dotenv
 
+from skill_config_watcher import SkillConfigWatcher
+from skills.manifest_skill import ManifestSkill
 from skills.skill_definition import SkillDefinition
+from skills.skill_manifest_loader import SkillManifestLoader, resolve_manifest_source
+from skills.skill_registry import SkillRegistry
 from skills.waterfall_skill import WaterfallSkill
 from skills.echo_skill import EchoSkill
 from skills.teams_skill import TeamsSkill
@@ -21,11 +25,30 @@ class DefaultConfig:
     """
 
     PORT = 37020
+    # Number of worker processes sharing the listening socket.
+    WORKERS = int(os.getenv("Workers", "1"))
     APP_ID = os.getenv("MicrosoftAppId")
     APP_PASSWORD = os.getenv("MicrosoftAppPassword")
     SSO_CONNECTION_NAME = os.getenv("SsoConnectionName")
     SSO_CONNECTION_NAME_TEAMS = os.getenv("SsoConnectionNameTeams")
 
+    # Storage used for conversation state and skill conversation ids ("memory" or "sqlite").
+    # Several processes on the same node can share state by pointing to the same sqlite file.
+    STORAGE_TYPE = os.getenv("StorageType", "memory")
+    SQLITE_STORAGE_PATH = os.getenv("SqliteStoragePath", "bot_state.db")
+
+    # App tokens for other bots are refreshed in the background TokenRefreshBefore seconds before they
+    # expire.
+    TOKEN_REFRESH_BEFORE = float(os.getenv("TokenRefreshBefore", "300"))
+    # Inbound tokens that passed validation are cached (up to ValidatedTokenCacheSize) until they
+    # expire. The OpenID signing keys are fetched at startup and every OpenIdRefreshInterval seconds.
+    VALIDATED_TOKEN_CACHE_SIZE = int(os.getenv("ValidatedTokenCacheSize", "1000"))
+    OPEN_ID_REFRESH_INTERVAL = float(os.getenv("OpenIdRefreshInterval", str(12 * 60 * 60)))
+    # Bodies of at least CompressionThreshold bytes exchanged with other bots are compressed (gzip, or br
+    # with the brotli package) when the other side accepts it. HttpCompression=false turns it off.
+    HTTP_COMPRESSION = os.getenv("HttpCompression", "true").lower() == "true"
+    COMPRESSION_THRESHOLD = int(os.getenv("CompressionThreshold", "1024"))
+
 
 class SkillsConfiguration:
     """
@@ -33,12 +56,52 @@ class SkillsConfiguration:
     A helper class that loads Skills information from configuration
     Remarks: This class loads the skill settings from env and casts them into derived
     types of SkillDefinition so we can render prompts with the skills and in their
-    groups.
+    groups. Skills with a manifest (skill_<id>_manifest, or Manifest in the skills file: a
+    path, a url or the name of a file served from the skill's /manifests route) get their
+    actions from it instead. With SkillsConfigPath, the skills are read from that JSON file (or directory
+    of JSON files) instead of the skill_<id>_appId/endpoint/group variables, and a new
+    registry is swapped in with apply() whenever the files change.
     """
 
     SKILL_HOST_ENDPOINT = os.getenv("SkillHostEndpoint")
     SKILLS: Dict[str, SkillDefinition] = dict()
 
+    # Connection pool used to call the skills: max connections per skill, keep-alive and DNS cache TTL
+    # (in seconds). A single skill can have its own limit with skill_<id>_maxConnections.
+    SKILL_MAX_CONNECTIONS = int(os.getenv("SkillMaxConnections", "100"))
+    SKILL_KEEP_ALIVE = float(os.getenv("SkillKeepAlive", "30"))
+    SKILL_DNS_TTL = int(os.getenv("SkillDnsTtl", "300"))
+    SKILL_CONNECTION_LIMITS: Dict[str, int] = dict()
+
+    # Circuit breaker: consecutive failures that take a skill out of rotation and seconds before it's
+    # probed again. Unhealthy skills are flagged in the skill prompt, or hidden with HideUnhealthySkills.
+    SKILL_FAILURE_THRESHOLD = int(os.getenv("SkillFailureThreshold", "5"))
+    SKILL_RESET_TIMEOUT = float(os.getenv("SkillResetTimeout", "30"))
+    HIDE_UNHEALTHY_SKILLS = os.getenv("HideUnhealthySkills", "false").lower() == "true"
+
+    # Timeout budget (in seconds) of a call to a skill, retries included, skill_<id>_timeout overrides it.
+    # EndOfConversation and token exchange calls are retried SkillMaxRetries times with a jittered
+    # backoff starting at SkillRetryBackoff seconds. With SkillHedgeDelay > 0 they're also sent to the
+    # next of the skill_<id>_hedgeEndpoints (comma separated) when unanswered after that many seconds.
+    SKILL_TIMEOUT = float(os.getenv("SkillTimeout", "300"))
+    SKILL_MAX_RETRIES = int(os.getenv("SkillMaxRetries", "2"))
+    SKILL_RETRY_BACKOFF = float(os.getenv("SkillRetryBackoff", "0.2"))
+    SKILL_HEDGE_DELAY = float(os.getenv("SkillHedgeDelay", "0"))
+    SKILL_TIMEOUTS: Dict[str, float] = dict()
+    SKILL_HEDGE_ENDPOINTS: Dict[str, List[str]] = dict()
+    # The skills are asked to stream their expectReplies answers, so each reply is relayed to the
+    # channel as soon as the skill sends it. Skills that don't stream answer as usual.
+    STREAM_EXPECT_REPLIES = os.getenv("StreamExpectReplies", "false").lower() == "true"
+    # The SkillDialog and SsoDialog of a skill are created when it's first selected, and the
+    # SkillDialogCacheSize most recently used ones are kept.
+    SKILL_DIALOG_CACHE_SIZE = int(os.getenv("SkillDialogCacheSize", "100"))
+    # JSON file or directory with the skills (BotFrameworkSkills, as in the DotNet appsettings.json),
+    # checked for changes every SkillsConfigPollInterval seconds.
+    SKILLS_CONFIG_PATH = os.getenv("SkillsConfigPath")
+    SKILLS_CONFIG_POLL_INTERVAL = float(os.getenv("SkillsConfigPollInterval", "5"))
+    # The actions parsed from the skill manifests are kept in SkillManifestCachePath, by manifest hash.
+    SKILL_MANIFEST_CACHE_PATH = os.getenv("SkillManifestCachePath", "skill_manifests.cache.json")
+
     def __init__(self):
         skills_data = dict()
         skill_variable = [x for x in os.environ if x.lower().startswith("skill_")]
@@ -57,20 +120,80 @@ class SkillsConfiguration:
                 skills_data[bot_id]["skill_endpoint"] = os.getenv(val)
             elif attr.lower() == "group":
                 skills_data[bot_id]["group"] = os.getenv(val)
+            elif attr.lower() == "manifest":
+                skills_data[bot_id]["manifest"] = os.getenv(val)
+            elif attr.lower() == "maxconnections":
+                self.SKILL_CONNECTION_LIMITS[bot_id] = int(os.getenv(val))
+            elif attr.lower() == "timeout":
+                self.SKILL_TIMEOUTS[bot_id] = float(os.getenv(val))
+            elif attr.lower() == "hedgeendpoints":
+                self.SKILL_HEDGE_ENDPOINTS[bot_id] = [
+                    url.strip() for url in os.getenv(val).split(",") if url.strip()
+                ]
             else:
                 raise ValueError(
                     f"[SkillsConfiguration]: Invalid environment variable declaration {attr}"
                 )
 
-        for skill_id, skill_value in skills_data.items():
-            definition = SkillDefinition(id=skill_id, group=skill_value["group"])
+        self.SKILL_MANIFEST_LOADER = SkillManifestLoader(self.SKILL_MANIFEST_CACHE_PATH)
+
+        # The watcher swaps the new skills in, the other consumers subscribe to it as well.
+        self.SKILLS_CONFIG_WATCHER: Optional[SkillConfigWatcher[SkillRegistry]] = None
+        if self.SKILLS_CONFIG_PATH:
+            self.SKILLS_CONFIG_WATCHER = SkillConfigWatcher(
+                self.SKILLS_CONFIG_PATH,
+                self.build_registry,
+                self.SKILLS_CONFIG_POLL_INTERVAL,
+            )
+            self.apply(self.SKILLS_CONFIG_WATCHER.load())
+            self.SKILLS_CONFIG_WATCHER.subscribe(self.apply)
+        else:
+            self.apply(
+                self.build_registry(
+                    [
+                        {"id": skill_id, **skill_value}
+                        for skill_id, skill_value in skills_data.items()
+                    ]
+                )
+            )
+
+    def apply(self, registry: SkillRegistry):
+        """
+        Swaps in the skills of a registry. Both attributes are replaced at once, readers that got the
+        previous ones keep a consistent view of them.
+        """
+
+        # Indexes of the skills by id, group and app id, so lookups don't scan SKILLS.
+        self.SKILL_REGISTRY = registry
+        self.SKILLS = registry.by_id
+
+    def build_registry(self, skills: List[Dict[str, str]]) -> SkillRegistry:
+        manifest_sources = {
+            skill_value["id"]: resolve_manifest_source(
+                skill_value["manifest"], skill_value["skill_endpoint"]
+            )
+            for skill_value in skills
+            if skill_value.get("manifest")
+        }
+        manifest_actions = self.SKILL_MANIFEST_LOADER.load(manifest_sources.values())
+
+        definitions = []
+        for skill_value in skills:
+            actions = manifest_actions.get(manifest_sources.get(skill_value["id"]))
+            if actions:
+                definition = ManifestSkill(skill_value["id"], skill_value["group"], actions)
+            else:
+                definition = SkillDefinition(id=skill_value["id"], group=skill_value["group"])
             definition.app_id = skill_value["app_id"]
             definition.skill_endpoint = skill_value["skill_endpoint"]
-            self.SKILLS[skill_id] = self.create_skill_definition(definition)
+            definitions.append(
+                definition if actions else self.create_skill_definition(definition)
+            )
+
+        return SkillRegistry(definitions)
 
-    # Note: we hard code this for now, we should dynamically create instances based on the manifests.
-    # For now, this code creates a strong typed version of the SkillDefinition based on the skill group
-    # and copies the info from env into it.
+    # Skills without a manifest (or whose manifest couldn't be loaded) get a strong typed version of
+    # the SkillDefinition based on the skill group, with the info from env copied into it.
     @staticmethod
     def create_skill_definition(skill: SkillDefinition):
         if skill.group.lower() == ("echo"):
@@ -0,0 +1,213 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import json
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from botbuilder.core import Storage
+from jsonpickle import encode
+from jsonpickle.unpickler import Unpickler
+
+
+class SqliteStorage(Storage):
+    """
+    Storage implementation backed by a local SQLite database in WAL mode.
+    Several bot processes on the same node can point to the same file and share
+    conversation state and skill conversation references.
+    Remarks: Items are serialized with jsonpickle (same as BlobStorage) and carry a numeric e_tag
+    that is checked on write. E_tags come from a sequence kept in the database, so an item that is
+    deleted and written again never gets an e_tag it had before. A bounded read cache keyed by e_tag
+    avoids re-fetching unchanged items; every read still validates the e_tag against the database
+    so other processes' writes are always visible.
+    """
+
+    def __init__(self, path: str, cache_size: int = 1000, timeout: float = 5.0):
+        if not path:
+            raise TypeError("SqliteStorage: path cannot be None or empty.")
+
+        self._path = path
+        self._timeout = timeout
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+
+        # sqlite3 calls are blocking, run them on a single dedicated thread which owns the connection.
+        # The connection is opened on first use so forked worker processes never share one.
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._connection: sqlite3.Connection = None
+
+    async def read(self, keys: List[str]) -> Dict[str, object]:
+        if not keys:
+            return {}
+
+        rows = await self._run(self._read_rows, list(keys))
+
+        items = {}
+        for key, (e_tag, data) in rows.items():
+            item = json.loads(data)
+            if isinstance(item, dict):
+                item["e_tag"] = str(e_tag)
+            items[key] = Unpickler().restore(item)
+
+        return items
+
+    async def write(self, changes: Dict[str, object]):
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return
+
+        batch = []
+        for key, item in changes.items():
+            e_tag = None
+            if isinstance(item, dict):
+                e_tag = item.get("e_tag", None)
+            elif hasattr(item, "e_tag"):
+                e_tag = item.e_tag
+            if e_tag == "":
+                raise Exception("sqlite_storage.write(): etag missing")
+            e_tag = None if e_tag in (None, "*") else int(e_tag)
+
+            batch.append((key, e_tag, encode(item)))
+
+        new_e_tags = await self._run(self._write_rows, batch)
+
+        # Hand the new e_tag back to the caller so a second save in the same turn doesn't conflict with the first.
+        for key, item in changes.items():
+            if isinstance(item, dict):
+                item["e_tag"] = str(new_e_tags[key])
+            elif hasattr(item, "e_tag"):
+                item.e_tag = str(new_e_tags[key])
+
+    async def delete(self, keys: List[str]):
+        if not keys:
+            return
+
+        await self._run(self._delete_rows, list(keys))
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._connection:
+            self._connection = sqlite3.connect(
+                self._path,
+                timeout=self._timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "key TEXT PRIMARY KEY, e_tag INTEGER NOT NULL, data TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            # Databases created before the sequence existed continue from their highest e_tag.
+            self._connection.execute(
+                "INSERT OR IGNORE INTO meta (name, value) "
+                "SELECT 'e_tag', COALESCE(MAX(e_tag), 0) FROM items"
+            )
+
+        return self._connection
+
+    def _read_rows(self, keys: List[str]) -> Dict[str, Tuple[int, str]]:
+        connection = self._connect()
+        placeholders = ",".join("?" * len(keys))
+        e_tags = dict(
+            connection.execute(
+                f"SELECT key, e_tag FROM items WHERE key IN ({placeholders})", keys
+            ).fetchall()
+        )
+
+        rows = {}
+        misses = []
+        for key, e_tag in e_tags.items():
+            cached = self._cache.get(key)
+            if cached and cached[0] == e_tag:
+                self._cache.move_to_end(key)
+                rows[key] = cached
+            else:
+                misses.append(key)
+
+        if misses:
+            placeholders = ",".join("?" * len(misses))
+            for key, e_tag, data in connection.execute(
+                f"SELECT key, e_tag, data FROM items WHERE key IN ({placeholders})",
+                misses,
+            ):
+                rows[key] = (e_tag, data)
+                self._cache_put(key, e_tag, data)
+
+        return rows
+
+    def _write_rows(self, batch: List[Tuple[str, int, str]]) -> Dict[str, int]:
+        connection = self._connect()
+        new_e_tags = {}
+
+        # BEGIN IMMEDIATE takes the write lock up front so the e_tag checks and the writes are atomic.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for key, e_tag, data in batch:
+                row = connection.execute(
+                    "SELECT e_tag FROM items WHERE key = ?", (key,)
+                ).fetchone()
+                old_e_tag = row[0] if row else None
+
+                if old_e_tag is not None and e_tag is not None and e_tag != old_e_tag:
+                    raise KeyError(
+                        "Etag conflict.\nOriginal: %s\r\nCurrent: %s" % (e_tag, old_e_tag)
+                    )
+
+                new_e_tag = self._next_e_tag(connection)
+                connection.execute(
+                    "INSERT OR REPLACE INTO items (key, e_tag, data) VALUES (?, ?, ?)",
+                    (key, new_e_tag, data),
+                )
+                new_e_tags[key] = new_e_tag
+
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        for key, _, data in batch:
+            self._cache_put(key, new_e_tags[key], data)
+
+        return new_e_tags
+
+    @staticmethod
+    def _next_e_tag(connection: sqlite3.Connection) -> int:
+        # Called inside the write transaction, so no other process takes the same value.
+        connection.execute("UPDATE meta SET value = value + 1 WHERE name = 'e_tag'")
+        return connection.execute("SELECT value FROM meta WHERE name = 'e_tag'").fetchone()[0]
+
+    def _delete_rows(self, keys: List[str]):
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "DELETE FROM items WHERE key = ?", [(key,) for key in keys]
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        for key in keys:
+            self._cache.pop(key, None)
+
+    def _cache_put(self, key: str, e_tag: int, data: str):
+        if self._cache_size <= 0:
+            return
+
+        self._cache[key] = (e_tag, data)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
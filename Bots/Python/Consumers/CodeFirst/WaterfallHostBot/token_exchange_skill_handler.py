@@ -29,6 +29,7 @@ from botframework.connector.auth import (
 from botframework.connector.token_api.models import TokenExchangeRequest
 
 from adapter_with_error_handler import AdapterWithErrorHandler
+from authentication import ValidatedTokenCache
 from skills.skill_definition import SkillDefinition
 from skills_configuration import SkillsConfiguration, DefaultConfig
 
@@ -44,6 +45,7 @@ class TokenExchangeSkillHandler(SkillHandler):
         skill_client: SkillHttpClient,
         credential_provider: CredentialProvider,
         auth_configuration: AuthenticationConfiguration,
+        token_validation_cache: ValidatedTokenCache = None,
     ):
         super().__init__(
             adapter,
@@ -63,6 +65,17 @@ class TokenExchangeSkillHandler(SkillHandler):
         self._skill_client = skill_client
         self._conversation_id_factory = conversation_id_factory
         self._bot_id = configuration.APP_ID
+        self._token_validation_cache = token_validation_cache
+
+    async def _authenticate(self, auth_header: str) -> ClaimsIdentity:
+        if not self._token_validation_cache:
+            return await super()._authenticate(auth_header)
+
+        # Skill callbacks are validated without a channel, keep them apart from /api/messages.
+        validate = super()._authenticate
+        return await self._token_validation_cache.authenticate(
+            auth_header, lambda: validate(auth_header), "skills"
+        )
 
     async def on_send_to_conversation(
         self, claims_identity: ClaimsIdentity, conversation_id: str, activity: Activity,
@@ -96,11 +109,7 @@ class TokenExchangeSkillHandler(SkillHandler):
         if not app_id:
             return None
 
-        return next(
-            skill
-            for skill in self._skills_config.SKILLS.values()
-            if skill.app_id == app_id
-        )
+        return self._skills_config.SKILL_REGISTRY.find_by_app_id(app_id)
 
     async def _intercept_oauth_cards(
         self, claims_identity: ClaimsIdentity, activity: Activity
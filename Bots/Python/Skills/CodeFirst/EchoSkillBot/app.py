@@ -1,13 +1,12 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-import json
 import sys
 import traceback
 from datetime import datetime
 
 from aiohttp import web
-from aiohttp.web import Request, Response
+from aiohttp.web import Request, Response, json_response
 from botbuilder.core import (
     BotFrameworkAdapter,
     BotFrameworkAdapterSettings,
@@ -20,6 +19,10 @@ from botframework.connector.auth import AuthenticationConfiguration
 from bots import EchoBot
 from config import DefaultConfig
 from authentication import AllowedCallersClaimsValidator
+from worker_runner import run_app
+from activity_decoder import ActivityDecoder
+from expect_replies_stream import ExpectRepliesStream
+from http_compression import HttpCompression
 from http import HTTPStatus
 
 CONFIG = DefaultConfig()
@@ -36,6 +39,9 @@ SETTINGS = BotFrameworkAdapterSettings(
 )
 ADAPTER = BotFrameworkAdapter(SETTINGS)
 
+# Create the compression of the bodies exchanged with the host.
+HTTP_COMPRESSION = HttpCompression(CONFIG.COMPRESSION_THRESHOLD, CONFIG.HTTP_COMPRESSION)
+
 # Catch-all for errors.
 async def on_error(context: TurnContext, error: Exception):
     # This check writes out errors to console log .vs. app insights.
@@ -97,23 +103,30 @@ ADAPTER.on_turn_error = on_error
 # Create Bot
 BOT = EchoBot()
 
+ACTIVITY_DECODER = ActivityDecoder()
+
 # Listen for incoming requests on /api/messages
 async def messages(req: Request) -> Response:
     # Main bot message handler.
     if "application/json" in req.headers["Content-Type"]:
-        body = await req.json()
+        body = ACTIVITY_DECODER.loads(await req.read())
     else:
         return Response(status=HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
 
-    activity = Activity().deserialize(body)
+    activity = ACTIVITY_DECODER.decode(body)
     auth_header = req.headers["Authorization"] if "Authorization" in req.headers else ""
 
     try:
+        # DeliveryMode => Expected Replies, streamed when the caller opts in
+        if ExpectRepliesStream.is_requested(req, activity):
+            stream = ExpectRepliesStream(req)
+            await ADAPTER.process_activity(activity, auth_header, stream.wrap(BOT.on_turn))
+            return await stream.finish()
+
         response = await ADAPTER.process_activity(activity, auth_header, BOT.on_turn)
         # DeliveryMode => Expected Replies
         if response:
-            body = json.dumps(response.body)
-            return Response(status=response.status, body=body)
+            return json_response(data=response.body, status=response.status)
 
         # DeliveryMode => Normal
         return Response(status=HTTPStatus.CREATED)
@@ -121,8 +134,14 @@ async def messages(req: Request) -> Response:
         raise exception
 
 
-APP = web.Application()
+# Listen for requests on /api/metrics to report the bytes saved by compression per route.
+async def metrics(req: Request) -> Response:  # pylint: disable=unused-argument
+    return json_response(data={"http_compression": HTTP_COMPRESSION.stats()})
+
+
+APP = web.Application(middlewares=[HTTP_COMPRESSION.middleware])
 APP.router.add_post("/api/messages", messages)
+APP.router.add_get("/api/metrics", metrics)
 
 # simple way of exposing the manifest for dev purposes.
 APP.router.add_static("/manifests", "./manifests/")
@@ -130,6 +149,6 @@ APP.router.add_static("/manifests", "./manifests/")
 
 if __name__ == "__main__":
     try:
-        web.run_app(APP, port=CONFIG.PORT)
+        run_app(APP, port=CONFIG.PORT, workers=CONFIG.WORKERS)
     except Exception as error:
         raise error
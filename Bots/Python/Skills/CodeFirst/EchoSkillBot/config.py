@@ -10,8 +10,14 @@ class DefaultConfig:
     """ Bot Configuration """
 
     PORT = 37400
+    # Number of worker processes sharing the listening socket.
+    WORKERS = int(os.getenv("Workers", "1"))
     APP_ID = os.environ.get("MicrosoftAppId", "")
     APP_PASSWORD = os.environ.get("MicrosoftAppPassword", "")
     # If ALLOWED_CALLERS is empty, any bot can call this Skill.  Add MicrosoftAppIds to restrict callers to only those specified.
     # Example: os.environ.get("AllowedCallers", ["54d3bb6a-3b6d-4ccd-bbfd-cad5c72fb53a", "3851a47b-53ed-4d29-b878-6e941da61e98"])
     ALLOWED_CALLERS = os.environ.get("AllowedCallers", [])
+    # Bodies of at least CompressionThreshold bytes exchanged with other bots are compressed (gzip, or br
+    # with the brotli package) when the other side accepts it. HttpCompression=false turns it off.
+    HTTP_COMPRESSION = os.getenv("HttpCompression", "true").lower() == "true"
+    COMPRESSION_THRESHOLD = int(os.getenv("CompressionThreshold", "1024"))
@@ -0,0 +1,76 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import json
+from http import HTTPStatus
+from typing import Awaitable, Callable, List
+
+from aiohttp.web import Request, StreamResponse
+from botbuilder.core import TurnContext
+from botbuilder.schema import Activity, ActivityTypes, DeliveryModes
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+class ExpectRepliesStream:
+    """
+    Streams the replies of an expectReplies turn as newline-delimited JSON while the turn runs.
+    Remarks: In expectReplies mode the adapter buffers every reply and returns them all in one body
+    at the end of the turn. A caller that sends `Accept: application/x-ndjson` opts in to get each
+    reply as a line of JSON (the same activities the ExpectedReplies body would contain) as soon as
+    it's sent. Invoke activities keep the regular response, since their body is the invoke response.
+    The response is started with the first reply, so authentication errors still get their status.
+    """
+
+    def __init__(self, request: Request):
+        self._request = request
+        self._response = StreamResponse(
+            status=HTTPStatus.OK, headers={"Content-Type": NDJSON_CONTENT_TYPE}
+        )
+        self.replies = 0
+
+    @staticmethod
+    def is_requested(request: Request, activity: Activity) -> bool:
+        return (
+            activity.delivery_mode == DeliveryModes.expect_replies
+            and activity.type != ActivityTypes.invoke
+            and NDJSON_CONTENT_TYPE in request.headers.get("Accept", "")
+        )
+
+    def wrap(
+        self, logic: Callable[[TurnContext], Awaitable]
+    ) -> Callable[[TurnContext], Awaitable]:
+        async def streaming_logic(turn_context: TurnContext):
+            turn_context.on_send_activities(self._on_send_activities)
+            await logic(turn_context)
+
+        return streaming_logic
+
+    async def finish(self) -> StreamResponse:
+        # The replies were streamed already, the ExpectedReplies body returned by the adapter is
+        # left out. The response is started here when the turn had no replies.
+        await self._write([])
+        await self._response.write_eof()
+        return self._response
+
+    async def _on_send_activities(
+        self,
+        turn_context: TurnContext,  # pylint: disable=unused-argument
+        activities: List[Activity],
+        next_send: Callable[[], Awaitable],
+    ):
+        # Handlers run before the adapter buffers the activities, so these are the final replies.
+        await self._write(activities)
+        return await next_send()
+
+    async def _write(self, activities: List[Activity]):
+        if not self._response.prepared:
+            await self._response.prepare(self._request)
+
+        if activities:
+            self.replies += len(activities)
+            await self._response.write(
+                "".join(
+                    json.dumps(activity.serialize()) + "\n" for activity in activities
+                ).encode("utf-8")
+            )
@@ -2,44 +2,61 @@
 # Licensed under the MIT License.
 
 import os
+import sys
 from datetime import datetime
 from http import HTTPStatus
-from typing import Dict
 from aiohttp import web
 from aiohttp.web import Request, Response, json_response
 from botbuilder.core import (
     BotFrameworkAdapterSettings,
-    ConversationState,
     MemoryStorage,
     TurnContext,
 )
-from botbuilder.core.skills import SkillHandler, SkillConversationIdFactory
+from botbuilder.core.skills import SkillConversationIdFactory
 from botbuilder.core.integration import (
     aiohttp_channel_service_routes,
     aiohttp_error_middleware,
 )
 from botbuilder.integration.aiohttp.skills import SkillHttpClient
-from botbuilder.schema import Activity
 from botframework.connector.auth import (
     AuthenticationConfiguration,
     SimpleCredentialProvider,
 )
-from authentication import AllowedCallersClaimsValidator
+from authentication import (
+    AllowedCallersClaimsValidator,
+    AppTokenCache,
+    OpenIdMetadataPrefetcher,
+    ValidatedTokenCache,
+)
 from bots import SkillBot
 from config import DefaultConfig
 from dialogs import ActivityRouterDialog
-from dialogs.proactive import ContinuationParameters
+from dialogs.file_upload import AttachmentDownloader
+from dialogs.proactive import ContinuationParametersStore
 from middleware import SsoSaveStateMiddleware
+from scheduler import ActionScheduler
 from skill_adapter_with_error_handler import AdapterWithErrorHandler
+from skill_handler_with_token_cache import SkillHandlerWithTokenCache
+from storage import DirtyTrackingConversationState, SqliteStorage
+from worker_runner import run_app
+from activity_decoder import ActivityDecoder
+from expect_replies_stream import ExpectRepliesStream
+from tracing import TraceSender
+from asset_cache import AssetCache
+from http_compression import HttpCompression
 
 CONFIG = DefaultConfig()
 
-# Create MemoryStorage and ConversationState.
-MEMORY = MemoryStorage()
-CONVERSATION_STATE = ConversationState(MEMORY)
+# Create the Storage (MemoryStorage or SqliteStorage) and ConversationState.
+STORAGE = (
+    SqliteStorage(CONFIG.SQLITE_STORAGE_PATH)
+    if CONFIG.STORAGE_TYPE.lower() == "sqlite"
+    else MemoryStorage()
+)
+CONVERSATION_STATE = DirtyTrackingConversationState(STORAGE)
 
 # Create the conversationIdFactory.
-CONVERSATION_ID_FACTORY = SkillConversationIdFactory(MEMORY)
+CONVERSATION_ID_FACTORY = SkillConversationIdFactory(STORAGE)
 
 # Create the credential provider.
 CREDENTIAL_PROVIDER = SimpleCredentialProvider(CONFIG.APP_ID, CONFIG.APP_PASSWORD)
@@ -54,14 +71,55 @@ SETTINGS = BotFrameworkAdapterSettings(
     app_password=CONFIG.APP_PASSWORD,
     auth_configuration=AUTH_CONFIG,
 )
-ADAPTER = AdapterWithErrorHandler(SETTINGS, CONVERSATION_STATE)
+# Create the trace sender, which filters the trace activities by level and channel.
+TRACE_SENDER = TraceSender.from_config(CONFIG.TRACE_LEVEL, CONFIG.TRACE_CHANNELS)
+
+# Create the cache for the inbound tokens that passed validation and the signing keys prefetcher.
+TOKEN_VALIDATION_CACHE = ValidatedTokenCache(CONFIG.VALIDATED_TOKEN_CACHE_SIZE)
+OPEN_ID_METADATA_PREFETCHER = OpenIdMetadataPrefetcher(
+    refresh_interval=CONFIG.OPEN_ID_REFRESH_INTERVAL
+)
+
+# Create the cache for the app tokens used to call other bots.
+TOKEN_CACHE = AppTokenCache(refresh_before=CONFIG.TOKEN_REFRESH_BEFORE)
+
+# Create the compression of the bodies exchanged with the host.
+HTTP_COMPRESSION = HttpCompression(CONFIG.COMPRESSION_THRESHOLD, CONFIG.HTTP_COMPRESSION)
+
+ADAPTER = AdapterWithErrorHandler(
+    SETTINGS,
+    CONVERSATION_STATE,
+    TRACE_SENDER,
+    TOKEN_CACHE,
+    TOKEN_VALIDATION_CACHE,
+    HTTP_COMPRESSION,
+)
 
 ADAPTER.use(SsoSaveStateMiddleware(CONVERSATION_STATE))
 
 # Create the skill client.
 SKILL_CLIENT = SkillHttpClient(CREDENTIAL_PROVIDER, CONVERSATION_ID_FACTORY)
 
-CONTINUATION_PARAMETERS_STORE: Dict[str, ContinuationParameters] = dict()
+CONTINUATION_PARAMETERS_STORE = ContinuationParametersStore(
+    max_size=CONFIG.PROACTIVE_STORE_MAX_SIZE, ttl=CONFIG.PROACTIVE_STORE_TTL
+)
+
+# Create the scheduler for delayed actions (e.g. deleting a message after a few seconds).
+SCHEDULER = ActionScheduler()
+
+# Create the downloader for the files received by the FileUpload action.
+ATTACHMENT_DOWNLOADER = AttachmentDownloader(
+    max_size=CONFIG.ATTACHMENT_MAX_SIZE, preview_size=CONFIG.ATTACHMENT_PREVIEW_SIZE
+)
+
+# Create the cache for the files sent as inline attachments and load them up front.
+ASSET_CACHE = AssetCache()
+ASSET_CACHE.register(
+    "architecture-resize.png",
+    os.path.join(os.getcwd(), "images", "architecture-resize.png"),
+    AssetCache.data_uri("image/png"),
+)
+ASSET_CACHE.preload()
 
 # Create the main dialog.
 DIALOG = ActivityRouterDialog(
@@ -70,23 +128,34 @@ DIALOG = ActivityRouterDialog(
     conversation_id_factory=CONVERSATION_ID_FACTORY,
     skill_client=SKILL_CLIENT,
     continuation_parameters_store=CONTINUATION_PARAMETERS_STORE,
+    scheduler=SCHEDULER,
+    attachment_downloader=ATTACHMENT_DOWNLOADER,
+    asset_cache=ASSET_CACHE,
+    trace_sender=TRACE_SENDER,
 )
 
 # Create the bot that will handle incoming messages.
-BOT = SkillBot(CONFIG, CONVERSATION_STATE, DIALOG)
-SKILL_HANDLER = SkillHandler(
-    ADAPTER, BOT, CONVERSATION_ID_FACTORY, CREDENTIAL_PROVIDER, AUTH_CONFIG
+BOT = SkillBot(CONFIG, CONVERSATION_STATE, DIALOG, SCHEDULER)
+SKILL_HANDLER = SkillHandlerWithTokenCache(
+    ADAPTER,
+    BOT,
+    CONVERSATION_ID_FACTORY,
+    CREDENTIAL_PROVIDER,
+    AUTH_CONFIG,
+    TOKEN_VALIDATION_CACHE,
 )
 
+ACTIVITY_DECODER = ActivityDecoder()
+
 # Listen for incoming requests on /api/messages
 async def messages(req: Request) -> Response:
     # Main bot message handler.
     if "application/json" in req.headers["Content-Type"]:
-        body = await req.json()
+        body = ACTIVITY_DECODER.loads(await req.read())
     else:
         return Response(status=HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
 
-    activity = Activity().deserialize(body)
+    activity = ACTIVITY_DECODER.decode(body)
     auth_header = req.headers["Authorization"] if "Authorization" in req.headers else ""
 
     try:
@@ -96,6 +165,12 @@ async def messages(req: Request) -> Response:
         else:
             CONFIG.SERVER_URL = f"{req.scheme}://{req.host}"
 
+        # DeliveryMode => Expected Replies, streamed when the caller opts in
+        if ExpectRepliesStream.is_requested(req, activity):
+            stream = ExpectRepliesStream(req)
+            await ADAPTER.process_activity(activity, auth_header, stream.wrap(BOT.on_turn))
+            return await stream.finish()
+
         response = await ADAPTER.process_activity(activity, auth_header, BOT.on_turn)
         # DeliveryMode => Expected Replies
         if response:
@@ -152,7 +227,22 @@ async def music(req: Request) -> web.FileResponse:  # pylint: disable=unused-arg
     return web.FileResponse(file_path)
 
 
-APP = web.Application(middlewares=[aiohttp_error_middleware])
+# Listen for requests on /api/metrics to report the bytes saved by compression per route.
+async def metrics(req: Request) -> Response:  # pylint: disable=unused-argument
+    return json_response(
+        data={
+            "http_compression": HTTP_COMPRESSION.stats(),
+            "scheduled_actions": SCHEDULER.stats(),
+            "proactive_continuations": CONTINUATION_PARAMETERS_STORE.stats(),
+            "assets": ASSET_CACHE.stats(),
+            "conversation_state": CONVERSATION_STATE.stats(),
+        }
+    )
+
+
+APP = web.Application(
+    middlewares=[aiohttp_error_middleware, HTTP_COMPRESSION.middleware]
+)
 APP.router.add_post("/api/messages", messages)
 APP.router.add_routes(aiohttp_channel_service_routes(SKILL_HANDLER, "/api/skills"))
 
@@ -168,8 +258,53 @@ APP.router.add_get("/api/music", music)
 # Listen for incoming notifications and send proactive messages to users.
 APP.router.add_get("/api/notify", notify)
 
+# Listen for requests on /api/metrics.
+APP.router.add_get("/api/metrics", metrics)
+
+
+async def cancel_scheduled_actions(app: web.Application):  # pylint: disable=unused-argument
+    SCHEDULER.cancel_all()
+
+
+async def close_attachment_downloader(app: web.Application):  # pylint: disable=unused-argument
+    await ATTACHMENT_DOWNLOADER.close()
+
+
+async def start_token_cache(app: web.Application):  # pylint: disable=unused-argument
+    TOKEN_CACHE.start()
+
+
+async def stop_token_cache(app: web.Application):  # pylint: disable=unused-argument
+    await TOKEN_CACHE.stop()
+
+
+async def start_open_id_metadata_prefetcher(app: web.Application):  # pylint: disable=unused-argument
+    # The keys are fetched in the background, the bot doesn't wait for them to start.
+    OPEN_ID_METADATA_PREFETCHER.start()
+
+
+async def stop_open_id_metadata_prefetcher(app: web.Application):  # pylint: disable=unused-argument
+    await OPEN_ID_METADATA_PREFETCHER.stop()
+
+
+APP.on_cleanup.append(cancel_scheduled_actions)
+APP.on_cleanup.append(close_attachment_downloader)
+APP.on_startup.append(start_token_cache)
+APP.on_cleanup.append(stop_token_cache)
+APP.on_startup.append(start_open_id_metadata_prefetcher)
+APP.on_cleanup.append(stop_open_id_metadata_prefetcher)
+
 if __name__ == "__main__":
     try:
-        web.run_app(APP, port=CONFIG.PORT)
+        # The proactive continuation parameters and the scheduled actions are kept in the process
+        # even with SqliteStorage: /api/notify and the scheduled deletes would only reach the
+        # conversations of the worker that handled them, so the skill runs a single worker.
+        if CONFIG.WORKERS > 1:
+            print(
+                f"\n Workers={CONFIG.WORKERS} isn't supported by this skill, /api/notify and the "
+                "scheduled actions are kept per process. Running a single worker instead.",
+                file=sys.stderr,
+            )
+        run_app(APP, port=CONFIG.PORT)
     except Exception as error:
         raise error
@@ -0,0 +1,75 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import base64
+import json
+import os
+from typing import Callable, Dict, Tuple
+
+
+class AssetCache:
+    """
+    In-process cache for the static files sent by the bot (images, cards).
+    Remarks: Each asset is registered with a loader that turns the file bytes into its ready-to-send
+    form (a data URI, parsed JSON), so the file is read and encoded once instead of on every turn.
+    Every get() stats the file and reloads the entry when its mtime or size changed.
+    Values are shared between turns and must not be mutated by callers.
+    """
+
+    def __init__(self):
+        self._assets: Dict[str, Tuple[str, Callable[[bytes], object]]] = {}
+        self._entries: Dict[str, Tuple[Tuple[int, int], object]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_loaded = 0
+
+    def register(self, name: str, path: str, loader: Callable[[bytes], object]):
+        self._assets[name] = (path, loader)
+        self._entries.pop(name, None)
+
+    def preload(self):
+        for name in self._assets:
+            self._load(name, self._version(name))
+
+    def get(self, name: str) -> object:
+        if name not in self._assets:
+            raise KeyError(f"AssetCache: {name} is not registered.")
+
+        version = self._version(name)
+        entry = self._entries.get(name)
+        if entry and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        return self._load(name, version)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "assets": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_loaded": self.bytes_loaded,
+        }
+
+    @staticmethod
+    def data_uri(content_type: str) -> Callable[[bytes], str]:
+        return lambda content: f"data:{content_type};base64,{base64.b64encode(content).decode()}"
+
+    @staticmethod
+    def parse_json(content: bytes) -> object:
+        return json.loads(content)
+
+    def _version(self, name: str) -> Tuple[int, int]:
+        stat = os.stat(self._assets[name][0])
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, name: str, version: Tuple[int, int]) -> object:
+        path, loader = self._assets[name]
+        with open(path, "rb") as in_file:
+            content = in_file.read()
+
+        value = loader(content)
+        self._entries[name] = (version, value)
+        self.bytes_loaded += len(content)
+        return value
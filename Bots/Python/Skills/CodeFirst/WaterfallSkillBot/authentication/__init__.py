@@ -2,5 +2,14 @@
 # Licensed under the MIT License.
 
 from .allowed_callers_claims_validator import AllowedCallersClaimsValidator
+from .app_token_cache import AppTokenCache, CachedAppCredentials
+from .open_id_metadata_prefetcher import OpenIdMetadataPrefetcher
+from .validated_token_cache import ValidatedTokenCache
 
-__all__ = ["AllowedCallersClaimsValidator"]
+__all__ = [
+    "AllowedCallersClaimsValidator",
+    "AppTokenCache",
+    "CachedAppCredentials",
+    "OpenIdMetadataPrefetcher",
+    "ValidatedTokenCache",
+]
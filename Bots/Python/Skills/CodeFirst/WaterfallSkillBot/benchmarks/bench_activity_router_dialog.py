@@ -0,0 +1,77 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the construction of ActivityRouterDialog, whose child dialogs are built on first use,
+against building it with all of its children up front, and the cost of building each child the
+first time its event arrives.
+
+Run from the bot folder: python benchmarks/bench_activity_router_dialog.py [--number N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+import app
+from dialogs import ActivityRouterDialog
+from dialogs.activity_router_dialog import EVENT_DIALOGS
+
+
+def create_dialog() -> ActivityRouterDialog:
+    return ActivityRouterDialog(
+        configuration=app.CONFIG,
+        conversation_state=app.CONVERSATION_STATE,
+        conversation_id_factory=app.CONVERSATION_ID_FACTORY,
+        skill_client=app.SKILL_CLIENT,
+        continuation_parameters_store=app.CONTINUATION_PARAMETERS_STORE,
+        scheduler=app.SCHEDULER,
+        attachment_downloader=app.ATTACHMENT_DOWNLOADER,
+        asset_cache=app.ASSET_CACHE,
+        trace_sender=app.TRACE_SENDER,
+    )
+
+
+def build_children(dialog: ActivityRouterDialog):
+    for dialog_id in EVENT_DIALOGS.values():
+        dialog._dialogs.find_dialog(dialog_id)  # pylint: disable=protected-access
+
+
+def median_us(action, number: int) -> float:
+    timings = []
+    for _ in range(number):
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    lazy = median_us(create_dialog, args.number)
+    eager = median_us(lambda: build_children(create_dialog()), args.number)
+    print(f"{'ActivityRouterDialog()':<42} {lazy:8.1f} us")
+    print(f"{'ActivityRouterDialog() + all the children':<42} {eager:8.1f} us  x{eager / lazy:.1f}")
+
+    # First use of each event: the time its dialog takes to be built.
+    for event_name, dialog_id in EVENT_DIALOGS.items():
+        dialogs = [create_dialog() for _ in range(args.number)]
+        first_use = median_us(
+            lambda: dialogs.pop()._dialogs.find_dialog(  # pylint: disable=protected-access
+                dialog_id  # pylint: disable=cell-var-from-loop
+            ),
+            args.number,
+        )
+        print(f"{'  first ' + event_name:<42} {first_use:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Compares building the CardDialog attachments with CardSampleHelper on every call (left) with
+getting them from a CardCache (right), alone and with the serialization of the activity that
+carries them.
+
+Run from the bot folder: python benchmarks/bench_card_cache.py [--number N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from botbuilder.core import MessageFactory
+from msrest import Serializer
+
+from dialogs.cards.card_cache import CARD_MODELS, CardCache
+from dialogs.cards.card_dialog import (
+    CORGI_ON_CAROUSEL_VIDEO,
+    MIND_BLOWN_GIF,
+    MUSIC_API,
+)
+from dialogs.cards.card_sample_helper import CardSampleHelper
+
+CARDS = {
+    "BOT_ACTION": [(CardSampleHelper.create_adaptive_card_bot_action,)],
+    "TASK_MODULE": [(CardSampleHelper.create_adaptive_card_task_module,)],
+    "SUBMIT_ACTION": [(CardSampleHelper.create_adaptive_card_submit,)],
+    "HERO": [(CardSampleHelper.create_hero_card,)],
+    "THUMBNAIL": [(CardSampleHelper.create_thumbnail_card,)],
+    "RECEIPT": [(CardSampleHelper.create_receipt_card,)],
+    "SIGNIN": [(CardSampleHelper.create_signin_card,)],
+    "CAROUSEL": [(CardSampleHelper.create_hero_card,)] * 3,
+    "LIST": [(CardSampleHelper.create_hero_card,)] * 3,
+    "O365": [(CardSampleHelper.create_o365_connector_card,)],
+    "ANIMATION": [(CardSampleHelper.create_animation_card, MIND_BLOWN_GIF)],
+    "AUDIO": [(CardSampleHelper.create_audio_card, f"http://localhost:37420/{MUSIC_API}")],
+    "VIDEO": [(CardSampleHelper.create_video_card, CORGI_ON_CAROUSEL_VIDEO)],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    serializer = Serializer(CARD_MODELS)
+    cache = CardCache()
+    for name, calls in CARDS.items():
+        bench_card(name, calls, cache, serializer, args.number)
+
+
+def bench_card(name: str, calls: list, cache: CardCache, serializer: Serializer, number: int):
+    def build():
+        return [factory(*factory_args) for factory, *factory_args in calls]
+
+    def get():
+        return [cache.get(factory, *factory_args) for factory, *factory_args in calls]
+
+    def send(attachments):
+        return serializer.body(MessageFactory.carousel(attachments), "Activity")
+
+    if send(build()) != send(get()):
+        sys.exit(f"The cached {name} card differs from the built one")
+
+    print(
+        f"{name:<14} attachments {measure(build, get, number)}  "
+        f"with the activity {measure(lambda: send(build()), lambda: send(get()), number)}"
+    )
+
+
+def measure(helper, card_cache, number: int) -> str:
+    helper_time = timeit.timeit(helper, number=number)
+    card_cache_time = timeit.timeit(card_cache, number=number)
+    return (
+        f"{helper_time / number * 1e6:7.1f} -> {card_cache_time / number * 1e6:7.1f} us "
+        f"x{helper_time / card_cache_time:<4.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
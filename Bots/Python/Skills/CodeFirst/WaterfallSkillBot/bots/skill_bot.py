@@ -10,6 +10,7 @@ from botbuilder.core import (
 from botbuilder.dialogs import Dialog, DialogExtensions
 from botbuilder.schema import Activity, ActivityTypes, ChannelAccount
 from config import DefaultConfig
+from scheduler import ActionScheduler
 
 
 class SkillBot(ActivityHandler):
@@ -18,6 +19,7 @@ class SkillBot(ActivityHandler):
         config: DefaultConfig,
         conversation_state: ConversationState,
         dialog: Dialog,
+        scheduler: ActionScheduler = None,
     ):
         if config is None:
             raise Exception("[SkillBot]: Missing parameter. config is required")
@@ -31,12 +33,20 @@ class SkillBot(ActivityHandler):
         self.config = config
         self.conversation_state = conversation_state
         self.dialog = dialog
+        self.scheduler = scheduler
 
     async def on_turn(self, turn_context: TurnContext):
         if turn_context.activity.type == ActivityTypes.conversation_update:
             await super().on_turn(turn_context)
 
         else:
+            if (
+                self.scheduler
+                and turn_context.activity.type == ActivityTypes.end_of_conversation
+            ):
+                # The conversation is over, drop the actions still waiting to run for it.
+                self.scheduler.cancel(turn_context.activity.conversation.id)
+
             await DialogExtensions.run_dialog(
                 self.dialog,
                 turn_context,
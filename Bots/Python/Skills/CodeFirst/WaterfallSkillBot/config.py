@@ -16,6 +16,9 @@ class DefaultConfig:
 
     SERVER_URL = ""  # pylint: disable=invalid-name
     PORT = os.getenv("Port", "37420")
+    # Number of worker processes sharing the listening socket. The skill keeps its proactive state in
+    # the process, it always runs a single worker.
+    WORKERS = int(os.getenv("Workers", "1"))
     APP_ID = os.getenv("MicrosoftAppId")
     APP_PASSWORD = os.getenv("MicrosoftAppPassword")
     CONNECTION_NAME = os.getenv("ConnectionName")
@@ -27,6 +30,32 @@ class DefaultConfig:
     # Example:
     #   os.getenv("AllowedCallers", ["54d3bb6a-3b6d-4ccd-bbfd-cad5c72fb53a", "3851a47b-53ed-4d29-b878-6e941da61e98"])
     ALLOWED_CALLERS = os.getenv("AllowedCallers")
+
+    # Storage used for conversation state and skill conversation ids ("memory" or "sqlite").
+    # Several processes on the same node can share state by pointing to the same sqlite file.
+    STORAGE_TYPE = os.getenv("StorageType", "memory")
+    SQLITE_STORAGE_PATH = os.getenv("SqliteStoragePath", "bot_state.db")
+    # Limits for the continuation parameters kept for users waiting for a proactive message.
+    PROACTIVE_STORE_MAX_SIZE = int(os.getenv("ProactiveStoreMaxSize", "1000"))
+    PROACTIVE_STORE_TTL = int(os.getenv("ProactiveStoreTtl", "3600"))
+    # Trace activities sent by the skill: level (off, error, warning, info, debug) and the
+    # comma separated channel ids that receive them ("*" for all channels).
+    TRACE_LEVEL = os.getenv("TraceLevel", "info")
+    TRACE_CHANNELS = os.getenv("TraceChannels", "*")
+    # Limits for the files received by the FileUpload action (in bytes).
+    ATTACHMENT_MAX_SIZE = int(os.getenv("AttachmentMaxSize", str(10 * 1024 * 1024)))
+    ATTACHMENT_PREVIEW_SIZE = int(os.getenv("AttachmentPreviewSize", "1024"))
+    # App tokens for other bots are refreshed in the background TokenRefreshBefore seconds before they
+    # expire.
+    TOKEN_REFRESH_BEFORE = float(os.getenv("TokenRefreshBefore", "300"))
+    # Inbound tokens that passed validation are cached (up to ValidatedTokenCacheSize) until they
+    # expire. The OpenID signing keys are fetched at startup and every OpenIdRefreshInterval seconds.
+    VALIDATED_TOKEN_CACHE_SIZE = int(os.getenv("ValidatedTokenCacheSize", "1000"))
+    OPEN_ID_REFRESH_INTERVAL = float(os.getenv("OpenIdRefreshInterval", str(12 * 60 * 60)))
+    # Bodies of at least CompressionThreshold bytes exchanged with other bots are compressed (gzip, or br
+    # with the brotli package) when the other side accepts it. HttpCompression=false turns it off.
+    HTTP_COMPRESSION = os.getenv("HttpCompression", "true").lower() == "true"
+    COMPRESSION_THRESHOLD = int(os.getenv("CompressionThreshold", "1024"))
     ECHO_SKILL_INFO = BotFrameworkSkill(
         id=os.getenv("EchoSkillInfo_id"),
         app_id=os.getenv("EchoSkillInfo_appId"),
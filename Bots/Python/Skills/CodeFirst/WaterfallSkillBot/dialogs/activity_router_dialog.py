@@ -2,8 +2,6 @@
 # Licensed under the MIT License.
 
 import json
-from typing import Dict
-from datetime import datetime
 
 from botbuilder.core import MessageFactory, ConversationState
 from botbuilder.dialogs import (
@@ -19,20 +17,37 @@ from botbuilder.dialogs.skills import (
     SkillDialog,
     BeginSkillDialogOptions,
 )
-from botbuilder.schema import Activity, ActivityTypes, InputHints
+from botbuilder.schema import ActivityTypes, InputHints
 from botbuilder.integration.aiohttp.skills import SkillHttpClient
+from asset_cache import AssetCache
 from config import DefaultConfig
 from dialogs.cards import CardDialog
 from dialogs.delete import DeleteDialog
-from dialogs.proactive import WaitForProactiveDialog
+from dialogs.proactive import ContinuationParametersStore, WaitForProactiveDialog
 from dialogs.message_with_attachment import MessageWithAttachmentDialog
 from dialogs.auth import AuthDialog
 from dialogs.sso import SsoSkillDialog
-from dialogs.file_upload import FileUploadDialog
+from dialogs.file_upload import AttachmentDownloader, FileUploadDialog
 from dialogs.update import UpdateDialog
+from dialogs.lazy_dialog_set import LazyDialogSet
+from scheduler import ActionScheduler
+from tracing import TraceLevel, TraceSender
 
 ECHO_SKILL = "EchoSkill"
 
+# Name of the event activity -> id of the dialog it starts.
+EVENT_DIALOGS = {
+    "Cards": CardDialog.__name__,
+    "Proactive": WaitForProactiveDialog.__name__,
+    "MessageWithAttachment": MessageWithAttachmentDialog.__name__,
+    "Auth": AuthDialog.__name__,
+    "Sso": SsoSkillDialog.__name__,
+    "FileUpload": FileUploadDialog.__name__,
+    "Echo": ECHO_SKILL,
+    "Delete": DeleteDialog.__name__,
+    "Update": UpdateDialog.__name__,
+}
+
 
 class ActivityRouterDialog(ComponentDialog):
     def __init__(
@@ -41,28 +56,46 @@ class ActivityRouterDialog(ComponentDialog):
         conversation_state: ConversationState,
         conversation_id_factory: SkillConversationIdFactory,
         skill_client: SkillHttpClient,
-        continuation_parameters_store: Dict,
+        continuation_parameters_store: ContinuationParametersStore,
+        scheduler: ActionScheduler,
+        attachment_downloader: AttachmentDownloader,
+        asset_cache: AssetCache,
+        trace_sender: TraceSender,
     ):
         super().__init__(ActivityRouterDialog.__name__)
-
-        self.add_dialog(CardDialog(configuration))
-        self.add_dialog(MessageWithAttachmentDialog(configuration))
-
-        self.add_dialog(
-            WaitForProactiveDialog(configuration, continuation_parameters_store)
+        self._trace_sender = trace_sender
+
+        # The child dialogs are built the first time their event arrives.
+        self._dialogs = LazyDialogSet()
+        self._dialogs.register(CardDialog.__name__, lambda: CardDialog(configuration))
+        self._dialogs.register(
+            MessageWithAttachmentDialog.__name__,
+            lambda: MessageWithAttachmentDialog(configuration, asset_cache),
         )
-
-        self.add_dialog(AuthDialog(configuration))
-        self.add_dialog(SsoSkillDialog(configuration))
-        self.add_dialog(FileUploadDialog())
-        self.add_dialog(DeleteDialog())
-        self.add_dialog(UpdateDialog())
-
-        self.add_dialog(
-            self.create_echo_skill_dialog(
+        self._dialogs.register(
+            WaitForProactiveDialog.__name__,
+            lambda: WaitForProactiveDialog(
+                configuration, continuation_parameters_store
+            ),
+        )
+        self._dialogs.register(AuthDialog.__name__, lambda: AuthDialog(configuration))
+        self._dialogs.register(
+            SsoSkillDialog.__name__, lambda: SsoSkillDialog(configuration)
+        )
+        self._dialogs.register(
+            FileUploadDialog.__name__, lambda: FileUploadDialog(attachment_downloader)
+        )
+        self._dialogs.register(
+            DeleteDialog.__name__, lambda: DeleteDialog(configuration, scheduler)
+        )
+        self._dialogs.register(UpdateDialog.__name__, UpdateDialog)
+        self._dialogs.register(
+            ECHO_SKILL,
+            lambda: self.create_echo_skill_dialog(
                 configuration, conversation_state, conversation_id_factory, skill_client
-            )
+            ),
         )
+
         self.add_dialog(
             WaterfallDialog(WaterfallDialog.__name__, [self.process_activity])
         )
@@ -95,13 +128,11 @@ class ActivityRouterDialog(ComponentDialog):
 
     async def process_activity(self, step_context: WaterfallStepContext):
         # A skill can send trace activities, if needed.
-        await step_context.context.send_activity(
-            Activity(
-                type=ActivityTypes.trace,
-                timestamp=datetime.utcnow(),
-                name="ActivityRouterDialog.process_activity()",
-                label=f"Got ActivityType: {step_context.context.activity.type}",
-            )
+        await self._trace_sender.trace(
+            step_context.context,
+            TraceLevel.INFO,
+            "ActivityRouterDialog.process_activity()",
+            lambda: f"Got ActivityType: {step_context.context.activity.type}",
         )
 
         if step_context.context.activity.type == ActivityTypes.event:
@@ -116,47 +147,25 @@ class ActivityRouterDialog(ComponentDialog):
 
     async def on_event_activity(self, step_context: WaterfallStepContext):
         activity = step_context.context.activity
-        await step_context.context.send_activity(
-            Activity(
-                type=ActivityTypes.trace,
-                timestamp=datetime.utcnow(),
-                name="ActivityRouterDialog.on_event_activity()",
-                label=f"Name: {activity.name}. Value: {json.dumps(activity.value)}",
-            )
+        await self._trace_sender.trace(
+            step_context.context,
+            TraceLevel.INFO,
+            "ActivityRouterDialog.on_event_activity()",
+            lambda: f"Name: {activity.name}. Value: {json.dumps(activity.value)}",
         )
 
-        if activity.name == "Cards":
-            return await step_context.begin_dialog(CardDialog.__name__)
-
-        if activity.name == "Proactive":
-            return await step_context.begin_dialog(WaitForProactiveDialog.__name__)
+        dialog_id = EVENT_DIALOGS.get(activity.name)
 
-        if activity.name == "MessageWithAttachment":
-            return await step_context.begin_dialog(MessageWithAttachmentDialog.__name__)
-
-        if activity.name == "Auth":
-            return await step_context.begin_dialog(AuthDialog.__name__)
-
-        if activity.name == "Sso":
-            return await step_context.begin_dialog(SsoSkillDialog.__name__)
-
-        if activity.name == "FileUpload":
-            return await step_context.begin_dialog(FileUploadDialog.__name__)
-
-        if activity.name == "Echo":
+        if dialog_id == ECHO_SKILL:
             # Start the EchoSkillBot
             message_activity = MessageFactory.text("I'm the echo skill bot")
             message_activity.delivery_mode = activity.delivery_mode
-            dialog = await self.find_dialog(ECHO_SKILL)
             return await step_context.begin_dialog(
-                dialog.id, BeginSkillDialogOptions(activity=message_activity)
+                dialog_id, BeginSkillDialogOptions(activity=message_activity)
             )
 
-        if activity.name == "Delete":
-            return await step_context.begin_dialog(DeleteDialog.__name__)
-
-        if activity.name == "Update":
-            return await step_context.begin_dialog(UpdateDialog.__name__)
+        if dialog_id:
+            return await step_context.begin_dialog(dialog_id)
 
         # We didn't get an event name we can handle.
         await step_context.context.send_activity(
@@ -0,0 +1,68 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+import orjson
+from botbuilder import schema
+from botbuilder.schema import Attachment
+from botbuilder.schema import teams
+from msrest import Serializer
+
+CARD_MODELS = {
+    name: model
+    for module in (schema, teams)
+    for name, model in module.__dict__.items()
+    if isinstance(model, type)
+}
+
+
+class CardCache:
+    """
+    Builds each card attachment once and hands out copies of it.
+    Remarks: The sample cards are static (the audio card only depends on its url), but building them
+    creates a full msrest model tree per call. The first call for a factory and arguments serializes
+    the card content to JSON; every later call returns a new Attachment whose content is parsed from
+    that JSON, so the caller can't change the cached card.
+    """
+
+    def __init__(self, max_size: int = 100):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._serializer = Serializer(CARD_MODELS)
+        self._cards: "OrderedDict[Tuple, Tuple[Attachment, bytes]]" = OrderedDict()
+
+    def get(self, factory: Callable[..., Attachment], *args) -> Attachment:
+        key = (factory, args)
+        entry = self._cards.get(key)
+        if entry:
+            self.hits += 1
+            self._cards.move_to_end(key)
+        else:
+            self.misses += 1
+            entry = self._freeze(factory(*args))
+            self._cards[key] = entry
+            while len(self._cards) > self.max_size:
+                self._cards.popitem(last=False)
+
+        template, content = entry
+        return Attachment(
+            content_type=template.content_type,
+            content_url=template.content_url,
+            content=orjson.loads(content),  # pylint: disable=no-member
+            name=template.name,
+            thumbnail_url=template.thumbnail_url,
+        )
+
+    def _freeze(self, attachment: Attachment) -> Tuple[Attachment, bytes]:
+        template = Attachment(
+            content_type=attachment.content_type,
+            content_url=attachment.content_url,
+            name=attachment.name,
+            thumbnail_url=attachment.thumbnail_url,
+        )
+        content = self._serializer.serialize_object(attachment.content)
+
+        return template, orjson.dumps(content)  # pylint: disable=no-member
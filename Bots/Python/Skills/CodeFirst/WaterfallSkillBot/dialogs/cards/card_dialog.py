@@ -28,6 +28,8 @@ from config import DefaultConfig
 from dialogs.cards.card_options import CardOptions
 from dialogs.cards.channel_supported_cards import ChannelSupportedCards
 from dialogs.cards.card_sample_helper import CardSampleHelper
+from dialogs.cards.card_cache import CardCache
+from dialogs.indexed_choice_prompt import IndexedChoicePrompt
 
 
 CORGI_ON_CAROUSEL_VIDEO = "https://www.youtube.com/watch?v=LvqzubPZjHE"
@@ -43,8 +45,11 @@ class CardDialog(ComponentDialog):
     def __init__(self, configuration: DefaultConfig):
         super().__init__(CardDialog.__name__)
         self.configuration = configuration
+        self._card_cache = CardCache()
 
-        self.add_dialog(ChoicePrompt(ChoicePrompt.__name__, self.card_prompt_validator))
+        self.add_dialog(
+            IndexedChoicePrompt(ChoicePrompt.__name__, self.card_prompt_validator)
+        )
         self.add_dialog(
             WaterfallDialog(
                 WaterfallDialog.__name__,
@@ -103,46 +108,56 @@ class CardDialog(ComponentDialog):
                 if card_type == CardOptions.ADAPTIVE_CARD_BOT_ACTION:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_adaptive_card_bot_action()
+                            self._card_cache.get(
+                                CardSampleHelper.create_adaptive_card_bot_action
+                            )
                         )
                     )
 
                 elif card_type == CardOptions.ADAPTIVE_CARD_TEAMS_TASK_MODULE:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_adaptive_card_task_module()
+                            self._card_cache.get(
+                                CardSampleHelper.create_adaptive_card_task_module
+                            )
                         )
                     )
 
                 elif card_type == CardOptions.ADAPTIVE_CARD_SUBMIT_ACTION:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_adaptive_card_submit()
+                            self._card_cache.get(
+                                CardSampleHelper.create_adaptive_card_submit
+                            )
                         )
                     )
 
                 elif card_type == CardOptions.HERO:
                     await step_context.context.send_activity(
-                        MessageFactory.attachment(CardSampleHelper.create_hero_card())
+                        MessageFactory.attachment(
+                            self._card_cache.get(CardSampleHelper.create_hero_card)
+                        )
                     )
 
                 elif card_type == CardOptions.THUMBNAIL:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_thumbnail_card()
+                            self._card_cache.get(CardSampleHelper.create_thumbnail_card)
                         )
                     )
 
                 elif card_type == CardOptions.RECEIPT:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_receipt_card()
+                            self._card_cache.get(CardSampleHelper.create_receipt_card)
                         )
                     )
 
                 elif card_type == CardOptions.SIGN_IN:
                     await step_context.context.send_activity(
-                        MessageFactory.attachment(CardSampleHelper.create_signin_card())
+                        MessageFactory.attachment(
+                            self._card_cache.get(CardSampleHelper.create_signin_card)
+                        )
                     )
 
                 elif card_type == CardOptions.CAROUSEL:
@@ -151,9 +166,9 @@ class CardDialog(ComponentDialog):
                     await step_context.context.send_activity(
                         MessageFactory.carousel(
                             [
-                                CardSampleHelper.create_hero_card(),
-                                CardSampleHelper.create_hero_card(),
-                                CardSampleHelper.create_hero_card(),
+                                self._card_cache.get(CardSampleHelper.create_hero_card),
+                                self._card_cache.get(CardSampleHelper.create_hero_card),
+                                self._card_cache.get(CardSampleHelper.create_hero_card),
                             ]
                         )
                     )
@@ -162,9 +177,9 @@ class CardDialog(ComponentDialog):
                     await step_context.context.send_activity(
                         MessageFactory.list(
                             [
-                                CardSampleHelper.create_hero_card(),
-                                CardSampleHelper.create_hero_card(),
-                                CardSampleHelper.create_hero_card(),
+                                self._card_cache.get(CardSampleHelper.create_hero_card),
+                                self._card_cache.get(CardSampleHelper.create_hero_card),
+                                self._card_cache.get(CardSampleHelper.create_hero_card),
                             ]
                         )
                     )
@@ -172,15 +187,18 @@ class CardDialog(ComponentDialog):
                 elif card_type == CardOptions.O365:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_o365_connector_card()
+                            self._card_cache.get(
+                                CardSampleHelper.create_o365_connector_card
+                            )
                         )
                     )
 
                 elif card_type == CardOptions.TEAMS_FILE_CONSENT:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_teams_file_consent_card(
-                                TEAMS_LOGO_FILE_NAME
+                            self._card_cache.get(
+                                CardSampleHelper.create_teams_file_consent_card,
+                                TEAMS_LOGO_FILE_NAME,
                             )
                         )
                     )
@@ -188,15 +206,19 @@ class CardDialog(ComponentDialog):
                 elif card_type == CardOptions.ANIMATION:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_animation_card(MIND_BLOWN_GIF)
+                            self._card_cache.get(
+                                CardSampleHelper.create_animation_card,
+                                MIND_BLOWN_GIF,
+                            )
                         )
                     )
 
                 elif card_type == CardOptions.AUDIO:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_audio_card(
-                                f"{self.configuration.SERVER_URL}/{MUSIC_API}"
+                            self._card_cache.get(
+                                CardSampleHelper.create_audio_card,
+                                f"{self.configuration.SERVER_URL}/{MUSIC_API}",
                             )
                         )
                     )
@@ -204,14 +226,19 @@ class CardDialog(ComponentDialog):
                 elif card_type == CardOptions.VIDEO:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_video_card(CORGI_ON_CAROUSEL_VIDEO)
+                            self._card_cache.get(
+                                CardSampleHelper.create_video_card,
+                                CORGI_ON_CAROUSEL_VIDEO,
+                            )
                         )
                     )
 
                 elif card_type == CardOptions.ADAPTIVE_UPDATE:
                     await step_context.context.send_activity(
                         MessageFactory.attachment(
-                            CardSampleHelper.create_adaptive_update_card()
+                            self._card_cache.get(
+                                CardSampleHelper.create_adaptive_update_card
+                            )
                         )
                     )
 
@@ -1,8 +1,7 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-import time
-from botbuilder.core import MessageFactory
+from botbuilder.core import MessageFactory, BotAdapter, TurnContext
 from botbuilder.dialogs import (
     ComponentDialog,
     WaterfallDialog,
@@ -11,11 +10,17 @@ from botbuilder.dialogs import (
     DialogTurnStatus,
 )
 from botframework.connector import Channels
+from config import DefaultConfig
+from scheduler import ActionScheduler
+
+DELETE_DELAY_SECONDS = 5
 
 
 class DeleteDialog(ComponentDialog):
-    def __init__(self):
+    def __init__(self, configuration: DefaultConfig, scheduler: ActionScheduler):
         super().__init__(DeleteDialog.__name__)
+        self._configuration = configuration
+        self._scheduler = scheduler
         self._delete_supported = [Channels.ms_teams, Channels.slack, Channels.telegram]
 
         self.add_dialog(
@@ -29,10 +34,11 @@ class DeleteDialog(ComponentDialog):
 
         if channel in self._delete_supported:
             response = await step_context.context.send_activity(
-                MessageFactory.text("I will delete this message in 5 seconds")
+                MessageFactory.text(
+                    f"I will delete this message in {DELETE_DELAY_SECONDS} seconds"
+                )
             )
-            time.sleep(5)
-            await step_context.context.delete_activity(response.id)
+            self.schedule_delete(step_context.context, response.id)
 
         else:
             await step_context.context.send_activity(
@@ -42,3 +48,30 @@ class DeleteDialog(ComponentDialog):
             )
 
         return DialogTurnResult(DialogTurnStatus.Complete)
+
+    def schedule_delete(self, context: TurnContext, activity_id: str):
+        # The turn is over by the time the delete runs, so it continues the conversation to get a new context.
+        adapter = context.adapter
+        conversation_reference = TurnContext.get_conversation_reference(
+            context.activity
+        )
+        claims_identity = context.turn_state.get(BotAdapter.BOT_IDENTITY_KEY)
+        oauth_scope = context.turn_state.get(BotAdapter.BOT_OAUTH_SCOPE_KEY)
+
+        async def callback(continued_context: TurnContext):
+            await continued_context.delete_activity(activity_id)
+
+        async def delete_activity():
+            await adapter.continue_conversation(
+                conversation_reference,
+                callback,
+                self._configuration.APP_ID,
+                claims_identity,
+                oauth_scope,
+            )
+
+        self._scheduler.schedule(
+            conversation_reference.conversation.id,
+            DELETE_DELAY_SECONDS,
+            delete_activity,
+        )
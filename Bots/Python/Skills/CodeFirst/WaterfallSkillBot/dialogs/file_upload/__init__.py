@@ -1,6 +1,7 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
+from .attachment_downloader import AttachmentDownloader, DownloadedAttachment
 from .file_upload_dialog import FileUploadDialog
 
-__all__ = ["FileUploadDialog"]
+__all__ = ["AttachmentDownloader", "DownloadedAttachment", "FileUploadDialog"]
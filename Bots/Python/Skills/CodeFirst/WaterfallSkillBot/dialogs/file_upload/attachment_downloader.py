@@ -0,0 +1,120 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import base64
+from typing import List
+from urllib.parse import unquote_to_bytes
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from botbuilder.schema import Attachment
+
+CHUNK_SIZE = 64 * 1024
+
+
+class DownloadedAttachment:
+    def __init__(
+        self,
+        name: str,
+        size: int = 0,
+        preview: bytes = b"",
+        error: str = None,
+    ):
+        self.name = name
+        self.size = size
+        self.preview = preview
+        self.error = error
+
+    @property
+    def truncated(self) -> bool:
+        return self.size > len(self.preview)
+
+
+class AttachmentDownloader:
+    """
+    Downloads attachments on the event loop with a pooled aiohttp session.
+    Remarks: Attachments are fetched concurrently and read in chunks. Only the first `preview_size`
+    bytes of each file are kept, in memory, the rest is counted and dropped, so nothing is written to
+    disk. Downloads bigger than `max_size` are aborted.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10 * 1024 * 1024,
+        preview_size: int = 1024,
+        max_connections: int = 20,
+        timeout: float = 30,
+    ):
+        self.max_size = max_size
+        self.preview_size = preview_size
+        self._max_connections = max_connections
+        self._timeout = timeout
+
+        # The session is bound to the running event loop, it's created on first use.
+        self._session: ClientSession = None
+
+    async def download_all(self, attachments: List[Attachment]) -> List[DownloadedAttachment]:
+        return await asyncio.gather(
+            *[self._download(index, attachment) for index, attachment in enumerate(attachments)]
+        )
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> ClientSession:
+        if not self._session or self._session.closed:
+            self._session = ClientSession(
+                connector=TCPConnector(limit=self._max_connections),
+                timeout=ClientTimeout(total=self._timeout),
+            )
+
+        return self._session
+
+    async def _download(self, index: int, attachment: Attachment) -> DownloadedAttachment:
+        result = DownloadedAttachment(attachment.name or f"attachment-{index}")
+
+        try:
+            if attachment.content_url.startswith("data:"):
+                self._read_data_url(attachment.content_url, result)
+            else:
+                await self._read_stream(attachment.content_url, result)
+        except Exception as exception:  # pylint: disable=broad-except
+            result.error = str(exception) or exception.__class__.__name__
+            result.preview = b""
+
+        return result
+
+    async def _read_stream(self, url: str, result: DownloadedAttachment):
+        async with self._get_session().get(url) as response:
+            response.raise_for_status()
+            if response.content_length and response.content_length > self.max_size:
+                raise ValueError(self._too_large_message(response.content_length))
+
+            preview = bytearray()
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                result.size += len(chunk)
+                if result.size > self.max_size:
+                    raise ValueError(self._too_large_message(result.size))
+
+                if len(preview) < self.preview_size:
+                    preview += chunk[: self.preview_size - len(preview)]
+
+            result.preview = bytes(preview)
+
+    def _read_data_url(self, url: str, result: DownloadedAttachment):
+        header, _, data = url.partition(",")
+        content = (
+            base64.b64decode(data)
+            if header.endswith(";base64")
+            else unquote_to_bytes(data)
+        )
+        if len(content) > self.max_size:
+            raise ValueError(self._too_large_message(len(content)))
+
+        result.size = len(content)
+        result.preview = content[: self.preview_size]
+
+    def _too_large_message(self, size: int) -> str:
+        return f"the file is {size} bytes, the limit is {self.max_size} bytes"
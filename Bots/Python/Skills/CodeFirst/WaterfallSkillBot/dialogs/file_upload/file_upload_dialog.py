@@ -1,10 +1,6 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-import tempfile
-import os
-import urllib.request
-import shutil
 from botbuilder.core import MessageFactory
 from botbuilder.dialogs import (
     ComponentDialog,
@@ -16,11 +12,13 @@ from botbuilder.dialogs import (
 )
 from botbuilder.dialogs.prompts import PromptOptions, AttachmentPrompt
 from botbuilder.schema import InputHints
+from .attachment_downloader import AttachmentDownloader
 
 
 class FileUploadDialog(ComponentDialog):
-    def __init__(self):
+    def __init__(self, downloader: AttachmentDownloader):
         super().__init__(FileUploadDialog.__name__)
+        self._downloader = downloader
 
         self.add_dialog(AttachmentPrompt(AttachmentPrompt.__name__))
         self.add_dialog(ConfirmPrompt(ConfirmPrompt.__name__))
@@ -46,17 +44,17 @@ class FileUploadDialog(ComponentDialog):
 
     async def handle_attachment_step(self, step_context: WaterfallStepContext):
         file_text = ""
-        file_content = ""
 
-        for file in step_context.context.activity.attachments:
-            remote_file_url = file.content_url
-            local_file_name = os.path.join(tempfile.gettempdir(), file.name)
-            with urllib.request.urlopen(remote_file_url) as response, open(
-                local_file_name, "wb"
-            ) as out_file:
-                shutil.copyfileobj(response, out_file)
+        downloads = await self._downloader.download_all(step_context.context.activity.attachments)
 
-            file_content = open(local_file_name, "r").read()
+        for file in downloads:
+            if file.error:
+                file_text += f'Attachment "{ file.name }" could not be received: { file.error }.\r\n'
+                continue
+
+            file_content = file.preview.decode("utf-8", errors="replace")
+            if file.truncated:
+                file_content += f"... ({ file.size } bytes in total)"
             file_text += f'Attachment "{ file.name }" has been received.\r\n'
             file_text += f'File content: { file_content }\r\n'
 
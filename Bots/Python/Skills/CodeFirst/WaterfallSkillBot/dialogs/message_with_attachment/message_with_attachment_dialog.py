@@ -1,8 +1,6 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-import os
-import base64
 from botbuilder.core import MessageFactory
 from botbuilder.dialogs import (
     ComponentDialog,
@@ -20,15 +18,17 @@ from botbuilder.schema import (
     InputHints
 )
 
+from asset_cache import AssetCache
 from config import DefaultConfig
 
 
 class MessageWithAttachmentDialog(ComponentDialog):
-    def __init__(self, configuration: DefaultConfig):
+    def __init__(self, configuration: DefaultConfig, asset_cache: AssetCache):
         super().__init__(MessageWithAttachmentDialog.__name__)
 
         self._picture = "architecture-resize.png"
         self.configuration = configuration
+        self._asset_cache = asset_cache
 
         self.add_dialog(ChoicePrompt(ChoicePrompt.__name__))
         self.add_dialog(ConfirmPrompt(ConfirmPrompt.__name__))
@@ -106,15 +106,10 @@ class MessageWithAttachmentDialog(ComponentDialog):
         return DialogTurnResult(DialogTurnStatus.Complete)
 
     async def get_inline_attachment(self):
-        file_path = os.path.join(os.getcwd(), "images", self._picture)
-
-        with open(file_path, "rb") as in_file:
-            file = base64.b64encode(in_file.read()).decode()
-
         return Attachment(
             name=f"Files/{ self._picture }",
             content_type="image/png",
-            content_url=f"data:image/png;base64,{file}",
+            content_url=self._asset_cache.get(self._picture),
         )
 
     async def get_internet_attachment(self):
@@ -2,6 +2,11 @@
 # Licensed under the MIT License.
 
 from .continuation_parameters import ContinuationParameters
+from .continuation_parameters_store import ContinuationParametersStore
 from .wait_for_proactive_dialog import WaitForProactiveDialog
 
-__all__ = ["ContinuationParameters", "WaitForProactiveDialog"]
+__all__ = [
+    "ContinuationParameters",
+    "ContinuationParametersStore",
+    "WaitForProactiveDialog",
+]
@@ -0,0 +1,78 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from .continuation_parameters import ContinuationParameters
+
+
+class ContinuationParametersStore:
+    """
+    Bounded in-memory store for the ContinuationParameters of users waiting for a proactive message.
+    Remarks: Entries expire `ttl` seconds after they were last set and the least recently used entry
+    is evicted once `max_size` is reached, so the memory used by the skill stays flat no matter how
+    many users hit the Proactive action.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: float = 3600):
+        if max_size <= 0:
+            raise ValueError("ContinuationParametersStore: max_size must be greater than 0.")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+        self._items: "OrderedDict[str, Tuple[float, ContinuationParameters]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, user_id: str):
+        return self.get(user_id) is not None
+
+    def get(self, user_id: str) -> ContinuationParameters:
+        entry = self._items.get(user_id)
+        if not entry:
+            return None
+
+        expires_at, continuation_parameters = entry
+        if expires_at <= time.monotonic():
+            del self._items[user_id]
+            self.expirations += 1
+            return None
+
+        self._items.move_to_end(user_id)
+        return continuation_parameters
+
+    def set(self, user_id: str, continuation_parameters: ContinuationParameters):
+        self._items[user_id] = (time.monotonic() + self.ttl, continuation_parameters)
+        self._items.move_to_end(user_id)
+        self._evict()
+
+    def delete(self, user_id: str):
+        self._items.pop(user_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _evict(self):
+        now = time.monotonic()
+
+        # Entries are kept in last-set/last-read order, so expired ones are usually at the front.
+        while self._items:
+            user_id, (expires_at, _) = next(iter(self._items.items()))
+            if expires_at <= now:
+                del self._items[user_id]
+                self.expirations += 1
+            elif len(self._items) > self.max_size:
+                del self._items[user_id]
+                self.evictions += 1
+            else:
+                break
@@ -1,7 +1,6 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
-from typing import Dict
 from botbuilder.core import MessageFactory, BotAdapter, TurnContext
 from botbuilder.dialogs import Dialog, DialogContext, DialogTurnResult, DialogTurnStatus
 from botbuilder.schema import (
@@ -10,13 +9,14 @@ from botbuilder.schema import (
 )
 from config import DefaultConfig
 from .continuation_parameters import ContinuationParameters
+from .continuation_parameters_store import ContinuationParametersStore
 
 
 class WaitForProactiveDialog(Dialog):
     def __init__(
         self,
         configuration: DefaultConfig,
-        continuation_parameters_store: Dict[str, ContinuationParameters],
+        continuation_parameters_store: ContinuationParametersStore,
     ):
         super().__init__(WaitForProactiveDialog.__name__)
         self.configuration = configuration
@@ -47,7 +47,7 @@ class WaitForProactiveDialog(Dialog):
             and activity.name == ActivityEventNames.continue_conversation
         ):
             # We continued the conversation, forget the proactive reference.
-            self.continuation_parameters_store[activity.id] = None
+            self.continuation_parameters_store.delete(activity.from_property.id)
 
             # The continue conversation activity comes from the ProactiveController when the notification is received
             await dialog_context.context.send_activity(
@@ -66,12 +66,13 @@ class WaitForProactiveDialog(Dialog):
         return Dialog.end_of_turn
 
     def add_or_update_continuation_parameters(self, context: TurnContext):
-        self.continuation_parameters_store[
-            context.activity.from_property.id
-        ] = ContinuationParameters(
-            claims_identity=context.turn_state.get(BotAdapter.BOT_IDENTITY_KEY),
-            conversation_reference=TurnContext.get_conversation_reference(
-                context.activity
+        self.continuation_parameters_store.set(
+            context.activity.from_property.id,
+            ContinuationParameters(
+                claims_identity=context.turn_state.get(BotAdapter.BOT_IDENTITY_KEY),
+                conversation_reference=TurnContext.get_conversation_reference(
+                    context.activity
+                ),
+                oauth_scope=context.turn_state.get(BotAdapter.BOT_OAUTH_SCOPE_KEY),
             ),
-            oauth_scope=context.turn_state.get(BotAdapter.BOT_OAUTH_SCOPE_KEY),
         )
@@ -0,0 +1,244 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import gzip
+from http import HTTPStatus
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from aiohttp import web
+from aiohttp.web import Request, StreamResponse
+from msrest.async_client import SDKClientAsync
+from msrest.pipeline import AsyncHTTPPolicy, AsyncPipeline, SansIOHTTPPolicy
+from msrest.pipeline.async_requests import (
+    AsyncPipelineRequestsHTTPSender,
+    AsyncRequestsCredentialsPolicy,
+)
+from msrest.pipeline.universal import RawDeserializer
+from msrest.universal_http.async_requests import AsyncRequestsHTTPSender
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Codings in order of preference, br only when the brotli package is installed.
+SUPPORTED_CODINGS: Tuple[str, ...] = ("br", "gzip") if brotli else ("gzip",)
+ACCEPT_ENCODING = ", ".join(SUPPORTED_CODINGS)
+
+# Fast levels, the bodies are compressed for every request.
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+# Bodies this large (e.g. inline images) are compressed in a worker thread, zlib and brotli release
+# the GIL so the event loop keeps going.
+OFF_LOOP_THRESHOLD = 64 * 1024
+# Requests that match no route share one entry, so clients can't add entries with made up paths.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Returns the preferred supported coding allowed by an Accept-Encoding header, if any.
+    """
+
+    accepted = set()
+    for value in (accept_encoding or "").split(","):
+        coding, _, params = value.partition(";")
+        params = params.strip().lower()
+        if params.startswith("q=") and params[2:].strip("0. ") == "":
+            # q=0 means "not acceptable".
+            continue
+        accepted.add(coding.strip().lower())
+
+    for coding in SUPPORTED_CODINGS:
+        if coding in accepted or "*" in accepted:
+            return coding
+    return None
+
+
+def compress(data: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+async def compress_async(data: bytes, coding: str) -> bytes:
+    if len(data) < OFF_LOOP_THRESHOLD:
+        return compress(data, coding)
+    return await asyncio.get_event_loop().run_in_executor(None, compress, data, coding)
+
+
+class CompressionStats:
+    def __init__(self):
+        self.requests = 0
+        self.compressed_requests = 0
+        self.request_bytes = 0
+        self.request_wire_bytes = 0
+        self.responses = 0
+        self.compressed_responses = 0
+        self.response_bytes = 0
+        self.response_wire_bytes = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        stats = dict(self.__dict__)
+        stats["request_savings"] = self.request_bytes - self.request_wire_bytes
+        stats["response_savings"] = self.response_bytes - self.response_wire_bytes
+        return stats
+
+
+class HttpCompression:
+    """
+    Negotiated compression of the HTTP traffic between bots, with the bytes saved per route.
+    Remarks: The middleware compresses response bodies of at least `threshold` bytes with the
+    preferred coding of the request's Accept-Encoding (br when brotli is installed, then gzip), and
+    advertises the codings it accepts for request bodies in the Accept-Encoding response header
+    (RFC 7694), which the callers use to compress the bodies they send. aiohttp decompresses the
+    request bodies. Streamed responses are sent as they are. When disabled it only counts the bytes.
+    """
+
+    def __init__(self, threshold: int = 1024, enabled: bool = True):
+        self.threshold = threshold
+        self.enabled = enabled
+        self._routes: Dict[str, CompressionStats] = {}
+
+    def compress_request(
+        self, data: bytes, coding: Optional[str]
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Compresses a request body with the coding advertised by the receiver, when it's worth it.
+        Returns the body to send and its Content-Encoding (None when sent as is).
+        """
+
+        if not self.enabled or not coding or len(data) < self.threshold:
+            return data, None
+        return compress(data, coding), coding
+
+    async def compress_request_async(
+        self, data: bytes, coding: Optional[str]
+    ) -> Tuple[bytes, Optional[str]]:
+        if not self.enabled or not coding or len(data) < self.threshold:
+            return data, None
+        return await compress_async(data, coding), coding
+
+    @web.middleware
+    async def middleware(
+        self, request: Request, handler: Callable[[Request], Awaitable[StreamResponse]]
+    ) -> StreamResponse:
+        stats = self._stats_for(request)
+        if request.body_exists:
+            stats.requests += 1
+            body_size = len(await request.read())
+            stats.request_bytes += body_size
+            compressed = request.headers.get("Content-Encoding", "identity") != "identity"
+            if compressed:
+                stats.compressed_requests += 1
+            if compressed and request.content_length is not None:
+                stats.request_wire_bytes += request.content_length
+            else:
+                # Only compressed bodies of a known length count as savings, a chunked one is
+                # counted as sent uncompressed.
+                stats.request_wire_bytes += body_size
+
+        response = await handler(request)
+        if not isinstance(response, web.Response) or response.prepared:
+            return response
+
+        if self.enabled:
+            response.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        body = response.body
+        if not isinstance(body, (bytes, bytearray)):
+            return response
+
+        stats.responses += 1
+        stats.response_bytes += len(body)
+        coding = (
+            negotiate(request.headers.get("Accept-Encoding"))
+            if self.enabled
+            and len(body) >= self.threshold
+            and "Content-Encoding" not in response.headers
+            else None
+        )
+        if coding:
+            body = await compress_async(body, coding)
+            response.body = body
+            response.headers["Content-Encoding"] = coding
+            response.headers.add("Vary", "Accept-Encoding")
+            stats.compressed_responses += 1
+        stats.response_wire_bytes += len(body)
+
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {route: stats.to_dict() for route, stats in self._routes.items()}
+
+    def _stats_for(self, request: Request) -> CompressionStats:
+        route = request.match_info.route.resource
+        name = route.canonical if route else UNMATCHED_ROUTE
+        stats = self._routes.get(name)
+        if not stats:
+            stats = CompressionStats()
+            self._routes[name] = stats
+        return stats
+
+
+class RequestCompressionPolicy(SansIOHTTPPolicy):
+    """
+    msrest policy that compresses the request bodies of a client once the receiver advertised a
+    supported coding in Accept-Encoding. It runs after the client's logger policy, so the logs show
+    the bodies as they were.
+    """
+
+    def __init__(self, compression: HttpCompression):
+        self._compression = compression
+        self.coding: Optional[str] = None
+        self.refused = False
+
+    @staticmethod
+    def install(client: SDKClientAsync, compression: HttpCompression) -> "RequestCompressionPolicy":
+        """
+        Adds request compression to an msrest client (e.g. a ConnectorClient), once.
+        Remarks: The policies are fixed once a pipeline is built, so the client's configuration gets
+        a new pipeline with the policies of msrest's default one followed by this one.
+        """
+
+        config = client.config
+        policy = getattr(config, "request_compression_policy", None)
+        if policy:
+            return policy
+
+        policy = RequestCompressionPolicy(compression)
+        policies = [config.user_agent_policy, RawDeserializer(), config.http_logger_policy, policy]
+        credentials = getattr(config, "credentials", None)
+        if credentials:
+            if not isinstance(credentials, (AsyncHTTPPolicy, SansIOHTTPPolicy)):
+                credentials = AsyncRequestsCredentialsPolicy(credentials)
+            policies.insert(1, credentials)
+        config.pipeline = AsyncPipeline(
+            policies, AsyncPipelineRequestsHTTPSender(AsyncRequestsHTTPSender(config))
+        )
+        config.request_compression_policy = policy
+        return policy
+
+    def on_request(self, request, **kwargs):
+        http_request = request.http_request
+        data = http_request.data
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not isinstance(data, bytes):
+            return
+
+        data, coding = self._compression.compress_request(data, self.coding)
+        if coding:
+            http_request.data = data
+            http_request.headers["Content-Encoding"] = coding
+            http_request.headers["Content-Length"] = str(len(data))
+
+    def on_response(self, request, response, **kwargs):
+        http_response = response.http_response
+        if http_response.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE:
+            # The receiver doesn't take compressed bodies, even if it advertises codings (e.g. a
+            # proxy in front of it doesn't), so they aren't compressed again.
+            self.coding = None
+            self.refused = True
+        elif not self.refused and "Accept-Encoding" in http_response.headers:
+            self.coding = negotiate(http_response.headers["Accept-Encoding"])
@@ -0,0 +1,6 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from .action_scheduler import ActionScheduler
+
+__all__ = ["ActionScheduler"]
@@ -0,0 +1,76 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import sys
+import traceback
+from typing import Awaitable, Callable, Dict, Set
+
+
+class ActionScheduler:
+    """
+    Runs actions after a delay without holding the turn that scheduled them.
+    Remarks: Each action waits on the event loop's timer heap (asyncio.sleep) in its own task, so
+    other conversations keep being served in the meantime. Actions are grouped by key (usually the
+    conversation id) so they can be cancelled when the conversation ends.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, Set[asyncio.Task]] = {}
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(tasks) for tasks in self._pending.values())
+
+    def pending_for(self, key: str) -> int:
+        return len(self._pending.get(key, ()))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending_count,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+        }
+
+    def schedule(
+        self, key: str, delay: float, action: Callable[[], Awaitable]
+    ) -> asyncio.Task:
+        task = asyncio.ensure_future(self._run_later(delay, action))
+        self._pending.setdefault(key, set()).add(task)
+        task.add_done_callback(lambda done: self._discard(key, done))
+        return task
+
+    def cancel(self, key: str) -> int:
+        tasks = self._pending.pop(key, set())
+        for task in tasks:
+            task.cancel()
+        self.cancelled += len(tasks)
+        return len(tasks)
+
+    def cancel_all(self) -> int:
+        return sum(self.cancel(key) for key in list(self._pending))
+
+    async def _run_later(self, delay: float, action: Callable[[], Awaitable]):
+        await asyncio.sleep(delay)
+        try:
+            await action()
+            self.completed += 1
+        except Exception as exception:  # pylint: disable=broad-except
+            self.failed += 1
+            print(
+                f"\n [ActionScheduler]: scheduled action failed: {exception}",
+                file=sys.stderr,
+            )
+            traceback.print_exc()
+
+    def _discard(self, key: str, task: asyncio.Task):
+        tasks = self._pending.get(key)
+        if tasks is None:
+            return
+        tasks.discard(task)
+        if not tasks:
+            del self._pending[key]
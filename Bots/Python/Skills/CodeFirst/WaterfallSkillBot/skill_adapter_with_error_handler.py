@@ -11,6 +11,11 @@ from botbuilder.core import (
     TurnContext,
 )
 from botbuilder.schema import Activity, ActivityTypes, InputHints
+from botframework.connector import ConnectorClient
+from botframework.connector.auth import AppCredentials, ClaimsIdentity
+from authentication import AppTokenCache, CachedAppCredentials, ValidatedTokenCache
+from http_compression import HttpCompression, RequestCompressionPolicy
+from tracing import TraceLevel, TraceSender
 
 
 class AdapterWithErrorHandler(BotFrameworkAdapter):
@@ -18,11 +23,58 @@ class AdapterWithErrorHandler(BotFrameworkAdapter):
         self,
         settings: BotFrameworkAdapterSettings,
         conversation_state: ConversationState,
+        trace_sender: TraceSender = None,
+        token_cache: AppTokenCache = None,
+        token_validation_cache: ValidatedTokenCache = None,
+        compression: HttpCompression = None,
     ):
         super().__init__(settings)
         self.conversation_state = conversation_state
+        self.trace_sender = trace_sender or TraceSender()
+        self._token_cache = token_cache
+        self._token_validation_cache = token_validation_cache
+        self._compression = compression
         self.on_turn_error = self._handle_turn_error
 
+    async def _authenticate_request(
+        self, request: Activity, auth_header: str
+    ) -> ClaimsIdentity:
+        if not self._token_validation_cache:
+            return await super()._authenticate_request(request, auth_header)
+
+        # Channel validation checks the endorsements and the service url, they're part of the key.
+        validate = super()._authenticate_request
+        return await self._token_validation_cache.authenticate(
+            auth_header,
+            lambda: validate(request, auth_header),
+            request.channel_id,
+            request.service_url,
+        )
+
+    async def create_connector_client(
+        self, service_url: str, identity: ClaimsIdentity = None, audience: str = None
+    ) -> ConnectorClient:
+        client = await super().create_connector_client(service_url, identity, audience)
+
+        # The client gets its token synchronously, make sure it's served from the cache.
+        credentials = client.config.credentials
+        if isinstance(credentials, CachedAppCredentials):
+            await self._token_cache.get_token_async(credentials)
+        return client
+
+    def _get_or_create_connector_client(
+        self, service_url: str, credentials: AppCredentials
+    ) -> ConnectorClient:
+        # Replies and proactive messages get their app tokens from the shared token cache.
+        if self._token_cache and credentials:
+            credentials = self._token_cache.wrap(credentials)
+        client = super()._get_or_create_connector_client(service_url, credentials)
+
+        # Activities sent back to the host are compressed once the host says it accepts it.
+        if self._compression:
+            RequestCompressionPolicy.install(client, self._compression)
+        return client
+
     async def _handle_turn_error(self, context: TurnContext, error: Exception):
         # This check writes out errors to console log
         # NOTE: In production environment, you should consider logging this to Azure
@@ -59,11 +111,13 @@ class AdapterWithErrorHandler(BotFrameworkAdapter):
             # Send a trace activity, which will be displayed in the BotFramework Emulator.
             # Note: we return the entire exception in the value property to help the developer;
             # this should not be done in production.
-            await context.send_trace_activity(
-                label="TurnError",
-                name="on_turn_error Trace",
-                value=f"{error}",
-                value_type="https://www.botframework.com/schemas/error",
+            await self.trace_sender.trace(
+                context,
+                TraceLevel.ERROR,
+                "on_turn_error Trace",
+                "TurnError",
+                lambda: f"{error}",
+                "https://www.botframework.com/schemas/error",
             )
         except Exception as exception:
             print(
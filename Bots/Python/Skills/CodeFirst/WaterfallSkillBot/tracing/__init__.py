@@ -0,0 +1,6 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from .trace_sender import TraceLevel, TraceSender
+
+__all__ = ["TraceLevel", "TraceSender"]
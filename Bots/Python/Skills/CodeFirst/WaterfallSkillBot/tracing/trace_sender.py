@@ -0,0 +1,81 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from datetime import datetime
+from enum import IntEnum
+from typing import Callable, Iterable, Union
+
+from botbuilder.core import TurnContext
+from botbuilder.schema import Activity, ActivityTypes
+
+
+class TraceLevel(IntEnum):
+    OFF = 0
+    ERROR = 1
+    WARNING = 2
+    INFO = 3
+    DEBUG = 4
+
+
+class TraceSender:
+    """
+    Sends trace activities filtered by level and channel.
+    Remarks: The label (and value) can be passed as a callable, which is only called when the trace
+    is actually sent; a disabled trace costs a comparison and a set lookup, with no formatting and
+    no outbound activity. `channels` is the set of channel ids that receive traces, None means all.
+    """
+
+    def __init__(
+        self, level: TraceLevel = TraceLevel.INFO, channels: Iterable[str] = None
+    ):
+        self.level = level
+        self.channels = None if channels is None else frozenset(channels)
+        self.sent = 0
+        self.skipped = 0
+
+    @staticmethod
+    def from_config(level: str, channels: str) -> "TraceSender":
+        name = level.strip().upper()
+        if name not in TraceLevel.__members__:
+            valid_levels = ", ".join(member.lower() for member in TraceLevel.__members__)
+            raise ValueError(
+                f'TraceSender: invalid TraceLevel "{level}", expected one of {valid_levels}.'
+            )
+
+        channel_ids = [
+            channel.strip() for channel in channels.split(",") if channel.strip()
+        ]
+        return TraceSender(
+            TraceLevel[name],
+            None if not channel_ids or "*" in channel_ids else channel_ids,
+        )
+
+    def is_enabled(self, context: TurnContext, level: TraceLevel) -> bool:
+        return level <= self.level and (
+            self.channels is None or context.activity.channel_id in self.channels
+        )
+
+    async def trace(
+        self,
+        context: TurnContext,
+        level: TraceLevel,
+        name: str,
+        label: Union[str, Callable[[], str]] = None,
+        value: Union[object, Callable[[], object]] = None,
+        value_type: str = None,
+    ):
+        if not self.is_enabled(context, level):
+            self.skipped += 1
+            return
+
+        self.sent += 1
+        await context.send_activity(
+            Activity(
+                type=ActivityTypes.trace,
+                timestamp=datetime.utcnow(),
+                name=name,
+                label=label() if callable(label) else label,
+                value=value() if callable(value) else value,
+                value_type=value_type,
+            )
+        )